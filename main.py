@@ -4,9 +4,15 @@ import dotenv
 
 from src import Bot
 
+from src.utils import startupProfile
 from src.utils.files import clear_temp_folder
 from src.utils.terminal import cls
 
+# Everything up to here (interpreter start, src.bot and its imports) counts as the first startup phase.
+startupProfile.recordPhase(
+    "Interpreter start and imports", startupProfile.secondsSinceStart()
+)
+
 # Load the .env secret file.
 dotenv.load_dotenv()
 
@@ -17,15 +23,19 @@ BOT_TOKEN = os.getenv("DISCORD_TOKEN")
 
 # Clear terminal.
 cls()
-clear_temp_folder()
+with startupProfile.phase("Clear temp folder"):
+    clear_temp_folder()
 
 # Enable all intents for the bot.
 intents = discord.Intents.all()
 
 # Generate the bot.
-bot = Bot(intents=intents, owner_id=OWNER)
+with startupProfile.phase("Bot construction"):
+    bot = Bot(intents=intents, owner_id=OWNER)
 
-bot.load_extension(COGS_PATH, recursive=True)
+# Each extension's own time is recorded by Bot._load_from_module_spec.
+with startupProfile.phase("Load extensions"):
+    bot.load_extension(COGS_PATH, recursive=True)
 
 # Run the bot.
 bot.run(BOT_TOKEN)
@@ -1,9 +1,10 @@
 import os
-import aiohttp
+import time
 import discord
 
 from discord.ext import tasks
-from src.utils import music, imagesCog
+from src.utils import music, imagesCog, images, db, httpClient, startupProfile
+from src.utils.logging import logBuffer
 from src.cogs.commands import antiben
 
 
@@ -17,32 +18,77 @@ class Bot(discord.Bot):
         push_url = os.getenv("KUMA_PUSH_URL")
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(push_url) as response:
-                    if response.status == 200:
-                        # Heartbeat successful
-                        pass
+            async with httpClient.request("GET", push_url) as response:
+                if response.status == 200:
+                    # Heartbeat successful
+                    pass
         except Exception as e:
             print(f"Uptime Kuma heartbeat failed: {e}")
 
+    def _load_from_module_spec(self, spec, key):
+        # Every extension goes through here, so each one's import and setup() is timed for the startup profile.
+        started = time.perf_counter()
+
+        try:
+            return super()._load_from_module_spec(spec, key)
+        finally:
+            startupProfile.recordExtension(key, time.perf_counter() - started)
+
+    async def start(self, *args, **kwargs):
+        self.loginStartedAt = time.perf_counter()
+
+        # Open the shared HTTP session on the bot's own event loop.
+        httpClient.getSession()
+
+        await super().start(*args, **kwargs)
+
+    async def close(self):
+        # Stop the Telegram feed first, so it can't handle an update after the session and databases below are closed.
+        taylorTracker = self.get_cog("TaylorTracker")
+
+        if taylorTracker is not None:
+            await taylorTracker.stopSupervisor()
+
+        await super().close()
+
+        await httpClient.closeSession()
+        print("HTTP session closed.")
+
+        images.shutdownProcessPool()
+        print("Image worker processes stopped.")
+
+        await logBuffer.flushAll()
+        print("Buffered log entries flushed.")
+
+        db.closeConnections()
+        print("Database connections closed.")
+
     @kuma_heartbeat.before_loop
     async def before_heartbeat(self):
         await self.wait_until_ready()
 
     async def on_ready(self):
+        if not startupProfile.recorded:
+            startupProfile.recordPhase(
+                "Gateway login to READY", time.perf_counter() - self.loginStartedAt
+            )
+
         await self.change_presence(
             activity=discord.Activity(
                 name="/commands", type=discord.ActivityType.watching
             )
         )
 
-        self.add_view(music.FinishedRatingPersistentMessageButtonsView())
-        print("Persistent Album Rating buttons loaded.")
+        with startupProfile.phase("Persistent views"):
+            self.add_view(music.FinishedRatingPersistentMessageButtonsView())
+            print("Persistent Album Rating buttons loaded.")
 
-        self.add_view(antiben.AntiBenMovementView())
-        print("Persistent Anti-Ben buttons loaded.")
+            self.add_view(antiben.AntiBenMovementView())
+            print("Persistent Anti-Ben buttons loaded.")
 
-        self.add_view(imagesCog.ImageView(None))
-        print("Persistent Image buttons loaded.")
+            self.add_view(imagesCog.ImageView(None))
+            print("Persistent Image buttons loaded.")
 
         print(f"Logged in as {self.user}!")
+
+        await startupProfile.recordReady()
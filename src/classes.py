@@ -1,3 +1,4 @@
+import asyncio
 import discord
 import sqlite3
 
@@ -110,9 +111,7 @@ class LocalDatabase:
     def __init__(self, database: str = "db"):
         database = f"{database}.db"
 
-        availableDatabases = listDBs(withFileExtensions=True)
-
-        if database not in availableDatabases:
+        if not databaseExists(database):
             raise ValueError(
                 f"src>classes>LocalDatabase: Database not in list of available databases. Tried to access '{database}'."
             )
@@ -120,10 +119,7 @@ class LocalDatabase:
         self.database = database
 
     def get(self, query: str, params: tuple = (), limit: int = 0) -> list:
-        try:
-            connection = sqlite3.connect(f"src/data/{self.database}")
-            cursor = connection.cursor()
-
+        with pooledCursor(self.database) as cursor:
             cursor.execute(query, params)
 
             if limit:
@@ -132,15 +128,9 @@ class LocalDatabase:
                 results = cursor.fetchall()
 
             return results
-        finally:
-            cursor.close()
-            connection.close()
 
     def getRaw(self, query: str, limit: int = 0) -> list:
-        try:
-            connection = sqlite3.connect(f"src/data/{self.database}")
-            cursor = connection.cursor()
-
+        with pooledCursor(self.database) as cursor:
             cursor.execute(query)
 
             if limit:
@@ -149,15 +139,9 @@ class LocalDatabase:
                 results = cursor.fetchall()
 
             return results
-        finally:
-            cursor.close()
-            connection.close()
 
     def listTables(self) -> list:
-        try:
-            connection = sqlite3.connect(f"src/data/{self.database}")
-            cursor = connection.cursor()
-
+        with pooledCursor(self.database) as cursor:
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
 
             results = cursor.fetchall()
@@ -169,76 +153,53 @@ class LocalDatabase:
                     resultsFiltered.append(result[0])
 
             return resultsFiltered
-        finally:
-            cursor.close()
-            connection.close()
 
     def setOne(self, query: str, params: tuple = ()):
-        try:
-            connection = sqlite3.connect(f"src/data/{self.database}")
-            cursor = connection.cursor()
-
+        with pooledCursor(self.database, commit=True) as cursor:
             cursor.execute(query, params)
 
-            connection.commit()
-
             return True
-        finally:
-            cursor.close()
-            connection.close()
 
     def setOneRaw(self, query: str):
-        try:
-            connection = sqlite3.connect(f"src/data/{self.database}")
-            cursor = connection.cursor()
-
+        with pooledCursor(self.database, commit=True) as cursor:
             cursor.execute(query)
 
-            connection.commit()
-
             return True
-        finally:
-            cursor.close()
-            connection.close()
 
     def setMany(self, query: str, data: tuple):
-        try:
-            connection = sqlite3.connect(f"src/data/{self.database}")
-            cursor = connection.cursor()
-
+        with pooledCursor(self.database, commit=True) as cursor:
             cursor.executemany(query, data)
 
-            connection.commit()
-
             return True
-        finally:
-            cursor.close()
-            connection.close()
 
     def query(self, query: str, data: tuple):
-        try:
-            connection = sqlite3.connect(f"src/data/{self.database}")
-            cursor = connection.cursor()
-
+        with pooledCursor(self.database, commit=True) as cursor:
             cursor.execute(query, data)
 
-            connection.commit()
-
             return True
-        finally:
-            cursor.close()
-            connection.close()
 
     def queryRaw(self, query: str):
-        try:
-            connection = sqlite3.connect(f"src/data/{self.database}")
-            cursor = connection.cursor()
-
+        with pooledCursor(self.database, commit=True) as cursor:
             cursor.execute(query)
 
-            connection.commit()
-
             return True
-        finally:
-            cursor.close()
-            connection.close()
+
+    async def aget(self, query: str, params: tuple = (), limit: int = 0) -> list:
+        """Async version of get(). Runs on the reader thread pool so the event loop isn't blocked."""
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(
+            readerExecutor(), readQuery, self.database, query, params, limit
+        )
+
+    async def aset(self, query: str, params: tuple = ()):
+        """Async version of setOne()/query(). Runs on the single writer thread."""
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(writerExecutor(), self.setOne, query, params)
+
+    async def asetMany(self, query: str, data: tuple):
+        """Async version of setMany(). Runs on the single writer thread."""
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(writerExecutor(), self.setMany, query, data)
@@ -7,8 +7,6 @@ import random
 import re
 import discord.types
 import asyncio
-from google import genai
-from google.genai.errors import ServerError
 from src.errors import *
 import tempfile
 import urllib
@@ -147,7 +145,26 @@ async def parseAttachments(
 
 activeThreads = {}
 activeGoogleSafeNames = {}
-googleClient = genai.Client(api_key=GEMINI_TOKEN)
+googleClient = None
+
+
+def getGoogleClient():
+    """google.genai is slow to import, so the client is only built the first time a command needs it."""
+    global googleClient
+
+    if googleClient is None:
+        from google import genai
+
+        googleClient = genai.Client(api_key=GEMINI_TOKEN)
+
+    return googleClient
+
+
+def serverErrorType() -> type[Exception]:
+    # Only evaluated once an exception reaches the except clause, by which point genai is already loaded.
+    from google.genai.errors import ServerError
+
+    return ServerError
 
 
 async def sendEndingWarning(thread: discord.Thread, warnAfter: int, bot: discord.Bot):
@@ -192,7 +209,7 @@ def deleteGoogleMedia(threadID: int):
             raise KeyError(threadID)
 
         for safeName in namesToDelete:
-            googleClient.files.delete(name=safeName)
+            getGoogleClient().files.delete(name=safeName)
 
             print(
                 f"GOOGLE AI LOG: Deleted data {safeName} for {threadID} when closing AI conversation."
@@ -276,7 +293,7 @@ class Ai(commands.Cog):
                 "temperature": 0.5,
             }
 
-            chat = googleClient.chats.create(
+            chat = getGoogleClient().chats.create(
                 model="gemini-2.0-flash", config=chatConfig
             )
         else:
@@ -479,7 +496,7 @@ class Ai(commands.Cog):
 
                                 await originalAttachment.save(tempPath)
 
-                                uploadedFile = googleClient.files.upload(
+                                uploadedFile = getGoogleClient().files.upload(
                                     file=tempPath,
                                     config={
                                         "name": googleSafeName,
@@ -535,7 +552,7 @@ class Ai(commands.Cog):
             except asyncio.CancelledError:
                 # If the thread was manually deleted while waiting, safely exit.
                 break
-            except ServerError as e:
+            except serverErrorType() as e:
                 reply = EmbedReply("AI - Error", "ai", True)
 
                 if e.message == "The model is overloaded. Please try again later.":
@@ -722,7 +739,7 @@ class Ai(commands.Cog):
                     "temperature": 0.5,
                 }
 
-                response = googleClient.models.generate_content(
+                response = getGoogleClient().models.generate_content(
                     model="gemini-2.0-flash",
                     contents=[SYSTEM_MESSAGE, prompt],
                     config=chatConfig,
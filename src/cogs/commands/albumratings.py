@@ -1,5 +1,4 @@
 import discord
-import requests
 import asyncio
 import sys
 from discord.ext import commands, pages
@@ -7,6 +6,9 @@ from src.errors import *
 
 from src.classes import *
 from src.utils import music
+from src.utils import musicDB
+from src.utils import fts
+from src.utils import spotify
 from src.utils import dates
 
 RATING_CHANNEL = 946507420916678688
@@ -21,6 +23,8 @@ SLEEP_BETWEEN_API_ATTEMPTS = 2
 
 SINGLE_ALBUM_TRACK_CRITERIA = 1
 
+MAX_ALBUM_TRACKS = spotify.MAX_ALBUM_TRACKS
+
 DUPLICATE_RATING_TIMEOUT_DELETEAFTER = 30
 
 TIMEOUT_VIEW_RATINGS_PAGINATOR = 14 * (60)
@@ -96,6 +100,9 @@ class AlbumRatings(commands.Cog):
 
         self.description = "Album rating commands."
 
+        musicDB.ensureSchema()
+        fts.ensureSearchIndex("albumRatingsSearch")
+
     albumRatings = discord.SlashCommandGroup(
         "albumrating",
         "Use these commands to add, edit, and delete album ratings.",
@@ -117,9 +124,9 @@ class AlbumRatings(commands.Cog):
         song_fetch_limit: discord.Option(
             int,
             description="Only return N songs from the album. Useful for Super Deluxe albums with extra fluff.",
-            default=50,
+            default=MAX_ALBUM_TRACKS,
             min_value=1,
-            max_value=50,
+            max_value=MAX_ALBUM_TRACKS,
         ),  # type: ignore
     ):
         await ctx.defer()
@@ -129,7 +136,7 @@ class AlbumRatings(commands.Cog):
 
         while attempt < maxRetries:
             try:
-                albumQueryResults = music.searchForAlbumName(
+                albumQueryResults = await music.searchForAlbumName(
                     album_name, limit=ALBUM_APISEARCH_RESULTS_LIMIT
                 )
 
@@ -187,7 +194,7 @@ class AlbumRatings(commands.Cog):
 
                 albumChoiceID = view.choice
 
-                matchingDuplicateRatings = LocalDatabase().get(
+                matchingDuplicateRatings = await LocalDatabase().aget(
                     "SELECT * FROM albumRatings WHERE spotifyAlbumID = ? AND createdBy = ?",
                     (albumChoiceID, ctx.user.id),
                 )
@@ -260,7 +267,7 @@ class AlbumRatings(commands.Cog):
                 if albumChoiceID == None:
                     return
 
-                albumDetailsFromID = music.fetchAlbumDetailsByID(albumChoiceID)
+                albumDetailsFromID = await music.fetchAlbumDetailsByID(albumChoiceID)
 
                 parsedAlbumDetails: music.Album = await music.parseAlbumDetails(
                     albumDetailsFromID, ctx.user, song_fetch_limit
@@ -303,9 +310,8 @@ class AlbumRatings(commands.Cog):
                     displayedAlbumReviewMessage
                 )
 
-                database = LocalDatabase()
-
-                database.setOne(
+                await musicDB.saveAlbumRating(
+                    parsedAlbumDetails,
                     """
                     INSERT INTO `albumRatings` 
                     (`ratingID`, `createdBy`, `createdAt`, `editedAt`, `ratingArtist`, `ratingAlbum`, `spotifyAlbumID`, `formattedRating`, `trackAmount`, `lastRelatedMessage`, `serializedRating`) 
@@ -341,7 +347,7 @@ class AlbumRatings(commands.Cog):
                 )
 
                 break
-            except requests.exceptions.ConnectionError:
+            except spotify.SpotifyConnectionError:
                 attempt += 1
 
                 print(f"Spotify Connection attempt {attempt} Failed")
@@ -404,7 +410,7 @@ class AlbumRatings(commands.Cog):
         try:
             database = LocalDatabase()
 
-            targetRating = database.get(
+            targetRating = await database.aget(
                 "SELECT * FROM albumRatings WHERE ratingID = ?", (id,)
             )
 
@@ -416,7 +422,7 @@ class AlbumRatings(commands.Cog):
             rating = music.SmallRating(targetRating[0])
             oldMessageID = rating.lastRelatedMessage
 
-            unpackedRating = music.unpackAlbumRating(self.bot, rating.serializedRating)
+            unpackedRating = await musicDB.loadAlbumRating(self.bot, rating.ratingID)
 
             albumRatingEmbed = music.AlbumRatingEmbedReply(unpackedRating)
 
@@ -459,7 +465,7 @@ class AlbumRatings(commands.Cog):
                     )
 
                 if not edit_original_rating_message:
-                    database.setOne(
+                    await database.aset(
                         "UPDATE albumRatings SET lastRelatedMessage = ? WHERE ratingID = ?",
                         (ratingMessageReference.id, id),
                     )
@@ -495,20 +501,21 @@ class AlbumRatings(commands.Cog):
 
         database = LocalDatabase()
 
-        initialSearch = database.get(
+        initialSearch = await database.aget(
             "SELECT * FROM albumRatings WHERE ratingID = ?",
             (id,),
         )
 
         rating = music.SmallRating(initialSearch[0])
 
-        unpack = music.unpackAlbumRating(self.bot, rating.serializedRating)
+        unpack = await musicDB.loadAlbumRating(self.bot, rating.ratingID)
 
         unpack.setCreatedBy(new)
 
         pack = unpack.packAlbumRating(msg)
 
-        database.setOne(
+        await musicDB.saveAlbumRating(
+            unpack,
             """
             UPDATE `albumRatings` 
             SET createdBy = ?, serializedRating = ?
@@ -548,7 +555,7 @@ class AlbumRatings(commands.Cog):
 
             database = LocalDatabase()
 
-            initialSearch = database.get(
+            initialSearch = await database.aget(
                 "SELECT * FROM albumRatings WHERE ratingAlbum LIKE ? ORDER BY createdAt DESC",
                 ("%" + query + "%",),
                 limit=1,
@@ -561,7 +568,7 @@ class AlbumRatings(commands.Cog):
 
             initialSearchResult = music.SmallRating(initialSearch[0])
 
-            allRatingsForAlbumResult = database.get(
+            allRatingsForAlbumResult = await database.aget(
                 "SELECT * FROM albumRatings WHERE spotifyAlbumID = ? ORDER BY createdAt DESC",
                 (initialSearchResult.spotifyAlbumID,),
             )
@@ -570,12 +577,15 @@ class AlbumRatings(commands.Cog):
                 music.SmallRating(rating) for rating in allRatingsForAlbumResult
             ]
 
-            unpackedRatings = [
-                music.unpackAlbumRating(self.bot, ratingResult.serializedRating)
-                for ratingResult in allRatingsForAlbumResult
-            ]
+            unpackedRatings = await musicDB.loadAlbumRatings(
+                self.bot, [ratingResult.ratingID for ratingResult in allRatingsForAlbumResult]
+            )
+
+            averages = await musicDB.fetchAlbumAverages(
+                initialSearchResult.spotifyAlbumID
+            )
 
-            reply = music.AlbumRatingEmbedReply(unpackedRatings)
+            reply = music.AlbumRatingEmbedReply(unpackedRatings, averages=averages)
 
             await reply.send(ctx, ephemeral=ephemeral)
         except Exception as e:
@@ -608,17 +618,15 @@ class AlbumRatings(commands.Cog):
             database = LocalDatabase()
 
             # --- Database Query Logic ---
-            sql = "SELECT * FROM albumRatings WHERE (ratingAlbum LIKE ? OR ratingArtist LIKE ?) "
-            params = ("%" + query + "%", "%" + query + "%")
-
-            # Add member filter if member is provided
-            if member:
-                sql += "AND createdBy = ? "
-                params += (member.id,)
-
-            sql += "ORDER BY createdAt DESC"
+            # Ranked full-text search over album and artist names, best match first.
+            searchQuery = fts.buildSearchQuery(
+                "albumRatingsSearch",
+                query,
+                where="t.createdBy = ?" if member else "",
+                params=(member.id,) if member else (),
+            )
 
-            results = database.get(sql, params)
+            results = await database.aget(*searchQuery) if searchQuery else []
             results = [music.SmallRating(result) for result in results]
             # ----------------------------
 
@@ -691,7 +699,7 @@ class AlbumRatings(commands.Cog):
 
             sql += "ORDER BY createdAt DESC"
 
-            results = database.get(sql, params)
+            results = await database.aget(sql, params)
             results = [music.SmallRating(result) for result in results]
             # ----------------------------
 
@@ -760,14 +768,17 @@ class AlbumRatings(commands.Cog):
         try:
             database = LocalDatabase()
 
-            sql = f'SELECT * FROM albumRatings WHERE createdBy = ? AND formattedRating != "Unfinished"'
+            sql = "SELECT * FROM albumRatings WHERE createdBy = ? AND score IS NOT NULL"
 
             if not include_singles:
                 sql += f" AND trackAmount > {SINGLE_ALBUM_TRACK_CRITERIA}"
 
+            # Matches the expression in idx_albumRatings_normalisedScore.
+            sql += f" ORDER BY score / outOf {"ASC" if ascending else "DESC"}"
+
             params = (member.id,)
 
-            results = database.get(sql, params)
+            results = await database.aget(sql, params)
 
             if not results:
                 raise Exception(
@@ -776,8 +787,6 @@ class AlbumRatings(commands.Cog):
 
             results = [music.SmallRating(result) for result in results]
 
-            results.sort(key=music.sortByRating, reverse=not ascending)
-
             pageList = await paginateRatingList(
                 results,
                 self.bot,
@@ -802,6 +811,85 @@ class AlbumRatings(commands.Cog):
 
             await reply.send(ctx, ephemeral=False)
 
+    @list_ratings.command(
+        description="List a member's top rated songs across all of their album ratings.",
+        guild_ids=[799341195109203998],
+    )
+    async def songs(
+        self,
+        ctx: discord.ApplicationContext,
+        member: discord.Option(
+            discord.Member,
+            description="Provide the guild member to inquiry ratings for.",
+            required=False,
+        ),  # type: ignore
+        ascending: discord.Option(
+            bool,
+            description="Filter in reverse order? (Worst song first.)",
+            default=False,
+        ),  # type: ignore
+        limit: discord.Option(
+            int,
+            description="How many songs to list.",
+            default=50,
+            min_value=1,
+            max_value=500,
+        ),  # type: ignore
+    ):
+        await ctx.defer()
+
+        member: discord.Member = member if member else ctx.user
+
+        try:
+            results = await musicDB.fetchTopTracks(member.id, limit, ascending)
+
+            if not results:
+                raise Exception(
+                    f"The user {member.mention} does not have any rated songs yet!\n\nGet started with `/albumratings create`"
+                )
+
+            pageList = []
+
+            for chunk in range(0, len(results), LIST_RATINGS_PER_PAGE):
+                page = EmbedReply(
+                    "Album Ratings - List Songs",
+                    "albumratings",
+                    description=f"List of top rated songs for {member.mention}, sorted in {"ascending" if ascending else "descending"} order. ({len(results)} Total)",
+                )
+
+                for index, (
+                    trackName,
+                    albumName,
+                    artistNames,
+                    rating,
+                    ratingOutOf,
+                    ratingID,
+                ) in enumerate(results[chunk : chunk + LIST_RATINGS_PER_PAGE], chunk + 1):
+                    page.add_field(
+                        name=text.truncateString(f"{index}. {trackName}", 256)[0],
+                        value=f"{text.truncateString(albumName, 70)[0]} · {artistNames}\nRating: {rating:g}/{ratingOutOf:g}\nRating ID: {ratingID}",
+                        inline=False,
+                    )
+
+                pageList.append(page)
+
+            pagignator = pages.Paginator(
+                pages=pageList, timeout=TIMEOUT_VIEW_RATINGS_PAGINATOR
+            )
+
+            await pagignator.respond(ctx.interaction)
+        except discord.NotFound as e:
+            pass
+        except Exception as e:
+            reply = EmbedReply(
+                "Album Ratings - List Songs",
+                "albumratings",
+                True,
+                description=str(e),
+            )
+
+            await reply.send(ctx, ephemeral=False)
+
     @albumRatings.command(
         description="Edit an album rating (by Rating ID).",
         guild_ids=[799341195109203998],
@@ -837,7 +925,7 @@ class AlbumRatings(commands.Cog):
 
             database = LocalDatabase()
 
-            targetRating = database.get(
+            targetRating = await database.aget(
                 "SELECT * FROM albumRatings WHERE ratingID = ?", (id,)
             )
 
@@ -859,7 +947,7 @@ class AlbumRatings(commands.Cog):
                     f"That's not your rating!\n\nTo see a list of your ratings, use: `/albumrating list member member:@{invokedBy.name}`"
                 )
 
-            unpackedRating = music.unpackAlbumRating(self.bot, rating.serializedRating)
+            unpackedRating = await musicDB.loadAlbumRating(self.bot, rating.ratingID)
 
             firstTrack = unpackedRating.tracks[0]
 
@@ -932,7 +1020,8 @@ class AlbumRatings(commands.Cog):
                     ratingMessageReference
                 )
 
-                database.setOne(
+                await musicDB.saveAlbumRating(
+                    unpackedRating,
                     """
                     UPDATE `albumRatings` 
                     SET editedAt = ?, formattedRating = ?, lastRelatedMessage = ?, serializedRating = ?
@@ -970,7 +1059,8 @@ class AlbumRatings(commands.Cog):
 
                 packedAlbumRating = unpackedRating.packAlbumRating(originalMessage)
 
-                database.setOne(
+                await musicDB.saveAlbumRating(
+                    unpackedRating,
                     """
                     UPDATE `albumRatings` 
                     SET editedAt = ?, formattedRating = ?, serializedRating = ?
@@ -1010,7 +1100,7 @@ class AlbumRatings(commands.Cog):
         database = LocalDatabase()
 
         # Fetch the target rating from DB
-        targetRating = database.get(
+        targetRating = await database.aget(
             "SELECT * FROM albumRatings WHERE ratingID = ?", (ratingID,)
         )
         if not targetRating:
@@ -1025,7 +1115,7 @@ class AlbumRatings(commands.Cog):
             raise Exception("You do not have permission to edit this rating.")
 
         # Unpack album rating and build initial view
-        unpackedRating = music.unpackAlbumRating(bot, rating.serializedRating)
+        unpackedRating = await musicDB.loadAlbumRating(bot, rating.ratingID)
         firstTrack = unpackedRating.tracks[0]
 
         albumEmbed = music.AlbumRatingEmbedReply(unpackedRating)
@@ -1037,13 +1127,8 @@ class AlbumRatings(commands.Cog):
         async def _restore_original_message():
             """Restores the original rating embed + buttons back onto the in-place message."""
             try:
-                currentRating = database.get(
-                    "SELECT * FROM albumRatings WHERE ratingID = ?", (ratingID,)
-                )
-                if currentRating:
-                    restored = music.unpackAlbumRating(
-                        bot, music.SmallRating(currentRating[0]).serializedRating
-                    )
+                restored = await musicDB.loadAlbumRating(bot, ratingID)
+                if restored:
                     restoredEmbed = music.AlbumRatingEmbedReply(restored)
                     await original_message.edit(
                         embeds=[restoredEmbed],
@@ -1148,7 +1233,8 @@ class AlbumRatings(commands.Cog):
 
         # Update the database
         packedAlbumRating = unpackedRating.packAlbumRating(ratingMessage)
-        database.setOne(
+        await musicDB.saveAlbumRating(
+            unpackedRating,
             """
             UPDATE albumRatings
             SET editedAt = ?, formattedRating = ?, lastRelatedMessage = ?, serializedRating = ?
@@ -1222,7 +1308,7 @@ class AlbumRatings(commands.Cog):
 
             database = LocalDatabase()
 
-            targetRating = database.get(
+            targetRating = await database.aget(
                 "SELECT * FROM albumRatings WHERE ratingID = ?", (id,)
             )
 
@@ -1244,7 +1330,7 @@ class AlbumRatings(commands.Cog):
                     f"That's not your rating!\n\nTo see a list of your ratings, use: `/albumrating list member member:@{invokedBy.name}`"
                 )
 
-            unpackedRating = music.unpackAlbumRating(self.bot, rating.serializedRating)
+            unpackedRating = await musicDB.loadAlbumRating(self.bot, rating.ratingID)
 
             oldDate = unpackedRating.createdAt
             unpackedRating.createdAt = newDate
@@ -1297,7 +1383,8 @@ class AlbumRatings(commands.Cog):
 
             packedAlbumRating = unpackedRating.packAlbumRating(ratingMessageReference)
 
-            database.setOne(
+            await musicDB.saveAlbumRating(
+                unpackedRating,
                 """
                 UPDATE `albumRatings` 
                 SET createdAt = ?, lastRelatedMessage = ?, serializedRating = ?
@@ -1346,7 +1433,7 @@ class AlbumRatings(commands.Cog):
         try:
             database = LocalDatabase()
 
-            targetRating = database.get(
+            targetRating = await database.aget(
                 "SELECT * FROM albumRatings WHERE ratingID = ?", (id,)
             )
 
@@ -1368,7 +1455,7 @@ class AlbumRatings(commands.Cog):
                     f"That's not your rating!\n\nTo see a list of your ratings, use: `/albumrating list member member:@{invokedBy.name}`"
                 )
 
-            unpackedRating = music.unpackAlbumRating(self.bot, rating.serializedRating)
+            unpackedRating = await musicDB.loadAlbumRating(self.bot, rating.ratingID)
 
             formattedCreatedAt = dates.formatSimpleDate(
                 unpackedRating.createdAt, discordDateFormat="d"
@@ -1428,7 +1515,7 @@ class AlbumRatings(commands.Cog):
                 except discord.errors.NotFound:
                     pass
 
-            database.setOne("DELETE FROM albumRatings WHERE ratingID = ?", (id,))
+            await database.aset("DELETE FROM albumRatings WHERE ratingID = ?", (id,))
 
             reply = EmbedReply(
                 "Album Ratings - Deleted",
@@ -1468,7 +1555,7 @@ class AlbumRatings(commands.Cog):
 
         database = LocalDatabase()
 
-        res = database.get("SELECT * FROM albumratings")
+        res = await database.aget("SELECT * FROM albumratings")
 
         for i in res:
             try:
@@ -1542,6 +1629,100 @@ class AlbumRatings(commands.Cog):
 
         await reply.send(ctx)
 
+    @albumRatings.command(
+        description="Copy any ratings still stored only as pickles into the rating tables. (OWNER ONLY)",
+        guild_ids=[799341195109203998],
+    )
+    @is_owner_only()
+    async def migrate(
+        self,
+        ctx: discord.ApplicationContext,
+    ):
+        await ctx.defer()
+
+        loop = asyncio.get_running_loop()
+
+        migrated = await loop.run_in_executor(
+            writerExecutor(), musicDB.migratePickledRatings
+        )
+
+        reply = EmbedReply(
+            "Album Ratings - Migrate",
+            "albumratings",
+            description=f"Migrated {migrated} rating{"s" if migrated != 1 else ""} to the rating tables.",
+        )
+
+        await reply.send(ctx)
+
+    @albumRatings.command(
+        description="Benchmark the rating storage format against pickle on saved ratings. (OWNER ONLY)",
+        guild_ids=[799341195109203998],
+    )
+    @is_owner_only()
+    async def benchmark(
+        self,
+        ctx: discord.ApplicationContext,
+        sample: discord.Option(
+            int,
+            description="How many 20-100 track ratings to benchmark with.",
+            default=25,
+            min_value=1,
+            max_value=200,
+        ),  # type: ignore
+        rounds: discord.Option(
+            int,
+            description="How many times to repeat each operation.",
+            default=50,
+            min_value=1,
+            max_value=1000,
+        ),  # type: ignore
+    ):
+        await ctx.defer()
+
+        try:
+            database = LocalDatabase()
+
+            results = await database.aget(
+                "SELECT ratingID FROM albumRatings WHERE trackAmount BETWEEN 20 AND 100 ORDER BY RANDOM()",
+                limit=sample,
+            )
+
+            if not results:
+                raise Exception("There are no ratings with 20 to 100 tracks to benchmark with.")
+
+            albums = await musicDB.loadAlbumRatings(
+                self.bot, [result[0] for result in results]
+            )
+
+            loop = asyncio.get_running_loop()
+
+            timings = await loop.run_in_executor(
+                None, music.benchmarkSerialization, albums, rounds
+            )
+
+            reply = EmbedReply(
+                "Album Ratings - Benchmark",
+                "albumratings",
+                description=f"{len(albums)} ratings ({sum(album.totalTracks() for album in albums) / len(albums):.0f} tracks avg), {rounds} rounds. Times are per rating.",
+            )
+
+            reply.add_field(
+                name="Pickle",
+                value=f"Dump: {timings["pickleDumps"]:.1f}µs\nLoad: {timings["pickleLoads"]:.1f}µs\nSize: {timings["pickleSize"]:.0f}B",
+            )
+            reply.add_field(
+                name="Compact",
+                value=f"Dump: {timings["compactDumps"]:.1f}µs\nLoad: {timings["compactLoads"]:.1f}µs\nHeader Only: {timings["compactHeaderLoads"]:.1f}µs\nSize: {timings["compactSize"]:.0f}B",
+            )
+
+            await reply.send(ctx)
+        except Exception as e:
+            reply = EmbedReply(
+                "Album Ratings - Benchmark", "albumratings", True, description=str(e)
+            )
+
+            await reply.send(ctx)
+
 
 def setup(bot):
     currentFile = sys.modules[__name__]
@@ -6,6 +6,7 @@ import asyncio
 
 from src.utils import dates
 from src.utils import guild
+from src.utils import taylortracker
 from src.errors import *
 
 from src.classes import *
@@ -141,7 +142,7 @@ class DataCommands(commands.Cog):
             expense = selection.values[0]
 
             try:
-                database.setOne(
+                await database.aset(
                     f"INSERT INTO jokes (createdBy, createdGuild, createdChannel, setup, punchline, expense) VALUES (?,?,?,?,?,?)",
                     (
                         createdBy,
@@ -159,7 +160,7 @@ class DataCommands(commands.Cog):
                     description="Successfully inserted joke into database.",
                 )
 
-                results = database.get(
+                results = await database.aget(
                     f"SELECT * FROM jokes WHERE setup=?", (setup,), limit=1
                 )
 
@@ -232,11 +233,7 @@ class DataCommands(commands.Cog):
             try:
                 currentChannel = ctx.channel_id
 
-                channels = database.get(
-                    f"SELECT * FROM {table} WHERE receivingChannel = {currentChannel}"
-                )
-
-                if channels:
+                if not await taylortracker.subscribe(currentChannel):
                     reply = EmbedReply(
                         "Add Data - Taylor Tracker - Error",
                         "data",
@@ -247,11 +244,6 @@ class DataCommands(commands.Cog):
                     await reply.send(ctx)
                     return
 
-                database.setOne(
-                    f"INSERT INTO {table} (receivingChannel) VALUES (?)",
-                    (currentChannel,),
-                )
-
                 reply = EmbedReply(
                     "Add Data - Taylor Tracker",
                     "data",
@@ -301,7 +293,7 @@ class DataCommands(commands.Cog):
 
         if table == "jokes":
             try:
-                results = database.get(
+                results = await database.aget(
                     "SELECT id, setup, createdAt FROM jokes WHERE id >= ?",
                     (startingid,),
                 )
@@ -351,11 +343,7 @@ class DataCommands(commands.Cog):
             try:
                 currentChannel = ctx.channel_id
 
-                channels = database.get(
-                    f"SELECT * FROM {table} WHERE receivingChannel = {currentChannel}"
-                )
-
-                if channels:
+                if currentChannel in await taylortracker.getSubscribers():
                     reply = EmbedReply(
                         "View Data - Taylor Tracker",
                         "data",
@@ -416,11 +404,7 @@ class DataCommands(commands.Cog):
             try:
                 currentChannel = ctx.channel_id
 
-                channels = database.get(
-                    f"SELECT * FROM {table} WHERE receivingChannel = {currentChannel}"
-                )
-
-                if not channels:
+                if not await taylortracker.unsubscribe(currentChannel):
                     reply = EmbedReply(
                         "Delete Data - Taylor Tracker - Error",
                         "data",
@@ -431,10 +415,6 @@ class DataCommands(commands.Cog):
                     await reply.send(ctx)
                     return
 
-                database.query(
-                    f"DELETE FROM {table} WHERE receivingChannel = ?", (currentChannel,)
-                )
-
                 reply = EmbedReply(
                     "Delete Data - Taylor Tracker",
                     "data",
@@ -453,12 +433,12 @@ class DataCommands(commands.Cog):
                 await reply.send(ctx)
         elif table in EDITABLE_TABLES:
             try:
-                results = database.get(f"SELECT id FROM {table} WHERE id >= ?", (id,))
+                results = await database.aget(f"SELECT id FROM {table} WHERE id >= ?", (id,))
 
                 if not results:
                     raise Exception(f"No data in table {table} available for that ID.")
 
-                database.query(f"DELETE FROM {table} WHERE id = ?", (id,))
+                await database.aset(f"DELETE FROM {table} WHERE id = ?", (id,))
 
                 reply = EmbedReply(
                     "Delete Data - Success",
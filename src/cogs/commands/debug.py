@@ -1,10 +1,12 @@
 import discord
 import psutil
+import asyncio
 import time
+import statistics
 import sys
 from discord.ext import commands
 
-from src.utils import dates
+from src.utils import dates, cache, importProfile, startupProfile
 from src.cogs.events import messageReplies
 
 from src.classes import *
@@ -125,6 +127,306 @@ class Debug(commands.Cog):
             )
             await reply.send(ctx)
 
+    @replyCommandGroup.command(
+        description="OWNER ONLY: Benchmarks reply matching against logged messages.",
+        guild_ids=[799341195109203998],
+    )
+    @is_owner_only()
+    async def benchmark(
+        self,
+        ctx,
+        sample: discord.Option(
+            int,
+            description="How many logged messages to match against.",
+            default=5000,
+            min_value=1,
+            max_value=50000,
+        ),  # type: ignore
+        rounds: discord.Option(
+            int,
+            description="How many times to repeat each strategy.",
+            default=3,
+            min_value=1,
+            max_value=20,
+        ),  # type: ignore
+    ):
+        await ctx.defer()
+
+        try:
+            database = LocalDatabase("logs")
+
+            results = await database.aget(
+                "SELECT content FROM messages WHERE content IS NOT NULL AND content != '' ORDER BY RANDOM()",
+                limit=sample,
+            )
+
+            if not results:
+                raise Exception("There are no logged messages to benchmark with.")
+
+            messages = [result[0] for result in results]
+
+            loop = asyncio.get_running_loop()
+
+            timings = await loop.run_in_executor(
+                None, messageReplies.benchmarkReplies, messages, rounds
+            )
+
+            reply = EmbedReply(
+                "Replies - Benchmark",
+                "debug",
+                description=f"{len(messages)} logged messages ({sum(len(message) for message in messages) / len(messages):.0f} characters avg), {len(messageReplies.SINGLETON_REPLIES)} patterns, {rounds} rounds. {timings["matchRate"]:.1%} of messages triggered a reply. Times are per message.",
+            )
+
+            reply.add_field(name="re.findall (Old)", value=f"{timings["findall"]:.1f}µs")
+            reply.add_field(name="Precompiled (Current)", value=f"{timings["precompiled"]:.1f}µs")
+            reply.add_field(name="Combined Alternation", value=f"{timings["combined"]:.1f}µs")
+
+            await reply.send(ctx)
+        except Exception as e:
+            reply = EmbedReply(
+                "Replies - Benchmark - Error",
+                "debug",
+                error=True,
+                description=f"Error: {e}",
+            )
+            await reply.send(ctx)
+
+    cacheCommandGroup = discord.SlashCommandGroup(
+        "caches",
+        description="Commands for inspecting the bot's response caches.",
+        guild_ids=[799341195109203998],
+    )
+
+    @cacheCommandGroup.command(
+        description="Returns hit/miss counters for every response cache.",
+        guild_ids=[799341195109203998],
+    )
+    async def stats(self, ctx):
+        reply = EmbedReply("Caches - Stats", "debug", description="")
+
+        if not cache.caches:
+            reply.description = "*(No Caches)*"
+
+        for name, responseCache in cache.caches.items():
+            stats = responseCache.stats()
+
+            reply.add_field(
+                name=name,
+                value=f"Entries: {stats["entries"]}/{stats["maxEntries"]}\nMemory Hits: {stats["memoryHits"]}\nDisk Hits: {stats["diskHits"]}\nMisses: {stats["misses"]}\nHit Rate: {stats["hitRate"]:.0%}",
+            )
+
+        await reply.send(ctx)
+
+    @cacheCommandGroup.command(
+        description="OWNER ONLY: Empties a response cache, in memory and on disk.",
+        guild_ids=[799341195109203998],
+    )
+    @is_owner_only()
+    async def clear(
+        self,
+        ctx,
+        name: discord.Option(
+            str,
+            description="The cache to clear. Use /caches stats to see a list.",
+        ),  # type: ignore
+    ):
+        try:
+            responseCache = cache.caches.get(name)
+
+            if not responseCache:
+                raise Exception("There are no caches with that name.")
+
+            responseCache.clear()
+
+            reply = EmbedReply(
+                "Caches - Clear", "debug", description=f"Cleared `{name}`."
+            )
+
+            await reply.send(ctx)
+        except Exception as e:
+            reply = EmbedReply(
+                "Caches - Clear - Error",
+                "debug",
+                error=True,
+                description=f"Error: {e}",
+            )
+            await reply.send(ctx)
+
+    debugCommandGroup = discord.SlashCommandGroup(
+        "debug",
+        description="Commands for profiling the bot itself.",
+        guild_ids=[799341195109203998],
+    )
+
+    @debugCommandGroup.command(
+        description="OWNER ONLY: Profiles how long the bot's imports take, like python -X importtime.",
+        guild_ids=[799341195109203998],
+    )
+    @is_owner_only()
+    async def imports(
+        self,
+        ctx,
+        module: discord.Option(
+            str,
+            description="A single module to profile. Defaults to the bot and every cog.",
+            required=False,
+        ),  # type: ignore
+        limit: discord.Option(
+            int,
+            description="How many modules to list.",
+            default=15,
+            min_value=1,
+            max_value=40,
+        ),  # type: ignore
+    ):
+        await ctx.defer()
+
+        try:
+            if module and not all(part.isidentifier() for part in module.split(".")):
+                raise Exception("That isn't a valid module name.")
+
+            if module:
+                timings, elapsed = await importProfile.profileImports(
+                    f"import {module}"
+                )
+            else:
+                timings, elapsed = await importProfile.profileImports()
+
+            topLevel = importProfile.topLevelImports(timings)
+            totalImportTime = sum(timing.cumulativeTime for timing in topLevel)
+
+            formatted = [
+                f"Profiled `{module or "src.bot + src.cogs"}` in a fresh interpreter.",
+                f"Imports: {totalImportTime / 1000:.0f}ms across {len(timings)} modules. Interpreter wall time: {elapsed:.2f}s.",
+                "",
+                "**Slowest Top-Level Imports (cumulative)**",
+                *[
+                    f"· `{timing.module}` - {timing.cumulativeTime / 1000:.1f}ms"
+                    for timing in topLevel[:limit]
+                ],
+                "",
+                "**Slowest Modules (self)**",
+                *[
+                    f"· `{timing.module}` - {timing.selfTime / 1000:.1f}ms"
+                    for timing in importProfile.slowestImports(timings, limit)
+                ],
+            ]
+
+            reply = EmbedReply(
+                "Debug - Imports",
+                "debug",
+                description="\n".join(text.truncateList(formatted, 4000)),
+            )
+
+            loaded = importProfile.loadedDeferredModules()
+
+            reply.set_footer(
+                text=f"Deferred modules loaded in this process: {", ".join(loaded) if loaded else "none"}."
+            )
+
+            await reply.send(ctx)
+        except Exception as e:
+            reply = EmbedReply(
+                "Debug - Imports - Error",
+                "debug",
+                error=True,
+                description=f"Error: {e}",
+            )
+            await reply.send(ctx)
+
+    @debugCommandGroup.command(
+        description="Returns how long the last restart took, broken down by phase and by cog.",
+        guild_ids=[799341195109203998],
+    )
+    async def startup(
+        self,
+        ctx,
+        history: discord.Option(
+            int,
+            description="How many past boots to compare against.",
+            default=10,
+            min_value=1,
+            max_value=50,
+        ),  # type: ignore
+        limit: discord.Option(
+            int,
+            description="How many extensions to list.",
+            default=10,
+            min_value=1,
+            max_value=40,
+        ),  # type: ignore
+    ):
+        try:
+            runs, timings, medians = await startupProfile.fetchStartupReport(
+                history + 1
+            )
+
+            if not runs:
+                raise Exception(
+                    "No startup timings have been recorded yet. They're saved when the bot first becomes ready."
+                )
+
+            def formatTiming(kind: str, name: str, seconds: float) -> str:
+                median = medians.get((kind, name))
+
+                if median is None:
+                    return f"{seconds:.2f}s"
+
+                return f"{seconds:.2f}s ({seconds - median:+.2f}s vs median)"
+
+            _, startedAt, readySeconds, version = runs[0]
+            previousReady = [run[2] for run in runs[1:]]
+
+            formatted = [
+                f"Last boot <t:{int(startedAt)}:R>{f" (`{version}`)" if version else ""} reached READY in **{readySeconds:.2f}s**.",
+            ]
+
+            if previousReady:
+                formatted.append(
+                    f"Median of the {len(previousReady)} boots before it: {statistics.median(previousReady):.2f}s."
+                )
+
+            formatted += ["", "**Phases**"]
+            formatted += [
+                f"· {name} - {formatTiming(kind, name, seconds)}"
+                for kind, name, seconds in timings
+                if kind == startupProfile.PHASE
+            ]
+
+            extensionTimings = sorted(
+                (timing for timing in timings if timing[0] == startupProfile.EXTENSION),
+                key=lambda timing: timing[2],
+                reverse=True,
+            )
+
+            formatted += ["", "**Slowest Extensions (import + setup)**"]
+            formatted += [
+                f"· `{name.removeprefix("src.cogs.")}` - {formatTiming(kind, name, seconds)}"
+                for kind, name, seconds in extensionTimings[:limit]
+            ] or ["*(None Recorded)*"]
+
+            formatted += ["", "**Recent Boots**"]
+            formatted += [
+                f"· <t:{int(runStartedAt)}:R>{f" `{runVersion}`" if runVersion else ""} - {runReadySeconds:.2f}s"
+                for _, runStartedAt, runReadySeconds, runVersion in runs
+            ]
+
+            reply = EmbedReply(
+                "Debug - Startup",
+                "debug",
+                description="\n".join(text.truncateList(formatted, 4000)),
+            )
+
+            await reply.send(ctx)
+        except Exception as e:
+            reply = EmbedReply(
+                "Debug - Startup - Error",
+                "debug",
+                error=True,
+                description=f"Error: {e}",
+            )
+            await reply.send(ctx)
+
 
 def setup(bot):
     currentFile = sys.modules[__name__]
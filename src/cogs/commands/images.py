@@ -4,7 +4,7 @@ import sys
 from discord.ext import commands
 
 from src.classes import *
-from src.utils import imagesCog, images, text, dates
+from src.utils import imagesCog, images, text, dates, fts
 from src.errors import *
 
 MIN_IMAGE_DESCRIPTION_LENGTH = 2
@@ -19,6 +19,8 @@ class ImageCommands(commands.Cog):
 
         self.description = "Commands for interacting with images in the bot."
 
+        fts.ensureSearchIndex("imagesSearch")
+
     imageCommands = discord.SlashCommandGroup(
         name="images",
         description="Commands for interacting with images in the bot.",
@@ -79,7 +81,7 @@ class ImageCommands(commands.Cog):
             keywordsSplit = keywords.split(",") if keywords else None
 
             # 3. Check for duplicates
-            duplicateImage = database.get(
+            duplicateImage = await database.aget(
                 query="SELECT * FROM images WHERE link = ?", params=(link,), limit=1
             )
 
@@ -108,7 +110,7 @@ class ImageCommands(commands.Cog):
                 createdBy=ctx.user.id,
             )
 
-            newImageObj.writeToDB()
+            await newImageObj.writeToDB()
 
             # 5. Success UI
             reply = EmbedReply(
@@ -146,7 +148,7 @@ class ImageCommands(commands.Cog):
             sql = "SELECT * FROM images WHERE id = ? OR link = ?"
             params = (query, query)
 
-            results = db.get(sql, params)
+            results = await db.aget(sql, params)
 
             if not results:
                 raise Exception(
@@ -157,7 +159,7 @@ class ImageCommands(commands.Cog):
 
             sql = "DELETE FROM images WHERE id = ? OR link = ?"
 
-            db.query(sql, params)
+            await db.aset(sql, params)
 
             newEmbed = EmbedReply(
                 "Images - Delete",
@@ -190,20 +192,16 @@ class ImageCommands(commands.Cog):
         try:
             db = LocalDatabase()
 
-            # Search by ID, Link, Album (Partial), or Keywords (Partial)
-            sql = """
-                SELECT * FROM images 
-                WHERE id = ? 
-                OR link = ? 
-                OR album LIKE ? 
-                OR keywords LIKE ?
-                OR description LIKE ?
-            """
+            # Exact match on ID or Link first, then a ranked full-text search over Album, Keywords and Description
+            results = await db.aget(
+                "SELECT * FROM images WHERE id = ? OR link = ?", (query, query)
+            )
 
-            wildcard_query = f"%{query}%"
-            params = (query, query, wildcard_query, wildcard_query, wildcard_query)
+            if not results:
+                searchQuery = fts.buildSearchQuery("imagesSearch", query)
 
-            results = db.get(sql, params)
+                if searchQuery:
+                    results = await db.aget(*searchQuery)
 
             if not results:
                 reply = EmbedReply(
@@ -254,7 +252,7 @@ class ImageCommands(commands.Cog):
             sql = "SELECT * FROM images WHERE id = ? OR link = ?"
             params = (query, query)
 
-            results = db.get(sql, params)
+            results = await db.aget(sql, params)
 
             if not results:
                 reply = EmbedReply(
@@ -310,7 +308,7 @@ class ImageCommands(commands.Cog):
                 sql += " WHERE album LIKE ?"
                 params = (f"%{album}%",)
 
-            results = db.get(sql, params)
+            results = await db.aget(sql, params)
 
             if not results and album:
                 reply = EmbedReply(
@@ -63,7 +63,7 @@ class Jokes(commands.Cog):
             if "jokes" not in tables:
                 raise Exception("No jokes table...")
 
-            jokes: list[tuple] = database.get("SELECT * FROM jokes")
+            jokes: list[tuple] = await database.aget("SELECT * FROM jokes")
 
         except Exception as e:
             debugReply.description = (
@@ -73,7 +73,7 @@ class Jokes(commands.Cog):
             await debugReply.send(ctx)
             return
         if id and jokes:
-            filteredJokes: list[tuple] = database.get(
+            filteredJokes: list[tuple] = await database.aget(
                 "SELECT * FROM jokes WHERE id = ?", (id,)
             )
 
@@ -87,7 +87,7 @@ class Jokes(commands.Cog):
             else:
                 joke = random.choice(filteredJokes)
         elif expense and jokes:
-            filteredJokes: list[tuple] = database.get(
+            filteredJokes: list[tuple] = await database.aget(
                 "SELECT * FROM jokes WHERE expense = ?", (expense.id,)
             )
 
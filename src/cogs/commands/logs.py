@@ -1,11 +1,15 @@
 import discord
 import sys
-from discord.ext import commands
-from src.utils.logging import messageLogs
+from discord.ext import commands, pages
+from src.utils.logging import messageLogs, logBuffer
+from src.utils import dates, fts, text
 from src.errors import *
 
 from src.classes import *
 
+MESSAGE_SEARCH_RESULTS_PER_PAGE = 5
+MAX_MESSAGE_SEARCH_RESULTS = 200
+
 
 class LogCommands(commands.Cog):
     ISCOG = True
@@ -15,6 +19,8 @@ class LogCommands(commands.Cog):
 
         self.description = "Commands for log entries."
 
+        fts.ensureSearchIndex("messagesSearch")
+
     logCommands = discord.SlashCommandGroup(
         name="logs",
         description="Commands for log entries.",
@@ -41,11 +47,14 @@ class LogCommands(commands.Cog):
         try:
             database = LocalDatabase(database="logs")
 
+            # Make sure recently logged messages are on disk before looking them up.
+            await logBuffer.getLogBuffer("logs").flush()
+
             sql = f"SELECT * FROM messages WHERE entryID = ? OR discordMessageID = ?"
 
             params = (id, id)
 
-            result = database.get(sql, params, limit=1)
+            result = await database.aget(sql, params, limit=1)
 
             if not result:
                 raise Exception(
@@ -65,6 +74,90 @@ class LogCommands(commands.Cog):
 
             await reply.send(ctx)
 
+    @messageLogCommands.command(
+        description="Search logged messages by their content.",
+        guild_ids=[799341195109203998],
+    )
+    async def search(
+        self,
+        ctx: discord.ApplicationContext,
+        query: discord.Option(str, description="Words to search for. Partial words match too."),  # type: ignore
+        member: discord.Option(discord.User, description="Optional: Only messages sent by this user.", required=False) = None,  # type: ignore
+        channel: discord.Option(discord.abc.GuildChannel, description="Optional: Only messages sent in this channel.", required=False) = None,  # type: ignore
+        limit: discord.Option(int, description="How many results to return, best match first.", default=50, min_value=1, max_value=MAX_MESSAGE_SEARCH_RESULTS) = 50,  # type: ignore
+    ):
+        await ctx.defer()
+
+        try:
+            database = LocalDatabase(database="logs")
+
+            await logBuffer.getLogBuffer("logs").flush()
+
+            conditions = []
+            params = ()
+
+            if member:
+                conditions.append("t.userID = ?")
+                params += (member.id,)
+
+            if channel:
+                conditions.append("t.channelID = ?")
+                params += (channel.id,)
+
+            searchQuery = fts.buildSearchQuery(
+                "messagesSearch",
+                query,
+                where=" AND ".join(conditions),
+                params=params,
+                limit=limit,
+            )
+
+            if not searchQuery:
+                raise Exception("The search query has no words to search for.")
+
+            results = await database.aget(*searchQuery)
+
+            if not results:
+                raise Exception(f"No logged messages matched `{query}`.")
+
+            entries = [messageLogs.dbResultToLogEntry(result) for result in results]
+
+            pageList = []
+
+            for chunk in range(0, len(entries), MESSAGE_SEARCH_RESULTS_PER_PAGE):
+                page = EmbedReply(
+                    "Logs - Messages - Search",
+                    "logs",
+                    description=f"Logged messages matching `{query}`, best match first. ({len(entries)} Result{"s" if len(entries) != 1 else ""})",
+                )
+
+                for entry in entries[chunk : chunk + MESSAGE_SEARCH_RESULTS_PER_PAGE]:
+                    jumpLink = (
+                        f"\nView: https://discord.com/channels/{entry.guildID}/{entry.channelID}/{entry.discordMessageID}"
+                        if entry.guildID
+                        else ""
+                    )
+
+                    page.add_field(
+                        name=text.truncateString(
+                            f"@{entry.userName} in {entry.channelName}", 256
+                        )[0],
+                        value=f"> {text.truncateString(entry.content, 300)[0]}\n{dates.formatSimpleDate(entry.timestamp, discordDateFormat="f")} · Entry ID: {entry.id}{jumpLink}",
+                        inline=False,
+                    )
+
+                pageList.append(page)
+
+            paginator = pages.Paginator(pages=pageList)
+
+            await paginator.respond(ctx.interaction)
+        except Exception as e:
+            reply = EmbedReply(
+                "Logs - Messages - Error", "", error=True, description=f"Error: {e}"
+            )
+
+            await reply.send(ctx)
+
 
 def setup(bot):
     currentFile = sys.modules[__name__]
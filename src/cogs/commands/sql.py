@@ -5,6 +5,7 @@ import sys
 
 from src.utils import dates
 from src.utils import db
+from src.utils import taylortracker
 from src.errors import *
 
 from src.classes import *
@@ -92,6 +93,10 @@ class Sql(commands.Cog):
 
                 success = databaseConnection.setOneRaw(query)
 
+                # Raw writes skip the subscriber registry, so reload it if they could have touched it.
+                if taylortracker.DB_TABLE_NAME in query.lower():
+                    taylortracker.invalidateSubscribers()
+
                 reply.description = f"Successfully set your data ({query})."
 
                 await reply.send(ctx)
@@ -100,6 +105,9 @@ class Sql(commands.Cog):
 
                 databaseConnection.queryRaw(query)
 
+                if taylortracker.DB_TABLE_NAME in query.lower():
+                    taylortracker.invalidateSubscribers()
+
                 reply.description = f"Ran your query ({query})."
 
                 await reply.send(ctx)
@@ -1,10 +1,12 @@
+import asyncio
 import discord
 import sys
 from discord.ext import commands
 
 from src.classes import *
 from src import constants
-from src.utils import stats
+from src.utils import stats, db
+from src.utils.logging import rollups
 from src.errors import *
 
 LEADERBOARD_AMOUNT = 10
@@ -38,16 +40,17 @@ class StatsCommand(commands.Cog):
         await ctx.defer()
 
         try:
-            logEntries = stats.fetchCommandLogs()
+            topCommands = await stats.tallyCommandRollups(
+                key="qualifiedCommandName",
+                reverseSort=True,
+                limit=LEADERBOARD_AMOUNT,
+            )
 
-            if not logEntries:
+            if not topCommands:
                 raise Exception("No one has used a command matching those filters!")
 
-            topCommands = stats.tallyByEntryAttribute(
-                entries=logEntries, key="qualifiedCommandName", reverseSort=True
-            )
-            topUsers = stats.tallyByEntryAttribute(
-                entries=logEntries, key="invocationUserID", reverseSort=True
+            topUsers = await stats.tallyCommandRollups(
+                key="invocationUserID", reverseSort=True, limit=LEADERBOARD_AMOUNT
             )
 
             reply = EmbedReply(
@@ -90,6 +93,126 @@ class StatsCommand(commands.Cog):
 
             await reply.send(ctx)
 
+    statsMessages = statsGroup.create_subgroup(
+        "messages",
+        "Use these commands to view stats for chat messages.",
+        guild_ids=[799341195109203998],
+    )
+
+    @statsMessages.command(
+        name="top",
+        description="View the most active chatters and channels.",
+        guild_ids=[799341195109203998],
+    )
+    async def messagesTop(
+        self,
+        ctx: discord.ApplicationContext,
+        words: discord.Option(
+            bool,
+            description="Rank by words sent instead of messages sent.",
+            default=False,
+        ),  # type: ignore
+    ):
+        await ctx.defer()
+
+        try:
+            unit = "Words" if words else "Messages"
+
+            topUsers = await stats.tallyMessageRollups(
+                key="userID",
+                reverseSort=True,
+                limit=LEADERBOARD_AMOUNT,
+                countWords=words,
+                includeDMS=False,
+            )
+
+            if not topUsers:
+                raise Exception("No messages have been logged yet!")
+
+            topChannels = await stats.tallyMessageRollups(
+                key="channelID",
+                reverseSort=True,
+                limit=LEADERBOARD_AMOUNT,
+                countWords=words,
+                includeDMS=False,
+            )
+
+            reply = EmbedReply(
+                "Stats - Messages - Top",
+                "stats",
+                description=f"Here is the leaderboard for the top chatters and channels by {unit.lower()} sent.",
+            )
+
+            formattedTopUsers = ""
+
+            for idx, user in enumerate(topUsers, start=1):
+                formattedTopUsers += f"{constants.RANKING_MEDALS.get(str(idx), "")} {idx}. <@{user[0]}> ({user[1]} {unit})\n"
+
+            reply.add_field(name="👤 Top Chatters", value=formattedTopUsers, inline=False)
+
+            formattedTopChannels = ""
+
+            for idx, channel in enumerate(topChannels, start=1):
+                formattedTopChannels += f"{constants.RANKING_MEDALS.get(str(idx), "")} {idx}. <#{channel[0]}> ({channel[1]} {unit})\n"
+
+            reply.add_field(
+                name="💬 Top Channels", value=formattedTopChannels, inline=False
+            )
+
+            await reply.send(ctx)
+
+        except Exception as e:
+            reply = EmbedReply(
+                "Stats - Messages - Error",
+                "",
+                error=True,
+                description=f"Error: {e}",
+            )
+
+            await reply.send(ctx)
+
+    statsRollups = statsGroup.create_subgroup(
+        "rollups",
+        "Use these commands to manage the pre-aggregated stats tables.",
+        guild_ids=[799341195109203998],
+    )
+
+    @statsRollups.command(
+        description="OWNER ONLY: Rebuild the daily stats rollups from the raw command and message logs.",
+        guild_ids=[799341195109203998],
+    )
+    @is_owner_only()
+    async def rebuild(self, ctx: discord.ApplicationContext):
+        await ctx.defer()
+
+        try:
+            loop = asyncio.get_running_loop()
+
+            reply = EmbedReply(
+                "Stats - Rollups - Rebuild",
+                "stats",
+                description="Rebuilt the stats rollups from the raw logs.",
+            )
+
+            for table in rollups.ROLLUPS:
+                rowCount = await loop.run_in_executor(
+                    db.writerExecutor(), rollups.rebuildRollup, table
+                )
+
+                reply.add_field(name=table, value=f"{rowCount} Rows", inline=False)
+
+            await reply.send(ctx)
+
+        except Exception as e:
+            reply = EmbedReply(
+                "Stats - Rollups - Error",
+                "",
+                error=True,
+                description=f"Error: {e}",
+            )
+
+            await reply.send(ctx)
+
 
 def setup(bot):
     currentFile = sys.modules[__name__]
@@ -1,12 +1,23 @@
 import discord
 import sys
-from discord.ext import commands
+import asyncio
+import time
+from discord.ext import commands, tasks
 
 from src.classes import *
 from src.utils import tarkov
+from src.utils import tarkovCatalogue
+from src.utils import tarkovPrices
 from src.errors import *
 
 
+async def itemAutocomplete(ctx: discord.AutocompleteContext):
+    if ctx.options.get("by_id"):
+        return []
+
+    return tarkovCatalogue.autocomplete(ctx.value)
+
+
 class TarkovItemCommands(commands.Cog):
     ISCOG = True
 
@@ -15,6 +26,89 @@ class TarkovItemCommands(commands.Cog):
 
         self.description = "Commands for looking up items in Escape from Tarkov."
 
+        self.refreshCatalogue.start()
+        self.refreshPrices.start()
+
+    def cog_unload(self):
+        self.refreshCatalogue.cancel()
+        self.refreshPrices.cancel()
+
+    @tasks.loop(hours=tarkovCatalogue.FULL_REFRESH_HOURS)
+    async def refreshCatalogue(self):
+        try:
+            # Serve searches from the last snapshot straight away, then replace it with fresh data.
+            if tarkovCatalogue.catalogue is None:
+                started = time.perf_counter()
+
+                if await tarkovCatalogue.loadSnapshot():
+                    print(
+                        f"Tarkov catalogue loaded from snapshot in {time.perf_counter() - started:.2f}s."
+                    )
+
+            if tarkovCatalogue.OFFLINE:
+                return
+
+            started = time.perf_counter()
+
+            await tarkovCatalogue.refreshCatalogue()
+
+            print(
+                f"Tarkov catalogue refreshed with {len(tarkovCatalogue.catalogue.items):,} items in {time.perf_counter() - started:.2f}s."
+            )
+        except Exception as e:
+            print(f"Tarkov catalogue refresh failed: {e}")
+
+            self.rescheduleCatalogueRefresh()
+
+            return
+
+        self.rescheduleCatalogueRefresh()
+
+        await self.recordPrices()
+
+    def rescheduleCatalogueRefresh(self):
+        # With nothing to search yet, retry soon instead of leaving the commands without items until the next full refresh.
+        if tarkovCatalogue.catalogue is None:
+            self.refreshCatalogue.change_interval(
+                minutes=tarkovCatalogue.FAILED_REFRESH_RETRY_MINUTES
+            )
+        elif self.refreshCatalogue.hours != tarkovCatalogue.FULL_REFRESH_HOURS:
+            self.refreshCatalogue.change_interval(
+                hours=tarkovCatalogue.FULL_REFRESH_HOURS
+            )
+
+    @tasks.loop(minutes=tarkovCatalogue.PRICE_REFRESH_MINUTES)
+    async def refreshPrices(self):
+        if tarkovCatalogue.OFFLINE:
+            return
+
+        try:
+            await tarkovCatalogue.refreshPrices()
+        except Exception as e:
+            print(f"Tarkov price refresh failed: {e}")
+
+            return
+
+        await self.recordPrices()
+
+    async def recordPrices(self):
+        catalogue = tarkovCatalogue.catalogue
+
+        if catalogue is None:
+            return
+
+        try:
+            await tarkovPrices.recordPrices(
+                list(catalogue.items.values()), catalogue.pricesFetchedAt
+            )
+        except Exception as e:
+            print(f"Tarkov price history sample failed: {e}")
+
+    @refreshPrices.before_loop
+    async def beforeRefreshPrices(self):
+        # The first full refresh already has current prices.
+        await asyncio.sleep(tarkovCatalogue.PRICE_REFRESH_MINUTES * 60)
+
     tarkovCommands = discord.SlashCommandGroup(
         name="tarkov",
         description="Commands for interacting with data from Escape from Tarkov.",
@@ -31,11 +125,18 @@ class TarkovItemCommands(commands.Cog):
         description="Search for an item by name or tarkov.dev ID.",
         guild_ids=[799341195109203998],
     )
-    async def search(self, ctx: discord.ApplicationContext, query: discord.Option(str, description="An in-game item to search for.", required=True), include_crafts: discord.Option(bool, description="Whether to include crafting in the response.", default=False), include_barters: discord.Option(bool, description="Whether to include barters in the response.", default=False), by_id: discord.Option(bool, description="Whether the item provided is an ID. (Must be a tarkov.dev ID)", default=False)):  # type: ignore
+    async def search(self, ctx: discord.ApplicationContext, query: discord.Option(str, description="An in-game item to search for.", required=True, autocomplete=itemAutocomplete), include_crafts: discord.Option(bool, description="Whether to include crafting in the response.", default=False), include_barters: discord.Option(bool, description="Whether to include barters in the response.", default=False), by_id: discord.Option(bool, description="Whether the item provided is an ID. (Must be a tarkov.dev ID)", default=False)):  # type: ignore
         try:
             await ctx.defer()
 
-            relevantItems = await tarkov.fetchItems(itemQuery=query, byId=by_id)
+            relevantItems = tarkovCatalogue.search(query, byId=by_id)
+
+            # Until the catalogue has loaded, fall back to asking the API directly.
+            if relevantItems is None:
+                if tarkovCatalogue.OFFLINE:
+                    raise Exception("The item catalogue is unavailable and the bot is running offline, so tarkov.dev can't be searched instead!")
+
+                relevantItems = await tarkov.fetchItems(itemQuery=query, byId=by_id)
 
             if not relevantItems:
                 raise Exception("No items found for that query!")
@@ -65,6 +166,71 @@ class TarkovItemCommands(commands.Cog):
 
             await reply.send(ctx)
 
+    @itemCommands.command(
+        description="Chart an item's flea market price history.",
+        guild_ids=[799341195109203998],
+    )
+    async def history(self, ctx: discord.ApplicationContext, query: discord.Option(str, description="An in-game item to chart.", required=True, autocomplete=itemAutocomplete), days: discord.Option(int, description="How many days of history to show.", min_value=1, max_value=tarkovPrices.HISTORY_MAX_DAYS, default=7), by_id: discord.Option(bool, description="Whether the item provided is an ID. (Must be a tarkov.dev ID)", default=False)):  # type: ignore
+        try:
+            await ctx.defer()
+
+            relevantItems = tarkovCatalogue.search(query, byId=by_id, limit=1)
+
+            if relevantItems is None:
+                raise Exception("The item catalogue is unavailable right now, try again in a few minutes!")
+
+            if not relevantItems:
+                raise Exception("No items found for that query!")
+
+            item = relevantItems[0]
+
+            history = await tarkovPrices.fetchHistory(item.id, days)
+
+            averages = [avg for _, avg, _, _ in history if avg is not None]
+
+            if len(averages) < 2:
+                raise Exception(f"Not enough price history has been recorded for {item.name} yet!")
+
+            loop = asyncio.get_running_loop()
+
+            # Rendering is CPU bound, so it's kept off the event loop.
+            chart = await loop.run_in_executor(
+                None, tarkovPrices.renderChart, item.name, history
+            )
+
+            change = averages[-1] - averages[0]
+            changePercent = change / averages[0] * 100 if averages[0] else 0.0
+
+            lows = [low for _, _, low, _ in history if low is not None]
+            highs = [high for _, _, _, high in history if high is not None]
+
+            reply = tarkov.TarkovEmbedReply(
+                f"{item.name} - Price History",
+                url=item.wikiLink or None,
+                description=(
+                    f"**24h Average:** ₽ {averages[0]:,} → ₽ {averages[-1]:,} ({change:+,} / {changePercent:+.1f}%)\n"
+                    f"**Lowest:** ₽ {min(lows or averages):,}\n"
+                    f"**Highest:** ₽ {max(highs or averages):,}\n"
+                    f"*Over the last {days} day{"s" if days != 1 else ""}.*"
+                ),
+            )
+
+            reply.set_thumbnail(url=item.gridImage)
+            reply.set_image(url="attachment://history.png")
+
+            await ctx.followup.send(
+                embed=reply, file=discord.File(chart, filename="history.png")
+            )
+        except Exception as e:
+            reply = EmbedReply(
+                "Tarkov - Item History - Error",
+                "tarkov",
+                error=True,
+                description=f"Error: {e}",
+            )
+
+            await reply.send(ctx)
+
 
 def setup(bot):
     currentFile = sys.modules[__name__]
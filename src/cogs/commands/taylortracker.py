@@ -3,23 +3,15 @@ import sys
 from discord.ext import commands
 
 from src.classes import *
+from src.errors import *
 
 from src.utils import dates
+from src.utils import broadcast
+from src.utils import taylortracker
 
-import telethon
-from io import BytesIO
+import asyncio
+import datetime
 
-TELEGRAM_API_ID = os.getenv("TELEGRAM_API_ID")
-TELEGRAM_API_HASH = os.getenv("TELEGRAM_API_HASH")
-TELEGRAM_PHONE = os.getenv("TELEGRAM_PHONE")
-TELEGRAM_PASSWORD = os.getenv("TELEGRAM_PASSWORD")
-
-CHAT_IDS = [2487799389, 1960735023]
-
-DB_TABLE_NAME = "taylortracker"
-
-CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
-TEMP_DIR = os.path.join(CURRENT_DIR, '..', 'temp')
 
 class TaylorTracker(commands.Cog):
     ISCOG = True
@@ -29,77 +21,147 @@ class TaylorTracker(commands.Cog):
         
         self.description = "Sends updates on the status of Taylor's jet. Use /data add table:taylortracker."
 
-        self.telegramClient = telethon.TelegramClient(
-            "taylortracker",
-            TELEGRAM_API_ID,
-            TELEGRAM_API_HASH
-        )
+        # The feed is connected by a supervised task once the bot is ready, so a slow or failing
+        # Telegram login never holds up startup.
+        self.source = taylortracker.createSource()
+        self.supervisor: asyncio.Task | None = None
+        self.stopped = False
+        self.lastBroadcast: broadcast.BroadcastReport | None = None
+
+    @commands.Cog.listener()
+    async def on_ready(self):
+        # on_ready fires again after gateway reconnects, the supervisor only needs starting once.
+        if self.supervisor is None and not self.stopped:
+            await taylortracker.loadSubscribers()
+
+            self.supervisor = asyncio.create_task(
+                taylortracker.supervise(self.source, self.newMessageInTrackerChat)
+            )
 
-        self.telegramClient.loop.run_until_complete(self.tracker())
+    def cog_unload(self):
+        if self.supervisor is not None:
+            self.supervisor.cancel()
 
-    def uploadImage(self, path) -> discord.File:
-        if path:
-            with open(path, "rb") as media:
-                data = media.read()
-            upload = discord.File(BytesIO(data), filename=os.path.basename(path))
-            return upload
-        else:
-            return None
-    
-    async def newMessageInTrackerChat(self, event):
-        msg: telethon.types.Message = event.message
+        self.supervisor = None
+
+    async def stopSupervisor(self):
+        """
+        Cancels the feed and waits for it to disconnect. The bot awaits this before closing the HTTP
+        session and database connections, which cog_unload alone can't wait for.
+        """
+        self.stopped = True
 
-        sender: telethon.types.Channel = await msg.get_sender()
+        supervisor, self.supervisor = self.supervisor, None
 
-        if sender.id not in CHAT_IDS:
+        if supervisor is None:
             return
-        
-        database = LocalDatabase()
 
-        channelsToSendTo = database.get(f"SELECT receivingChannel FROM {DB_TABLE_NAME}")
+        supervisor.cancel()
+
+        await asyncio.gather(supervisor, return_exceptions=True)
+
+    async def newMessageInTrackerChat(self, update: taylortracker.TrackerUpdate):
+        channelsToSendTo = await taylortracker.getSubscribers()
 
         if not channelsToSendTo:
             return
         
-        telegramMedia = await msg.download_media(TEMP_DIR)
+        # Read once and shared by every channel, each send gets its own file wrapper.
+        media = await update.readMedia()
 
-        uploadedMedia = self.uploadImage(telegramMedia)
+        message = update.text or ""
 
-        action = "Departure" if "Took off" in msg.message else "Arrival" if "Landed" in msg.message else "Circling" if "Circling" in msg.message else "Other"
+        action = "Departure" if "Took off" in message else "Arrival" if "Landed" in message else "Circling" if "Circling" in message else "Other"
 
         reply = EmbedReply(f"Taylor Swift Tracker - {action}", "taylortracker")
 
-        if telegramMedia:
-            telegramMediaFilename = os.path.basename(telegramMedia)
+        if media:
+            reply.set_image(url=f"attachment://{media.filename}")
         
-            reply.set_image(url=f"attachment://{telegramMediaFilename}")
-        
-        reply.description = msg.message if msg.message else "No Message"
+        reply.description = message if message else "No Message"
+
+        reply.set_footer(text=f"{dates.formatSimpleDate(update.date) if update.date else "N/D"} UTC · t.me/s/TSwiftJets")
+
+        report = await broadcast.broadcast(
+            self.bot,
+            list(channelsToSendTo),
+            media=media,
+            embed=reply,
+        )
 
-        reply.set_footer(text=f"{dates.formatSimpleDate(msg.date) if msg.date else "N/D"} UTC · t.me/s/TSwiftJets")
+        self.lastBroadcast = report
+
+        print(f"TaylorTracker broadcast: {report.summary()}")
+
+        for failure in report.failures:
+            print(f"TaylorTracker broadcast to {failure.channelID} failed: {failure.error}")
+
+    taylorTrackerCommandGroup = discord.SlashCommandGroup(
+        "taylortracker",
+        description="Commands for the Taylor Swift jet tracker.",
+        guild_ids=[799341195109203998],
+    )
+
+    @taylorTrackerCommandGroup.command(
+        description="OWNER ONLY: Posts a fake tracker update. Needs TAYLORTRACKER_SOURCE=stub.",
+        guild_ids=[799341195109203998],
+    )
+    @is_owner_only()
+    async def simulate(
+        self,
+        ctx,
+        message: discord.Option(
+            str,
+            description="The update's text, e.g. 'Took off from ...'.",
+        ),  # type: ignore
+    ):
+        try:
+            if not isinstance(self.source, taylortracker.StubSource):
+                raise Exception("Simulated updates need the stub source. Set TAYLORTRACKER_SOURCE=stub and restart.")
 
-        for channelToSendTo in channelsToSendTo:
-            channel = self.bot.get_channel(channelToSendTo[0])
+            self.source.push(
+                taylortracker.TrackerUpdate(message, datetime.datetime.now(datetime.timezone.utc))
+            )
 
-            if channel:
-                await channel.send(embed=reply, file=uploadedMedia)
+            reply = EmbedReply("Taylor Swift Tracker - Simulate", "taylortracker", description="Queued a simulated update.")
 
-        if telegramMedia:
-            os.remove(telegramMedia)
+            await reply.send(ctx)
+        except Exception as e:
+            reply = EmbedReply("Taylor Swift Tracker - Simulate - Error", "taylortracker", error=True, description=f"Error: {e}")
 
-    async def tracker(self):
+            await reply.send(ctx)
+
+    @taylorTrackerCommandGroup.command(
+        description="Shows how long the last tracker update took to reach each channel.",
+        guild_ids=[799341195109203998],
+    )
+    async def deliveries(self, ctx):
         try:
-            await self.telegramClient.start(
-                TELEGRAM_PHONE,
-                TELEGRAM_PASSWORD
+            report = self.lastBroadcast
+
+            if not report:
+                raise Exception("No tracker updates have been sent since the bot started.")
+
+            deliveries = sorted(report.deliveries, key=lambda delivery: delivery.seconds, reverse=True)
+
+            formatted = [
+                f"· <#{delivery.channelID}> - {delivery.seconds:.2f}s" + (f" - **Failed:** {delivery.error}" if delivery.error else "")
+                for delivery in deliveries
+            ]
+
+            reply = EmbedReply(
+                "Taylor Swift Tracker - Deliveries",
+                "taylortracker",
+                description=f"{report.summary()}\n\n" + "\n".join(text.truncateList(formatted, 3800)),
             )
+
+            reply.set_footer(text=f"Sent {dates.formatSimpleDate(datetime.datetime.fromtimestamp(report.finishedAt))}")
+
+            await reply.send(ctx)
         except Exception as e:
-            self.telegramClient = None
-            
-            raise e
-        
-        if self.telegramClient:            
-            self.telegramClient.add_event_handler(self.newMessageInTrackerChat, telethon.events.NewMessage)
+            reply = EmbedReply("Taylor Swift Tracker - Deliveries - Error", "taylortracker", error=True, description=f"Error: {e}")
+
+            await reply.send(ctx)
 
 def setup(bot):
     currentFile = sys.modules[__name__]
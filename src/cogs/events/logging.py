@@ -4,7 +4,7 @@ from discord.ext import commands
 
 from src.classes import *
 
-from src.utils.logging import commandLogs, messageLogs
+from src.utils.logging import commandLogs, messageLogs, rollups
 from src.utils import dates
 
 
@@ -16,11 +16,13 @@ class CommandLogging(commands.Cog):
 
         self.description = "Command logging cog."
 
+        rollups.ensureRollup("commandRollups")
+
     @commands.Cog.listener()
     async def on_application_command(self, ctx: discord.ApplicationContext):
         logEntryObj = commandLogs.contextToLogEntry(ctx)
 
-        commandLogs.insertLogEntry(logEntryObj)
+        await commandLogs.insertLogEntry(logEntryObj)
 
 
 class MessageLogging(commands.Cog):
@@ -31,11 +33,13 @@ class MessageLogging(commands.Cog):
 
         self.description = "Chat message logging cog."
 
+        rollups.ensureRollup("messageRollups")
+
     @commands.Cog.listener()
     async def on_message(self, msg: discord.Message):
         logEntryObj = messageLogs.messageToLogEntryObj(msg, self.bot)
 
-        logEntryObj.writeToDB()
+        await logEntryObj.writeToDB()
 
 
 def setup(bot):
@@ -0,0 +1,109 @@
+import asyncio
+import time
+import discord
+
+from io import BytesIO
+
+# Sends the same message to many channels at once. discord.py already waits out per-route 429s,
+# so the semaphore only has to keep a large broadcast from bursting into the global rate limit.
+BROADCAST_CONCURRENCY = 5
+
+
+class Media:
+    """An attachment held in memory, so it can be sent to any number of channels."""
+
+    def __init__(self, data: bytes, filename: str):
+        self.data = data
+        self.filename = filename
+
+    def toFile(self) -> discord.File:
+        # A discord.File's buffer is consumed by the upload, so every send needs its own.
+        return discord.File(BytesIO(self.data), filename=self.filename)
+
+
+class Delivery:
+    def __init__(self, channelID: int, seconds: float, error: str | None = None):
+        self.channelID = channelID
+        self.seconds = seconds
+        self.error = error
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+class BroadcastReport:
+    def __init__(self, deliveries: list[Delivery], seconds: float):
+        self.deliveries = deliveries
+        self.seconds = seconds  # Wall time for the whole broadcast.
+        self.finishedAt = time.time()
+
+    @property
+    def failures(self) -> list[Delivery]:
+        return [delivery for delivery in self.deliveries if not delivery.succeeded]
+
+    def summary(self) -> str:
+        delivered = len(self.deliveries) - len(self.failures)
+        slowest = max(
+            (delivery.seconds for delivery in self.deliveries), default=0.0
+        )
+
+        return f"Delivered to {delivered}/{len(self.deliveries)} channels in {self.seconds:.2f}s (slowest {slowest:.2f}s)."
+
+
+async def deliver(
+    bot: discord.Bot,
+    channelID: int,
+    semaphore: asyncio.Semaphore,
+    media: Media | None,
+    **kwargs,
+) -> Delivery:
+    async with semaphore:
+        started = time.perf_counter()
+
+        try:
+            channel = bot.get_channel(channelID)
+
+            if channel is None:
+                raise Exception("Channel not found.")
+
+            if media:
+                kwargs["file"] = media.toFile()
+
+            await channel.send(**kwargs)
+        except discord.Forbidden:
+            return Delivery(
+                channelID,
+                time.perf_counter() - started,
+                "Missing permissions to send in this channel.",
+            )
+        except Exception as e:
+            return Delivery(channelID, time.perf_counter() - started, str(e))
+
+        return Delivery(channelID, time.perf_counter() - started)
+
+
+async def broadcast(
+    bot: discord.Bot,
+    channelIDs: list[int],
+    *,
+    media: Media | None = None,
+    concurrency: int = BROADCAST_CONCURRENCY,
+    **kwargs,
+) -> BroadcastReport:
+    """
+    Sends a message to every channel concurrently, at most `concurrency` at a time. kwargs are
+    passed to channel.send(), and media is attached as a fresh file for each channel.
+    One channel failing doesn't stop the others, it's recorded in the returned report instead.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+
+    deliveries = await asyncio.gather(
+        *(
+            deliver(bot, channelID, semaphore, media, **kwargs)
+            for channelID in channelIDs
+        )
+    )
+
+    return BroadcastReport(list(deliveries), time.perf_counter() - started)
@@ -0,0 +1,169 @@
+import asyncio
+import json
+import time
+
+from cachetools import TTLCache
+
+from src.utils import db
+
+# Two-tier cache for JSON API responses. The memory tier is an LRU bounded by entry count where
+# every entry also expires after a TTL. The optional SQLite tier keeps entries across restarts.
+DISK_CACHE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS responseCache (
+        cacheName TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value TEXT NOT NULL,
+        expiresAt REAL NOT NULL,
+        PRIMARY KEY (cacheName, key)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_responseCache_expiresAt ON responseCache (expiresAt)",
+]
+
+# Expired disk rows are swept after this many writes to a cache.
+DISK_PRUNE_EVERY = 200
+
+caches: dict[str, "ResponseCache"] = {}
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        name: str,
+        *,
+        maxEntries: int,
+        ttl: float,
+        database: str | None = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.database = database
+
+        self.memory = TTLCache(maxsize=maxEntries, ttl=ttl)
+
+        self.memoryHits = 0
+        self.diskHits = 0
+        self.misses = 0
+        self.writesSincePrune = 0
+        self.diskReady = False
+
+        caches[name] = self
+
+    def useDisk(self) -> bool:
+        """Whether the SQLite tier is enabled. Creates its table on first use rather than at import time."""
+        if not self.database:
+            return False
+
+        if not self.diskReady:
+            with db.pooledCursor(self.database, commit=True) as cursor:
+                for statement in DISK_CACHE_SCHEMA:
+                    cursor.execute(statement)
+
+            self.diskReady = True
+
+        return True
+
+    async def get(self, key: str):
+        """Returns the cached value for key, or None on a miss. Disk hits are promoted to memory."""
+        value = self.memory.get(key)
+
+        if value is not None:
+            self.memoryHits += 1
+
+            return value
+
+        if self.useDisk():
+            loop = asyncio.get_running_loop()
+
+            rows = await loop.run_in_executor(
+                db.readerExecutor(),
+                db.readQuery,
+                self.database,
+                "SELECT value FROM responseCache WHERE cacheName = ? AND key = ? AND expiresAt > ?",
+                (self.name, key, time.time()),
+            )
+
+            if rows:
+                value = json.loads(rows[0][0])
+
+                self.diskHits += 1
+                self.memory[key] = value
+
+                return value
+
+        self.misses += 1
+
+        return None
+
+    async def set(self, key: str, value) -> None:
+        self.memory[key] = value
+
+        if not self.useDisk():
+            return
+
+        self.writesSincePrune += 1
+
+        prune = self.writesSincePrune >= DISK_PRUNE_EVERY
+
+        if prune:
+            self.writesSincePrune = 0
+
+        loop = asyncio.get_running_loop()
+
+        await loop.run_in_executor(
+            db.writerExecutor(),
+            self.writeToDisk,
+            key,
+            json.dumps(value, separators=(",", ":")),
+            prune,
+        )
+
+    def writeToDisk(self, key: str, value: str, prune: bool) -> None:
+        now = time.time()
+
+        with db.pooledCursor(self.database, commit=True) as cursor:
+            cursor.execute(
+                "INSERT OR REPLACE INTO responseCache (cacheName, key, value, expiresAt) VALUES (?, ?, ?, ?)",
+                (self.name, key, value, now + self.ttl),
+            )
+
+            if prune:
+                cursor.execute(
+                    "DELETE FROM responseCache WHERE expiresAt <= ?", (now,)
+                )
+
+    async def getOrFetch(self, key: str, fetch):
+        """Returns the cached value for key, otherwise awaits fetch() and caches its result."""
+        value = await self.get(key)
+
+        if value is not None:
+            return value
+
+        value = await fetch()
+
+        if value is not None:
+            await self.set(key, value)
+
+        return value
+
+    def clear(self) -> None:
+        self.memory.clear()
+
+        if self.useDisk():
+            with db.pooledCursor(self.database, commit=True) as cursor:
+                cursor.execute(
+                    "DELETE FROM responseCache WHERE cacheName = ?", (self.name,)
+                )
+
+    def stats(self) -> dict[str, int | float]:
+        lookups = self.memoryHits + self.diskHits + self.misses
+
+        return {
+            "entries": len(self.memory),
+            "maxEntries": int(self.memory.maxsize),
+            "memoryHits": self.memoryHits,
+            "diskHits": self.diskHits,
+            "misses": self.misses,
+            "hitRate": (self.memoryHits + self.diskHits) / lookups if lookups else 0.0,
+        }
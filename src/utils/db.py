@@ -1,7 +1,39 @@
+import contextlib
 import json
 import os
 import re
 import pickle
+import sqlite3
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+DATA_PATH = "src/data"
+
+# Applied once to every connection when it is opened. WAL lets readers run alongside the
+# single writer, and synchronous=NORMAL is durable enough in WAL mode without an fsync per commit.
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=134217728",
+)
+
+_availableDatabases: set[str] | None = None
+# database: (connection, lock). Kept as one entry so a caller never sees a connection without its lock.
+_connections: dict[str, tuple[sqlite3.Connection, threading.RLock]] = {}
+_registryLock = threading.Lock()
+
+# Async access runs every write on one dedicated thread (SQLite only allows a single writer)
+# and reads on a small pool, each reader thread holding its own read-only connection.
+READER_THREADS = 4
+
+_writerExecutor: ThreadPoolExecutor | None = None
+_readerExecutor: ThreadPoolExecutor | None = None
+_readerLocal = threading.local()
+_readerConnections: list[sqlite3.Connection] = []
 
 def jsonDB(path: str) -> dict:
     if ".json" not in path:
@@ -35,6 +67,154 @@ def listDBs(path: str = "src/data", withFileExtensions: bool = False, filterByEx
     
     return cleanDatabases
 
+def databaseExists(database: str) -> bool:
+    """
+    Checks a database file name (e.g. 'logs.db') against a cached listing of the data folder.
+    The folder is only rescanned on a miss, so a database created at runtime is still found.
+    """
+    global _availableDatabases
+
+    if _availableDatabases is not None and database in _availableDatabases:
+        return True
+
+    _availableDatabases = set(listDBs(DATA_PATH, withFileExtensions=True) or [])
+
+    return database in _availableDatabases
+
+def openConnection(database: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(
+        os.path.join(DATA_PATH, database), check_same_thread=False
+    )
+
+    for pragma in CONNECTION_PRAGMAS:
+        connection.execute(pragma)
+
+    return connection
+
+def getConnection(database: str) -> tuple[sqlite3.Connection, threading.RLock]:
+    """
+    Returns the long-lived connection for a database along with the lock that guards it.
+    The connection is opened on first use and reused until closeConnections() is called.
+    """
+    entry = _connections.get(database)
+
+    if entry is not None:
+        return entry
+
+    with _registryLock:
+        if database not in _connections:
+            _connections[database] = (openConnection(database), threading.RLock())
+
+        return _connections[database]
+
+@contextlib.contextmanager
+def pooledCursor(database: str, commit: bool = False):
+    """
+    Yields a cursor on the shared connection for a database while holding its lock.
+    If commit is True the transaction is committed on success, and any failure rolls it back
+    so that the shared connection is never left mid-transaction.
+    """
+    connection, lock = getConnection(database)
+
+    with lock:
+        cursor = connection.cursor()
+
+        try:
+            yield cursor
+
+            if commit:
+                connection.commit()
+        except BaseException:
+            if connection.in_transaction:
+                connection.rollback()
+
+            raise
+        finally:
+            cursor.close()
+
+def writerExecutor() -> ThreadPoolExecutor:
+    global _writerExecutor
+
+    with _registryLock:
+        if _writerExecutor is None:
+            _writerExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+
+        return _writerExecutor
+
+def readerExecutor() -> ThreadPoolExecutor:
+    global _readerExecutor
+
+    with _registryLock:
+        if _readerExecutor is None:
+            _readerExecutor = ThreadPoolExecutor(max_workers=READER_THREADS, thread_name_prefix="db-reader")
+
+        return _readerExecutor
+
+def getReaderConnection(database: str) -> sqlite3.Connection:
+    """Returns the calling thread's own read-only connection to a database, opening it on first use."""
+    connections = getattr(_readerLocal, "connections", None)
+
+    if connections is None:
+        connections = _readerLocal.connections = {}
+
+    connection = connections.get(database)
+
+    if connection is None:
+        connection = openConnection(database)
+        connection.execute("PRAGMA query_only=ON")
+
+        connections[database] = connection
+
+        with _registryLock:
+            _readerConnections.append(connection)
+
+    return connection
+
+def readQuery(database: str, query: str, params: tuple = (), limit: int = 0) -> list:
+    """Runs a SELECT on the calling thread's reader connection. Meant to be run on the reader pool."""
+    cursor = getReaderConnection(database).cursor()
+
+    try:
+        cursor.execute(query, params)
+
+        if limit:
+            return cursor.fetchmany(limit)
+
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+def closeConnections():
+    """Shutdown hook. Drains the async executors, then optimizes and closes every pooled connection."""
+    global _writerExecutor, _readerExecutor
+
+    # Let queued writes finish before their connection is closed underneath them.
+    for executor in (_writerExecutor, _readerExecutor):
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    _writerExecutor = None
+    _readerExecutor = None
+
+    with _registryLock:
+        for connection in _readerConnections:
+            try:
+                connection.close()
+            except sqlite3.Error:
+                pass
+
+        _readerConnections.clear()
+
+        for database, (connection, lock) in _connections.items():
+            with lock:
+                try:
+                    connection.execute("PRAGMA optimize")
+                    connection.close()
+                except sqlite3.Error as e:
+                    print(f"Error closing database {database}: {e}")
+
+        _connections.clear()
+
 def serializeObj(obj) -> bytes:
     return pickle.dumps(obj)
 
@@ -0,0 +1,156 @@
+import re
+
+from src.utils import db
+
+# FTS5 full-text indexes over existing tables. Each index is an external-content FTS5 table,
+# so it stores only the index and reads the text back from the source table by rowid.
+# Triggers on the source table keep it in sync.
+# Column weights are passed to bm25() in the same order as the columns.
+SEARCH_INDEXES = {
+    "albumRatingsSearch": {
+        "database": "db.db",
+        "table": "albumRatings",
+        "columns": ("ratingAlbum", "ratingArtist"),
+        "weights": (2.0, 1.0),
+    },
+    "imagesSearch": {
+        "database": "db.db",
+        "table": "images",
+        "columns": ("album", "keywords", "description"),
+        "weights": (2.0, 3.0, 1.0),
+    },
+    "messagesSearch": {
+        "database": "logs.db",
+        "table": "messages",
+        "columns": ("content",),
+        "weights": (1.0,),
+    },
+}
+
+# Prefix indexes make 2 and 3 character "term*" queries cheap. unicode61 with remove_diacritics
+# lets "beyonce" match "Beyoncé".
+TOKENIZER = "unicode61 remove_diacritics 2"
+PREFIX_LENGTHS = "2 3"
+
+SEARCH_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def indexSchema(name: str) -> list[str]:
+    index = SEARCH_INDEXES[name]
+
+    table = index["table"]
+    columns = ", ".join(index["columns"])
+    newValues = ", ".join(f"NEW.{column}" for column in index["columns"])
+    oldValues = ", ".join(f"OLD.{column}" for column in index["columns"])
+
+    return [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5 (
+            {columns},
+            content='{table}',
+            content_rowid='rowid',
+            tokenize='{TOKENIZER}',
+            prefix='{PREFIX_LENGTHS}'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {name}OnInsert AFTER INSERT ON {table}
+        BEGIN
+            INSERT INTO {name} (rowid, {columns}) VALUES (NEW.rowid, {newValues});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {name}OnDelete AFTER DELETE ON {table}
+        BEGIN
+            INSERT INTO {name} ({name}, rowid, {columns}) VALUES ('delete', OLD.rowid, {oldValues});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {name}OnUpdate AFTER UPDATE OF {columns} ON {table}
+        BEGIN
+            INSERT INTO {name} ({name}, rowid, {columns}) VALUES ('delete', OLD.rowid, {oldValues});
+            INSERT INTO {name} (rowid, {columns}) VALUES (NEW.rowid, {newValues});
+        END
+        """,
+    ]
+
+
+def ensureSearchIndex(name: str) -> None:
+    """
+    Creates a full-text index and its sync triggers if they don't exist yet. A newly created
+    index is filled from the existing rows of its source table.
+    """
+    index = SEARCH_INDEXES[name]
+
+    with db.pooledCursor(index["database"], commit=True) as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+        )
+
+        exists = cursor.fetchone() is not None
+
+        for statement in indexSchema(name):
+            cursor.execute(statement)
+
+        if not exists:
+            cursor.execute(f"INSERT INTO {name} ({name}) VALUES ('rebuild')")
+
+
+def rebuildSearchIndex(name: str) -> None:
+    """Re-reads every row of the source table into the index. Run it on the database writer thread."""
+    index = SEARCH_INDEXES[name]
+
+    with db.pooledCursor(index["database"], commit=True) as cursor:
+        cursor.execute(f"INSERT INTO {name} ({name}) VALUES ('rebuild')")
+
+
+def buildMatchQuery(query: str) -> str | None:
+    """
+    Turns free text into an FTS5 MATCH expression. Every word has to match, and each is treated as a
+    prefix so partial words still find results. Words are quoted, so FTS5 syntax typed by a user is
+    treated as plain text. Returns None if the query has no searchable words.
+    """
+    terms = SEARCH_TERM.findall(query)
+
+    if not terms:
+        return None
+
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def buildSearchQuery(
+    name: str,
+    query: str,
+    *,
+    where: str = "",
+    params: tuple = (),
+    limit: int = 0,
+) -> tuple[str, tuple] | None:
+    """
+    Returns (sql, params) selecting every column of the source table for rows matching query, best match
+    first by bm25. Extra conditions on the source table (aliased as t) can be passed with where/params.
+    Returns None if the query has no searchable words.
+    """
+    match = buildMatchQuery(query)
+
+    if match is None:
+        return None
+
+    index = SEARCH_INDEXES[name]
+    weights = ", ".join(str(weight) for weight in index["weights"])
+
+    sql = f"""
+        SELECT t.* FROM {name}
+        JOIN {index["table"]} t ON t.rowid = {name}.rowid
+        WHERE {name} MATCH ?
+    """
+
+    if where:
+        sql += f" AND ({where})"
+
+    sql += f" ORDER BY bm25({name}, {weights})"
+
+    if limit:
+        sql += f" LIMIT {int(limit)}"
+
+    return sql, (match, *params)
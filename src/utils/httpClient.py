@@ -0,0 +1,130 @@
+import asyncio
+import contextlib
+import random
+
+import aiohttp
+
+# One pooled session for all outbound HTTP, so connections (and their DNS lookups and TLS handshakes)
+# are reused between requests. The bot opens it on start and closes it on shutdown.
+
+# Connection pool limits, and how long idle keep-alive connections and DNS results are kept.
+CONNECTION_LIMIT = 100
+CONNECTION_LIMIT_PER_HOST = 10
+KEEPALIVE_TIMEOUT = 30
+DNS_CACHE_TTL = 300
+
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=10, sock_read=20)
+
+# Retry policy. Only idempotent methods are retried unless a caller opts in, since a retried POST
+# could otherwise be applied twice.
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 10
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+session: aiohttp.ClientSession | None = None
+
+
+def getSession() -> aiohttp.ClientSession:
+    """Returns the shared session, opening it on first use. Must be called from the bot's event loop."""
+    global session
+
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=CONNECTION_LIMIT,
+                limit_per_host=CONNECTION_LIMIT_PER_HOST,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+                ttl_dns_cache=DNS_CACHE_TTL,
+            ),
+            timeout=DEFAULT_TIMEOUT,
+        )
+
+    return session
+
+
+async def closeSession() -> None:
+    """Shutdown hook. Closes the shared session and its pooled connections."""
+    global session
+
+    if session is not None and not session.closed:
+        await session.close()
+
+    session = None
+
+
+def retryDelay(attempt: int, response: aiohttp.ClientResponse | None = None) -> float:
+    """Honours Retry-After when the server sends one, otherwise exponential backoff with jitter."""
+    if response is not None:
+        retryAfter = response.headers.get("Retry-After")
+
+        if retryAfter:
+            try:
+                return min(float(retryAfter), BACKOFF_MAX)
+            except ValueError:
+                pass
+
+    return min(BACKOFF_BASE * (2**attempt), BACKOFF_MAX) * random.uniform(0.5, 1.5)
+
+
+@contextlib.asynccontextmanager
+async def request(
+    method: str,
+    url: str,
+    *,
+    retry: bool | None = None,
+    retries: int = MAX_RETRIES,
+    retryStatuses: set[int] = RETRY_STATUSES,
+    **kwargs,
+):
+    """
+    Makes a request on the shared session and yields the response, the same as session.request().
+    Connection errors, timeouts and RETRY_STATUSES responses are retried with backoff.
+    By default only idempotent methods are retried. Pass retry=True for requests that are safe to
+    repeat, or retry=False to turn retrying off. The last response is yielded as-is once retries run out.
+    Callers that handle a status themselves (e.g. a long Retry-After on 429) can leave it out of retryStatuses.
+    """
+    method = method.upper()
+
+    if retry is None:
+        retry = method in IDEMPOTENT_METHODS
+
+    if not retry:
+        retries = 0
+
+    timeout = kwargs.get("timeout")
+
+    if isinstance(timeout, (int, float)):
+        kwargs["timeout"] = aiohttp.ClientTimeout(total=timeout)
+
+    attempt = 0
+
+    while True:
+        try:
+            response = await getSession().request(method, url, **kwargs)
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt >= retries:
+                raise
+
+            await asyncio.sleep(retryDelay(attempt))
+
+            attempt += 1
+            continue
+
+        if response.status in retryStatuses and attempt < retries:
+            delay = retryDelay(attempt, response)
+
+            response.release()
+
+            await asyncio.sleep(delay)
+
+            attempt += 1
+            continue
+
+        try:
+            yield response
+        finally:
+            response.release()
+
+        return
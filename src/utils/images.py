@@ -1,10 +1,21 @@
+import asyncio
 import discord
 import aiohttp
 import os
-import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
-from PIL import Image
-from sklearn.cluster import KMeans
+
+from src.utils import cache, httpClient
+
+# Cover colours are cached by URL and number of colours. A URL's image doesn't change, so entries live for a month.
+colourCache = cache.ResponseCache(
+    "coverColours", maxEntries=1024, ttl=30 * 24 * 60 * 60, database="db.db"
+)
+
+# KMeans is CPU bound and holds the GIL, so it runs in worker processes instead of on the event loop.
+KMEANS_PROCESSES = 2
+
+processPool: ProcessPoolExecutor | None = None
 
 
 async def uploadToChibisafe(image: discord.Attachment | bytes):
@@ -29,38 +40,90 @@ async def uploadToChibisafe(image: discord.Attachment | bytes):
 
     headers = {"x-api-key": f"{token}", "Accept": "application/json"}
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(cdnEndpoint, data=data, headers=headers) as response:
-            if response.status == 200:
-                res_data = await response.json()
-                return res_data.get("url")
-            else:
-                error_text = await response.text()
-                raise Exception(
-                    f"Chibisafe Upload Failed ({response.status}): {error_text}"
-                )
+    async with httpClient.request(
+        "POST", cdnEndpoint, data=data, headers=headers
+    ) as response:
+        if response.status == 200:
+            res_data = await response.json()
+            return res_data.get("url")
+        else:
+            error_text = await response.text()
+            raise Exception(
+                f"Chibisafe Upload Failed ({response.status}): {error_text}"
+            )
 
 
-async def extractColours(url: str, num_colors: int = 1) -> list:
-    """Downloads image and runs KMeans clustering to find dominant colors."""
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url) as response:
-            if response.status != 200:
-                return [[0, 0, 0]]  # Fallback to black on error
+def getProcessPool() -> ProcessPoolExecutor:
+    global processPool
+
+    if processPool is None:
+        processPool = ProcessPoolExecutor(max_workers=KMEANS_PROCESSES)
+
+    return processPool
 
-            content = await response.read()
 
-    # Processing with Pillow/Numpy (CPU intensive, but manageable)
+def shutdownProcessPool() -> None:
+    global processPool
+
+    if processPool is not None:
+        processPool.shutdown(wait=False, cancel_futures=True)
+
+    processPool = None
+
+
+# numpy, Pillow and scikit-learn are imported where they're used rather than at module level. Together
+# they add seconds to startup, and most restarts never extract a colour.
+def loadPixels(content: bytes) -> "numpy.ndarray":
+    import numpy as np
+    from PIL import Image
+
     img = Image.open(BytesIO(content)).convert("RGB")
     img = img.resize((150, 150))
 
     img_data = np.array(img)
-    img_data = img_data.reshape((-1, 3))
+    return img_data.reshape((-1, 3))
+
+
+def meanColour(content: bytes) -> list:
+    """Single dominant colour. KMeans with one cluster lands on the mean, so skip the clustering."""
+    return [loadPixels(content).mean(axis=0).astype(int).tolist()]
+
+
+def clusterColours(content: bytes, num_colors: int) -> list:
+    from sklearn.cluster import KMeans
 
     kmeans = KMeans(n_clusters=num_colors, random_state=42, n_init="auto")
-    kmeans.fit(img_data)
+    kmeans.fit(loadPixels(content))
+
+    return kmeans.cluster_centers_.astype(int).tolist()
+
+
+async def extractColours(url: str, num_colors: int = 1) -> list:
+    """Downloads image and finds its dominant colors, off the event loop. Results are cached by URL."""
+    cacheKey = f"{num_colors}:{url}"
+
+    colours = await colourCache.get(cacheKey)
+
+    if colours is not None:
+        return colours
+
+    async with httpClient.request("GET", url) as response:
+        if response.status != 200:
+            return [[0, 0, 0]]  # Fallback to black on error
+
+        content = await response.read()
+
+    loop = asyncio.get_running_loop()
+
+    if num_colors == 1:
+        colours = await loop.run_in_executor(None, meanColour, content)
+    else:
+        colours = await loop.run_in_executor(
+            getProcessPool(), clusterColours, content, num_colors
+        )
+
+    await colourCache.set(cacheKey, colours)
 
-    colours = kmeans.cluster_centers_.astype(int).tolist()
     return colours
 
 
@@ -78,17 +141,19 @@ async def fetchToFile(url: str, filename: str) -> discord.File | None:
     }
 
     try:
-        # Increased timeout and added the headers to the session
-        async with aiohttp.ClientSession(headers=headers) as session:
-            async with session.get(url, timeout=10) as response:
-                # Check status manually instead of raise_for_status()
-                if response.status != 200:
-                    print(f"Failed to fetch image: {response.status} for {url}")
-                    return None
+        async with httpClient.request(
+            "GET", url, headers=headers, timeout=10
+        ) as response:
+            # Check status manually instead of raise_for_status()
+            if response.status != 200:
+                print(f"Failed to fetch image: {response.status} for {url}")
+                return None
 
-                content = await response.read()
+            content = await response.read()
 
         # Process the image with Pillow
+        from PIL import Image
+
         img = Image.open(BytesIO(content))
         buffer = BytesIO()
         img.save(buffer, format=img.format if img.format else "PNG")
@@ -104,12 +169,13 @@ async def fetchToFile(url: str, filename: str) -> discord.File | None:
 async def urlIsImage(url: str) -> bool:
     """Performs a HEAD request to check if a URL points to an image."""
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.head(url, allow_redirects=True, timeout=5) as response:
-                if response.status != 200:
-                    return False
+        async with httpClient.request(
+            "HEAD", url, allow_redirects=True, timeout=5, retry=False
+        ) as response:
+            if response.status != 200:
+                return False
 
-                content_type = response.headers.get("Content-Type", "")
-                return content_type.startswith("image/")
+            content_type = response.headers.get("Content-Type", "")
+            return content_type.startswith("image/")
     except Exception:
         return False
@@ -19,10 +19,10 @@ class ImageEntry:
     keywords: list[str]
     createdBy: int
 
-    def writeToDB(self):
+    async def writeToDB(self):
         db = LocalDatabase()
 
-        db.setOne(
+        await db.aset(
             query="INSERT INTO `images` (`id`,`timestamp`,`album`,`link`,`description`,`keywords`,`createdBy`) VALUES (?,?,?,?,?,?,?)",
             params=(
                 self.id,
@@ -260,7 +260,7 @@ class DeleteConfirmView(discord.ui.View):
         self.stop()
         try:
             # Execute your existing delete function
-            deletedImageObj = deleteImage(self.image_id)
+            deletedImageObj = await deleteImage(self.image_id)
 
             newEmbed = EmbedReply(
                 "Images - Delete",
@@ -280,13 +280,13 @@ class DeleteConfirmView(discord.ui.View):
             await interaction.response.edit_message(embed=reply, view=None)
 
 
-def deleteImage(id: str) -> "ImageEntry":
+async def deleteImage(id: str) -> "ImageEntry":
     db = LocalDatabase()
 
     sql = "SELECT * FROM images WHERE id = ?"
     params = (id,)
 
-    results = db.get(sql, params=params)
+    results = await db.aget(sql, params=params)
 
     if not results:
         raise ValueError("No images found with that ID!")
@@ -295,7 +295,7 @@ def deleteImage(id: str) -> "ImageEntry":
 
     sql = "DELETE FROM images WHERE id = ?"
 
-    db.query(sql, params)
+    await db.aset(sql, params)
 
     return entryObj
 
@@ -312,7 +312,7 @@ def dbToObj(result) -> "ImageEntry":
     return obj
 
 
-def listAlbums(ctx: discord.AutocompleteContext) -> list[str]:
+async def listAlbums(ctx: discord.AutocompleteContext) -> list[str]:
     db = LocalDatabase()
 
     # It's more efficient to filter NULLs in SQL directly
@@ -325,7 +325,7 @@ def listAlbums(ctx: discord.AutocompleteContext) -> list[str]:
 
     sql += " ORDER BY album"
 
-    results = db.get(sql, params=params)
+    results = await db.aget(sql, params=params)
 
     # results will be a list of tuples, e.g., [("album1",), ("album2",)]
     # Use list comprehension to flatten and ensure no Nones slipped through
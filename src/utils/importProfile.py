@@ -0,0 +1,121 @@
+import asyncio
+import sys
+import time
+
+# Profiles imports the same way `python -X importtime` does, in a fresh interpreter so modules the
+# running bot has already loaded still get measured.
+
+# The bot's own import graph: src.bot plus every cog module, as bot.load_extension(recursive=True) loads them.
+BOT_IMPORT_SNIPPET = """
+import pkgutil
+import src.bot
+import src.cogs
+
+for module in pkgutil.walk_packages(src.cogs.__path__, "src.cogs."):
+    __import__(module.name)
+"""
+
+# Dependencies that are deferred until first use. Importing any of these at module level shows up as a slow restart.
+DEFERRED_MODULES = [
+    "numpy",
+    "PIL.Image",
+    "sklearn.cluster",
+    "google.genai",
+    "matplotlib",
+]
+
+PROFILE_TIMEOUT = 120
+
+
+class ImportTiming:
+    def __init__(self, module: str, selfTime: int, cumulativeTime: int, depth: int):
+        self.module = module
+        self.selfTime = selfTime  # Microseconds.
+        self.cumulativeTime = cumulativeTime  # Microseconds, including this module's own imports.
+        self.depth = depth
+
+
+def parseImportTime(output: str) -> list[ImportTiming]:
+    """Parses -X importtime output, e.g. `import time:       512 |       1834 |   numpy.core`."""
+    timings = []
+
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        try:
+            selfTime, cumulativeTime, name = line[len("import time:") :].split("|", 2)
+
+            selfTime = int(selfTime)
+            cumulativeTime = int(cumulativeTime)
+        except ValueError:
+            # The header row.
+            continue
+
+        # One space of padding, then two more per level of nesting.
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+
+        timings.append(
+            ImportTiming(name.strip(), selfTime, cumulativeTime, depth)
+        )
+
+    return timings
+
+
+async def profileImports(
+    code: str = BOT_IMPORT_SNIPPET,
+) -> tuple[list[ImportTiming], float]:
+    """
+    Runs code in a fresh interpreter with -X importtime.
+    Returns the import timings and the interpreter's total wall time in seconds.
+    """
+    started = time.perf_counter()
+
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-X",
+        "importtime",
+        "-c",
+        code,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+
+    try:
+        _, stderr = await asyncio.wait_for(
+            process.communicate(), timeout=PROFILE_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        process.kill()
+
+        raise Exception(f"Import profiling took longer than {PROFILE_TIMEOUT}s.")
+
+    elapsed = time.perf_counter() - started
+    output = stderr.decode(errors="replace")
+
+    if process.returncode != 0:
+        # The traceback follows the last import line.
+        lastLine = output.strip().splitlines()[-1] if output.strip() else ""
+
+        raise Exception(f"Import profiling failed: {lastLine}")
+
+    return parseImportTime(output), elapsed
+
+
+def topLevelImports(timings: list[ImportTiming]) -> list[ImportTiming]:
+    """Imports made directly by the profiled code, slowest first. Their cumulative times add up to the whole."""
+    return sorted(
+        (timing for timing in timings if timing.depth == 0),
+        key=lambda timing: timing.cumulativeTime,
+        reverse=True,
+    )
+
+
+def slowestImports(timings: list[ImportTiming], limit: int = 15) -> list[ImportTiming]:
+    """Individual modules by self time, slowest first."""
+    return sorted(timings, key=lambda timing: timing.selfTime, reverse=True)[:limit]
+
+
+def loadedDeferredModules() -> list[str]:
+    """Deferred modules the running bot has imported so far."""
+    return [module for module in DEFERRED_MODULES if module in sys.modules]
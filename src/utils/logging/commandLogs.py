@@ -1,7 +1,7 @@
 import discord
 import datetime
 
-from src.utils.logging import logClasses
+from src.utils.logging import logClasses, logBuffer
 from src.utils import dates
 
 from src.classes import *
@@ -75,9 +75,7 @@ def dbResultToLogEntry(
     return entryObj
 
 
-def insertLogEntry(entry: logClasses.CommandLogEntry):
-    database = LocalDatabase(database="logs")
-
+async def insertLogEntry(entry: logClasses.CommandLogEntry):
     sql = """
     INSERT INTO commands 
     (entryID, timestamp, qualifiedCommandName, invocationGuildID, invocationGuildName, invocationChannelID, invocationChannelName, invocationUserID, invocationOptions) 
@@ -96,4 +94,4 @@ def insertLogEntry(entry: logClasses.CommandLogEntry):
         entry.invocationOptions,
     )
 
-    database.setOne(sql, params)
+    await logBuffer.getLogBuffer("logs").add(sql, params)
@@ -0,0 +1,130 @@
+import asyncio
+import sqlite3
+
+from src.utils import db
+
+# Flush once this many rows are waiting, or this many seconds after the first one arrived.
+FLUSH_ROWS = 500
+FLUSH_INTERVAL = 2.0
+
+# Hard cap on rows held in memory. Writers past this point wait for a flush instead of growing the buffer.
+MAX_BUFFERED_ROWS = 5000
+
+
+def writeBatch(database: str, batch: dict[str, list[tuple]]) -> None:
+    """
+    Writes every buffered row in a single transaction with executemany. If the batch fails,
+    the rows are retried one at a time so that a single bad row doesn't lose the rest of them.
+    Runs on the database writer thread.
+    """
+    try:
+        with db.pooledCursor(database, commit=True) as cursor:
+            for sql, rows in batch.items():
+                cursor.executemany(sql, rows)
+
+        return
+    except sqlite3.Error as e:
+        print(f"Batched log write to {database} failed, retrying row by row: {e}")
+
+    for sql, rows in batch.items():
+        for row in rows:
+            try:
+                with db.pooledCursor(database, commit=True) as cursor:
+                    cursor.execute(sql, row)
+            except sqlite3.Error as e:
+                print(f"Dropped log row for {database}: {e}")
+
+
+class LogWriteBuffer:
+    """
+    Write-behind buffer for log inserts. Rows are grouped by their INSERT statement and flushed
+    together on the database writer thread when either the size or the time threshold is hit.
+    """
+
+    def __init__(
+        self,
+        database: str = "logs",
+        *,
+        flushRows: int = FLUSH_ROWS,
+        flushInterval: float = FLUSH_INTERVAL,
+        maxRows: int = MAX_BUFFERED_ROWS,
+    ):
+        self.database = f"{database}.db"
+        self.flushRows = flushRows
+        self.flushInterval = flushInterval
+        self.maxRows = maxRows
+
+        self.pending: dict[str, list[tuple]] = {}
+        self.pendingCount = 0
+
+        self.flushLock = asyncio.Lock()
+        self.timerTask: asyncio.Task | None = None
+        self.flushTasks: set[asyncio.Task] = set()
+
+    async def add(self, sql: str, params: tuple) -> None:
+        # Backpressure: hold the caller until there is room rather than buffering without bound.
+        while self.pendingCount >= self.maxRows:
+            await self.flush()
+
+        self.pending.setdefault(sql, []).append(params)
+        self.pendingCount += 1
+
+        if self.pendingCount >= self.flushRows:
+            task = asyncio.create_task(self.flush())
+
+            self.flushTasks.add(task)
+            task.add_done_callback(self.flushTasks.discard)
+        elif self.timerTask is None or self.timerTask.done():
+            self.timerTask = asyncio.create_task(self.flushAfterInterval())
+
+    async def flushAfterInterval(self) -> None:
+        await asyncio.sleep(self.flushInterval)
+
+        await self.flush()
+
+    async def flush(self) -> None:
+        async with self.flushLock:
+            if not self.pending:
+                return
+
+            batch = self.pending
+
+            self.pending = {}
+            self.pendingCount = 0
+
+            loop = asyncio.get_running_loop()
+
+            await loop.run_in_executor(
+                db.writerExecutor(), writeBatch, self.database, batch
+            )
+
+    async def close(self) -> None:
+        """Cancels the flush timer and writes out anything still buffered."""
+        if self.timerTask and not self.timerTask.done():
+            self.timerTask.cancel()
+
+        if self.flushTasks:
+            await asyncio.gather(*self.flushTasks, return_exceptions=True)
+
+        await self.flush()
+
+
+buffers: dict[str, LogWriteBuffer] = {}
+
+
+def getLogBuffer(database: str = "logs") -> LogWriteBuffer:
+    if database not in buffers:
+        if not db.databaseExists(f"{database}.db"):
+            raise ValueError(
+                f"src>utils>logging>logBuffer: Database not in list of available databases. Tried to access '{database}.db'."
+            )
+
+        buffers[database] = LogWriteBuffer(database)
+
+    return buffers[database]
+
+
+async def flushAll() -> None:
+    """Shutdown hook. Guarantees every buffered log row reaches disk."""
+    for buffer in buffers.values():
+        await buffer.close()
@@ -4,6 +4,7 @@ import pickle
 
 from src.utils import text
 from src.utils import dates
+from src.utils.logging import logBuffer
 
 from src.classes import LocalDatabase, EmbedReply
 
@@ -168,9 +169,7 @@ class MessageLogEntry(LogEntry):
 
         return serialized
 
-    def writeToDB(self, db: str = "logs", table: str = "messages") -> None:
-        database = LocalDatabase(database=db)
-
+    async def writeToDB(self, db: str = "logs", table: str = "messages") -> None:
         sql = f"""
         INSERT INTO {table} (`entryID`, `discordMessageID` , `timestamp`, `messageTypes`, `guildID`, `guildName`, `channelID`, `channelName`, `userID`, `userName`, `userNickname`, `content`, `systemContent`, `attachments`, `isBot`, `wordCount`)
         VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
@@ -195,7 +194,7 @@ class MessageLogEntry(LogEntry):
             self.wordCount,
         )
 
-        database.setOne(sql, params)
+        await logBuffer.getLogBuffer(db).add(sql, params)
 
     def toEmbed(self) -> MessageLogEmbedReply:
         reply = MessageLogEmbedReply(entry=self)
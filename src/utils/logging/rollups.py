@@ -0,0 +1,148 @@
+from src.utils import db
+
+# Per-day aggregates of the raw log tables. SQLite triggers keep them up to date in the same
+# transaction as the log insert, so the stats commands can read them instead of scanning history.
+# DMs have no guild, so they're stored with a guildID of 0.
+
+COMMAND_ROLLUP_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS commandRollups (
+        day TEXT NOT NULL,
+        guildID INTEGER NOT NULL,
+        channelID INTEGER NOT NULL,
+        userID INTEGER NOT NULL,
+        qualifiedCommandName TEXT NOT NULL,
+        uses INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, guildID, channelID, userID, qualifiedCommandName)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_commandRollups_userID ON commandRollups (userID)",
+    "CREATE INDEX IF NOT EXISTS idx_commandRollups_qualifiedCommandName ON commandRollups (qualifiedCommandName)",
+    """
+    CREATE TRIGGER IF NOT EXISTS commandRollupsOnInsert AFTER INSERT ON commands
+    BEGIN
+        INSERT INTO commandRollups (day, guildID, channelID, userID, qualifiedCommandName, uses)
+        VALUES (
+            substr(NEW.timestamp, 1, 10),
+            IFNULL(NEW.invocationGuildID, 0),
+            IFNULL(NEW.invocationChannelID, 0),
+            NEW.invocationUserID,
+            NEW.qualifiedCommandName,
+            1
+        )
+        ON CONFLICT (day, guildID, channelID, userID, qualifiedCommandName)
+        DO UPDATE SET uses = uses + 1;
+    END
+    """,
+]
+
+COMMAND_ROLLUP_BACKFILL = """
+    INSERT INTO commandRollups (day, guildID, channelID, userID, qualifiedCommandName, uses)
+    SELECT
+        substr(timestamp, 1, 10),
+        IFNULL(invocationGuildID, 0),
+        IFNULL(invocationChannelID, 0),
+        invocationUserID,
+        qualifiedCommandName,
+        COUNT(*)
+    FROM commands
+    GROUP BY 1, 2, 3, 4, 5
+"""
+
+MESSAGE_ROLLUP_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS messageRollups (
+        day TEXT NOT NULL,
+        guildID INTEGER NOT NULL,
+        channelID INTEGER NOT NULL,
+        userID INTEGER NOT NULL,
+        messageTypes TEXT NOT NULL,
+        messages INTEGER NOT NULL DEFAULT 0,
+        words INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, guildID, channelID, userID, messageTypes)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_messageRollups_userID ON messageRollups (userID)",
+    "CREATE INDEX IF NOT EXISTS idx_messageRollups_channelID ON messageRollups (channelID)",
+    """
+    CREATE TRIGGER IF NOT EXISTS messageRollupsOnInsert AFTER INSERT ON messages
+    BEGIN
+        INSERT INTO messageRollups (day, guildID, channelID, userID, messageTypes, messages, words)
+        VALUES (
+            substr(NEW.timestamp, 1, 10),
+            IFNULL(NEW.guildID, 0),
+            IFNULL(NEW.channelID, 0),
+            NEW.userID,
+            IFNULL(NEW.messageTypes, ''),
+            1,
+            IFNULL(NEW.wordCount, 0)
+        )
+        ON CONFLICT (day, guildID, channelID, userID, messageTypes)
+        DO UPDATE SET messages = messages + 1, words = words + excluded.words;
+    END
+    """,
+]
+
+MESSAGE_ROLLUP_BACKFILL = """
+    INSERT INTO messageRollups (day, guildID, channelID, userID, messageTypes, messages, words)
+    SELECT
+        substr(timestamp, 1, 10),
+        IFNULL(guildID, 0),
+        IFNULL(channelID, 0),
+        userID,
+        IFNULL(messageTypes, ''),
+        COUNT(*),
+        IFNULL(SUM(wordCount), 0)
+    FROM messages
+    GROUP BY 1, 2, 3, 4, 5
+"""
+
+ROLLUPS = {
+    "commandRollups": (COMMAND_ROLLUP_SCHEMA, COMMAND_ROLLUP_BACKFILL),
+    "messageRollups": (MESSAGE_ROLLUP_SCHEMA, MESSAGE_ROLLUP_BACKFILL),
+}
+
+
+def ensureRollup(table: str, database: str = "logs") -> None:
+    """
+    Creates a rollup table, its indexes and its insert trigger if they don't exist yet. A newly
+    created rollup is backfilled from the existing log rows in the same transaction as its trigger,
+    so no row is counted twice or missed.
+    """
+    schema, backfill = ROLLUPS[table]
+
+    with db.pooledCursor(f"{database}.db", commit=True) as cursor:
+        # sqlite3 doesn't open a transaction for DDL by itself, so a failed backfill would leave an empty rollup behind.
+        cursor.execute("BEGIN")
+
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        )
+
+        exists = cursor.fetchone() is not None
+
+        for statement in schema:
+            cursor.execute(statement)
+
+        if not exists:
+            cursor.execute(backfill)
+
+
+def rebuildRollup(table: str, database: str = "logs") -> int:
+    """
+    Rebuilds a rollup table from scratch out of its raw log table, in a single transaction.
+    Run it on the database writer thread so buffered log writes can't interleave with it.
+    Returns the number of rollup rows written.
+    """
+    schema, backfill = ROLLUPS[table]
+
+    with db.pooledCursor(f"{database}.db", commit=True) as cursor:
+        for statement in schema:
+            cursor.execute(statement)
+
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(backfill)
+
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+
+        return cursor.fetchone()[0]
@@ -1,5 +1,4 @@
 import discord
-import aiohttp
 import datetime
 import xmltodict
 import io
@@ -8,6 +7,7 @@ import os
 from src.utils import dates
 from src.utils import text
 from src.utils import images
+from src.utils import httpClient
 from src import constants
 
 # Keep existing data classes
@@ -234,43 +234,44 @@ async def fetchShowtimes(
     if not startDate:
         startDate = datetime.datetime.now()
 
-    async with aiohttp.ClientSession() as session:
-        if chain == "Landmark":
-            url = "https://www.landmarkcinemas.com/Umbraco/Api/MovieApi/MoviesByCinema"
+    if chain == "Landmark":
+        url = "https://www.landmarkcinemas.com/Umbraco/Api/MovieApi/MoviesByCinema"
 
-            params = {
-                "cinemaId": location,
-                "splitByAttributes": "true",
-                "expandSessions": "true",
-            }
+        params = {
+            "cinemaId": location,
+            "splitByAttributes": "true",
+            "expandSessions": "true",
+        }
 
-            async with session.get(
-                url=url, params=params, headers=LANDMARK_HEADERS
-            ) as response:
-                response.raise_for_status()
-                parsedResponse = await response.json()
-                return parsedResponse
+        async with httpClient.request(
+            "GET", url, params=params, headers=LANDMARK_HEADERS
+        ) as response:
+            response.raise_for_status()
+            parsedResponse = await response.json()
+            return parsedResponse
 
-        elif chain == "Cineplex":
-            url = f"https://apis.cineplex.com/prod/cpx/theatrical/api/v1/showtimes"
+    elif chain == "Cineplex":
+        url = f"https://apis.cineplex.com/prod/cpx/theatrical/api/v1/showtimes"
 
-            parsedStartDate = dates.formatSimpleDate(
-                timestamp=startDate, formatString="%-m/%-d/%Y"
-            )
+        parsedStartDate = dates.formatSimpleDate(
+            timestamp=startDate, formatString="%-m/%-d/%Y"
+        )
 
-            params = {"language": "en", "locationId": location, "date": parsedStartDate}
+        params = {"language": "en", "locationId": location, "date": parsedStartDate}
 
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36",
-                "ocp-apim-subscription-key": CINEPLEX_API_KEY,
-            }
+        headers = {
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36",
+            "ocp-apim-subscription-key": CINEPLEX_API_KEY,
+        }
 
-            async with session.get(url=url, params=params, headers=headers) as response:
-                response.raise_for_status()
-                parsedResponse = await response.json()
-                return parsedResponse
-        else:
-            raise Exception("Invalid chain passed to fetchShowtimes")
+        async with httpClient.request(
+            "GET", url, params=params, headers=headers
+        ) as response:
+            response.raise_for_status()
+            parsedResponse = await response.json()
+            return parsedResponse
+    else:
+        raise Exception("Invalid chain passed to fetchShowtimes")
 
 
 async def fetchTrailersForAll(films: list[Film]) -> None:
@@ -282,12 +283,11 @@ async def fetchTrailersForAll(films: list[Film]) -> None:
         "filterBy": "recent",
     }
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(
-            url=url, params=params, headers=LANDMARK_HEADERS
-        ) as response:
-            response.raise_for_status()
-            text_data = await response.text()
+    async with httpClient.request(
+        "GET", url, params=params, headers=LANDMARK_HEADERS
+    ) as response:
+        response.raise_for_status()
+        text_data = await response.text()
 
     parsed = xmltodict.parse(text_data)
 
@@ -1,12 +1,14 @@
 import discord
+import json
 import os
+import struct
+import time
 from datetime import datetime
 import pickle
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
 
 from src.utils import dates
 from src.utils import images
+from src.utils import spotify
 from src.utils import text
 
 from src.cogs.commands.albumratings import AlbumRatings
@@ -15,9 +17,6 @@ from src.classes import *
 
 from src import constants
 
-SPOTIFY_CLIENT_ID = os.getenv("SPOTIFY_CLIENT_ID")
-SPOTIFY_CLIENT_SECRET = os.getenv("SPOTIFY_CLIENT_SECRET")
-
 # Timeouts in mins.
 TIMEOUT_TO_PICK_ALBUM = 1 * (60)
 TIMEOUT_FOR_RATING_SELECT = 120 * (
@@ -35,9 +34,20 @@ FAVOURITE_INDEX_OPTIONS = sorted(
 
 COMMENT_LENGTH_CHARACTER_LIMIT = 1000
 COMMENT_LENGTH_CHARACTER_LIMIT_IN_EMBED = 200
+# Room for the tracklist in an album embed. Discord caps a description at 4096 characters and every
+# embed in a message at 6000 combined, which the album's fields and the song embed beside it share.
+ALBUM_EMBED_TRACKLIST_LIMIT = 3500
 
 FAST_NAV_SKIP_AMOUNT = 3
 
+# Compact rating format stored in albumRatings.serializedRating. Layout:
+#   MAGIC | version (uint8) | header length (uint32) | header JSON | body JSON
+# The header holds everything but the tracks, so it can be decoded on its own. The body is
+# [artist table, tracks], with each track pointing at its artists by index into the table.
+SERIALIZED_RATING_MAGIC = b"BBR"
+SERIALIZED_RATING_VERSION = 1
+SERIALIZED_RATING_PREFIX = struct.Struct("<BI")
+
 
 class Artist:
     def __init__(self, spotifyID: str, name: str, link: str):
@@ -45,6 +55,13 @@ class Artist:
         self.name = name
         self.link = link
 
+    def toTuple(self) -> tuple:
+        return (self.spotifyID, self.name, self.link)
+
+    @classmethod
+    def fromTuple(cls, data) -> "Artist":
+        return cls(*data)
+
 
 class EditRatingButton(discord.ui.Button):
     def __init__(self, **kwargs):
@@ -73,7 +90,7 @@ class EditRatingButton(discord.ui.Button):
             return
 
         db = LocalDatabase()
-        result = db.get("SELECT * FROM albumRatings WHERE ratingID = ?", (ratingID,))
+        result = await db.aget("SELECT * FROM albumRatings WHERE ratingID = ?", (ratingID,))
 
         if not result:
             reply = EmbedReply(
@@ -151,7 +168,7 @@ class DeleteRatingButton(discord.ui.Button):
             return
 
         database = LocalDatabase()
-        result = database.get(
+        result = await database.aget(
             "SELECT * FROM albumRatings WHERE ratingID = ?", (ratingID,)
         )
 
@@ -224,7 +241,7 @@ class DeleteRatingButton(discord.ui.Button):
 
             await interaction.message.delete()
 
-            database.setOne("DELETE FROM albumRatings WHERE ratingID = ?", (ratingID,))
+            await database.aset("DELETE FROM albumRatings WHERE ratingID = ?", (ratingID,))
 
             reply = EmbedReply(
                 "Album Ratings - Deleted",
@@ -682,6 +699,51 @@ class Track:
         self.comments = comments
         self.album = album
 
+    def toTuple(self, artistIndexes: dict[str, int]) -> tuple:
+        return (
+            self.spotifyID,
+            self.name,
+            int(bool(self.explicit)),
+            self.link,
+            self.trackNumber,
+            self.discNumber,
+            self.durationMS,
+            self.rating,
+            getattr(self, "favouriteIndex", None),
+            getattr(self, "comments", None),
+            [artistIndexes[artist.spotifyID] for artist in self.artists],
+        )
+
+    @classmethod
+    def fromTuple(cls, data, artistTable: list[Artist]) -> "Track":
+        (
+            spotifyID,
+            name,
+            explicit,
+            link,
+            trackNumber,
+            discNumber,
+            durationMS,
+            rating,
+            favouriteIndex,
+            comments,
+            artists,
+        ) = data
+
+        return cls(
+            spotifyID,
+            name,
+            [artistTable[index] for index in artists],
+            bool(explicit),
+            link,
+            trackNumber,
+            discNumber,
+            durationMS,
+            rating,
+            favouriteIndex,
+            comments,
+        )
+
     def getDuration(self, formatted: bool = False) -> int | str:
         if formatted:
             convertedToSeconds = round(self.durationMS / 1000)
@@ -1052,8 +1114,7 @@ class Album:
 
         lastRelatedMessage = lastRelatedMessage.id
 
-        self.createdBy = self.createdBy.id
-        serializedRating = pickle.dumps(self)
+        serializedRating = self.serialize()
 
         tupRtg = (
             ratingID,
@@ -1071,6 +1132,51 @@ class Album:
 
         return SmallRating(tupRtg)
 
+    def serialize(self) -> bytes:
+        """Encodes the rating into the compact serializedRating format (see SERIALIZED_RATING_MAGIC)."""
+        colour = self.coverImageColour
+
+        header = (
+            self.ratingID,
+            getattr(self.createdBy, "id", self.createdBy),
+            isoformatOrNone(self.createdAt),
+            isoformatOrNone(self.editedAt),
+            self.spotifyID,
+            self.name,
+            self.link,
+            isoformatOrNone(self.releaseDate),
+            self.ratingOutOf,
+            self.coverImage,
+            self.customCoverImage,
+            colour.value if isinstance(colour, discord.Colour) else colour,
+            self.comments,
+            [artist.toTuple() for artist in self.artists],
+        )
+
+        artistTable: list[Artist] = []
+        artistIndexes: dict[str, int] = {}
+
+        for track in self.tracks:
+            for artist in track.artists:
+                if artist.spotifyID not in artistIndexes:
+                    artistIndexes[artist.spotifyID] = len(artistTable)
+                    artistTable.append(artist)
+
+        body = (
+            [artist.toTuple() for artist in artistTable],
+            [track.toTuple(artistIndexes) for track in self.tracks],
+        )
+
+        headerBytes = json.dumps(header, separators=(",", ":")).encode()
+        bodyBytes = json.dumps(body, separators=(",", ":")).encode()
+
+        return (
+            SERIALIZED_RATING_MAGIC
+            + SERIALIZED_RATING_PREFIX.pack(SERIALIZED_RATING_VERSION, len(headerBytes))
+            + headerBytes
+            + bodyBytes
+        )
+
     def addTrack(self, track: Track):
         track.album = self
 
@@ -1171,7 +1277,17 @@ class CustomAlbumCoverButton(discord.ui.Button):
 
 
 class AlbumRatingEmbedReply(EmbedReply):
-    def __init__(self, album: Album | list[Album]):
+    def __init__(
+        self,
+        album: Album | list[Album],
+        *,
+        averages: tuple[float | None, dict[str, float]] | None = None,
+    ):
+        """
+        Pass a list of Albums to show the average of several ratings of the same album.
+        averages can carry the album and per-track means already worked out in SQL
+        (see musicDB.fetchAlbumAverages); otherwise they're calculated from the Albums.
+        """
         isAveraged = isinstance(album, list)
 
         targetAlbumDetails: Album = album[0] if isAveraged else album
@@ -1198,6 +1314,8 @@ class AlbumRatingEmbedReply(EmbedReply):
 
         allDiscs: list[int] = targetAlbumDetails.getAllDiscNumbers()
 
+        trackLines: list[str] = []
+
         for track in targetAlbumDetails.tracks:
             if isAveraged:
                 formattedDetailsBelowTrack = ""
@@ -1237,12 +1355,19 @@ class AlbumRatingEmbedReply(EmbedReply):
 
                     seenDiscs.add(track.discNumber)
 
-                if not ratings:
+                if averages:
+                    songAverage = averages[1].get(track.spotifyID)
+                else:
+                    songAverage = sum(ratings) / len(ratings) if ratings else None
+
+                if songAverage is None:
                     averageSongRatingAcrossAll = "All Ratings Excluded/Unfinished"
                 else:
-                    averageSongRatingAcrossAll = f"{text.smartRound(sum(ratings) / len(ratings))}/{targetAlbumDetails.ratingOutOf}"
+                    averageSongRatingAcrossAll = f"{text.smartRound(songAverage)}/{targetAlbumDetails.ratingOutOf}"
 
-                self.description += f"{discString}**{track.trackNumber}.** {track.name} · `{averageSongRatingAcrossAll}`{formattedDetailsBelowTrack}\n"
+                trackLines.append(
+                    f"{discString}**{track.trackNumber}.** {track.name} · `{averageSongRatingAcrossAll}`{formattedDetailsBelowTrack}"
+                )
             else:
                 favouriteIndex = track.getFavouriteIndex()
 
@@ -1267,7 +1392,14 @@ class AlbumRatingEmbedReply(EmbedReply):
 
                     seenDiscs.add(track.discNumber)
 
-                self.description += f"{discString}**{track.trackNumber}.**{medal}{track.name} · `{track.getRating(True)}`{formattedComments}\n"
+                trackLines.append(
+                    f"{discString}**{track.trackNumber}.**{medal}{track.name} · `{track.getRating(True)}`{formattedComments}"
+                )
+
+        # Box sets can have hundreds of tracks, so the list is cut off with a count of the rest.
+        self.description = "\n".join(
+            text.truncateList(trackLines, ALBUM_EMBED_TRACKLIST_LIMIT)
+        )
 
         if isAveraged:
             formattedRatedBy = ""
@@ -1293,10 +1425,15 @@ class AlbumRatingEmbedReply(EmbedReply):
                 formattedRatedOn += f"{dates.formatSimpleDate(rating.createdAt, discordDateFormat="f")} ({rating.createdBy.mention})\n"
                 formattedComments += f'\n"{rating.parseComments(True, 350)}" - {rating.createdBy.mention}\n\u00a0'
 
-            if not ratings:
+            if averages:
+                albumAverage = averages[0]
+            else:
+                albumAverage = sum(ratings) / len(ratings) if ratings else None
+
+            if albumAverage is None:
                 averageAlbumRatingOfAll = "All Ratings Unfinished"
             else:
-                averageAlbumRatingOfAll = f"{text.smartRound(sum(ratings) / len(ratings))}/{targetAlbumDetails.ratingOutOf}"
+                averageAlbumRatingOfAll = f"{text.smartRound(albumAverage)}/{targetAlbumDetails.ratingOutOf}"
 
             self.add_field(
                 name="***Average Album Rating of All***",
@@ -1501,32 +1638,20 @@ class ChooseAlbumView(discord.ui.View):
             pass  # message already deleted/edited elsewhere
 
 
-def searchForAlbumName(query: str, limit=5, type="album") -> list:
+async def searchForAlbumName(query: str, limit=5, type="album") -> dict:
     if not query:
         raise ValueError("utils > music.py > albumQuery: Album query is blank!")
 
-    spotifyClient = spotipy.Spotify(
-        auth_manager=SpotifyClientCredentials(
-            client_id=SPOTIFY_CLIENT_ID, client_secret=SPOTIFY_CLIENT_SECRET
-        )
-    )
-
-    albumResults = spotifyClient.search(q=query, limit=limit, type=type)
+    albumResults = await spotify.search(query, limit=limit, type=type)
 
     return albumResults
 
 
-def fetchAlbumDetailsByID(albumID: str) -> dict:
+async def fetchAlbumDetailsByID(albumID: str) -> dict:
     if not albumID:
         raise ValueError("utils > music.py > albumDetails: Album ID is blank!")
 
-    spotifyClient = spotipy.Spotify(
-        auth_manager=SpotifyClientCredentials(
-            client_id=SPOTIFY_CLIENT_ID, client_secret=SPOTIFY_CLIENT_SECRET
-        )
-    )
-
-    albumResults = spotifyClient.album(album_id=albumID)
+    albumResults = await spotify.album(albumID)
 
     return albumResults
 
@@ -1534,7 +1659,7 @@ def fetchAlbumDetailsByID(albumID: str) -> dict:
 async def parseAlbumDetails(
     data: dict,
     createdBy: discord.Member,
-    trackLimit: int,
+    trackLimit: int | None = None,
     *,
     createdAt: datetime = None,
     comments: str = None,
@@ -1592,8 +1717,129 @@ async def parseAlbumDetails(
     return album
 
 
+def isoformatOrNone(timestamp: datetime | None) -> str | None:
+    return timestamp.isoformat() if timestamp else None
+
+
+def fromIsoformatOrNone(timestamp: str | None) -> datetime | None:
+    return datetime.fromisoformat(timestamp) if timestamp else None
+
+
+def deserializeAlbum(serializedRating: bytes, *, includeTracks: bool = True) -> Album:
+    """
+    Decodes the compact serializedRating format. With includeTracks=False only the header is
+    parsed, which is enough for listings and skips the track list entirely.
+    createdBy is left as the user ID.
+    """
+    magicLength = len(SERIALIZED_RATING_MAGIC)
+
+    if serializedRating[:magicLength] != SERIALIZED_RATING_MAGIC:
+        raise ValueError("deserializealbum: Not a serialized album rating.")
+
+    version, headerLength = SERIALIZED_RATING_PREFIX.unpack_from(
+        serializedRating, magicLength
+    )
+
+    if version != SERIALIZED_RATING_VERSION:
+        raise ValueError(
+            f"deserializealbum: Unsupported serialized rating version {version}."
+        )
+
+    headerStart = magicLength + SERIALIZED_RATING_PREFIX.size
+    headerEnd = headerStart + headerLength
+
+    (
+        ratingID,
+        createdBy,
+        createdAt,
+        editedAt,
+        spotifyID,
+        name,
+        link,
+        releaseDate,
+        ratingOutOf,
+        coverImage,
+        customCoverImage,
+        coverImageColour,
+        comments,
+        artists,
+    ) = json.loads(serializedRating[headerStart:headerEnd])
+
+    album = Album(
+        spotifyID,
+        name,
+        [Artist.fromTuple(artist) for artist in artists],
+        link,
+        fromIsoformatOrNone(releaseDate),
+        createdBy,
+        fromIsoformatOrNone(createdAt),
+        fromIsoformatOrNone(editedAt),
+        ratingOutOf=ratingOutOf,
+        coverImage=coverImage,
+        customCoverImage=customCoverImage,
+        coverImageColour=(
+            discord.Colour(coverImageColour) if coverImageColour is not None else None
+        ),
+        comments=comments,
+    )
+    album.ratingID = ratingID
+
+    if includeTracks:
+        artistTable, tracks = json.loads(serializedRating[headerEnd:])
+
+        artistTable = [Artist.fromTuple(artist) for artist in artistTable]
+
+        for track in tracks:
+            album.addTrack(Track.fromTuple(track, artistTable))
+
+    return album
+
+
+def loadSerializedRating(serializedRating: bytes) -> Album:
+    """Decodes a serializedRating blob in either the compact format or the legacy pickle format."""
+    if serializedRating[: len(SERIALIZED_RATING_MAGIC)] == SERIALIZED_RATING_MAGIC:
+        return deserializeAlbum(serializedRating)
+
+    return pickle.loads(serializedRating)
+
+
+def benchmarkSerialization(albums: list[Album], rounds: int = 50) -> dict[str, float]:
+    """
+    Times the compact format against pickling the whole Album, over the given albums.
+    Returns the mean time per album in microseconds for each operation, plus the mean size in bytes.
+    """
+
+    def timed(operation, items) -> float:
+        start = time.perf_counter()
+
+        for _ in range(rounds):
+            for item in items:
+                operation(item)
+
+        return (time.perf_counter() - start) / (rounds * len(items)) * 1_000_000
+
+    # Pickling needs createdBy as a plain ID, the same as packAlbumRating used to do.
+    for album in albums:
+        album.createdBy = getattr(album.createdBy, "id", album.createdBy)
+
+    pickled = [pickle.dumps(album) for album in albums]
+    compact = [album.serialize() for album in albums]
+
+    return {
+        "pickleDumps": timed(pickle.dumps, albums),
+        "pickleLoads": timed(pickle.loads, pickled),
+        "pickleSize": sum(len(blob) for blob in pickled) / len(pickled),
+        "compactDumps": timed(Album.serialize, albums),
+        "compactLoads": timed(deserializeAlbum, compact),
+        "compactHeaderLoads": timed(
+            lambda blob: deserializeAlbum(blob, includeTracks=False), compact
+        ),
+        "compactSize": sum(len(blob) for blob in compact) / len(compact),
+    }
+
+
 def unpackAlbumRating(bot: discord.Bot, packedAlbumRating: bytes) -> Album:
-    unserializedAlbumRating: Album = pickle.loads(packedAlbumRating)
+    unserializedAlbumRating: Album = loadSerializedRating(packedAlbumRating)
 
     unserializedAlbumRating.createdBy = bot.get_user(unserializedAlbumRating.createdBy)
 
@@ -0,0 +1,600 @@
+import asyncio
+import discord
+
+from src.utils import db
+from src.utils import dates
+from src.utils import music
+
+DATABASE = "db.db"
+
+# Album ratings used to live only as a pickled Album in albumRatings.serializedRating. These tables hold
+# the same data in queryable form. albumRatings stays the header row for each rating, and
+# rating_details/track_ratings hang off its ratingID.
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS artists (
+        spotifyArtistID TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        link TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS albums (
+        spotifyAlbumID TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        link TEXT,
+        releaseDate TEXT,
+        coverImage TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS album_artists (
+        spotifyAlbumID TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        spotifyArtistID TEXT NOT NULL,
+        PRIMARY KEY (spotifyAlbumID, position)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS tracks (
+        spotifyTrackID TEXT PRIMARY KEY,
+        spotifyAlbumID TEXT NOT NULL,
+        name TEXT NOT NULL,
+        explicit INTEGER NOT NULL DEFAULT 0,
+        link TEXT,
+        trackNumber INTEGER,
+        discNumber INTEGER,
+        durationMS INTEGER
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS track_artists (
+        spotifyTrackID TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        spotifyArtistID TEXT NOT NULL,
+        PRIMARY KEY (spotifyTrackID, position)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS rating_details (
+        ratingID TEXT PRIMARY KEY,
+        ratingOutOf REAL,
+        customCoverImage TEXT,
+        coverImageColour INTEGER,
+        comments TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS track_ratings (
+        ratingID TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        spotifyTrackID TEXT NOT NULL,
+        rating REAL,
+        favouriteIndex INTEGER,
+        comments TEXT,
+        PRIMARY KEY (ratingID, position)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_album_artists_artist ON album_artists (spotifyArtistID)",
+    "CREATE INDEX IF NOT EXISTS idx_tracks_album ON tracks (spotifyAlbumID)",
+    "CREATE INDEX IF NOT EXISTS idx_track_artists_artist ON track_artists (spotifyArtistID)",
+    "CREATE INDEX IF NOT EXISTS idx_track_ratings_track ON track_ratings (spotifyTrackID)",
+    "CREATE INDEX IF NOT EXISTS idx_albumRatings_ratingID ON albumRatings (ratingID)",
+    "CREATE INDEX IF NOT EXISTS idx_albumRatings_createdBy ON albumRatings (createdBy)",
+    """
+    CREATE TRIGGER IF NOT EXISTS albumRatingsOnDelete AFTER DELETE ON albumRatings
+    BEGIN
+        DELETE FROM track_ratings WHERE ratingID = OLD.ratingID;
+        DELETE FROM rating_details WHERE ratingID = OLD.ratingID;
+    END
+    """,
+]
+
+# formattedRating ("7.5/10", or "Unfinished") split into numbers so ratings can be sorted and averaged
+# in SQL. Triggers keep them in step with formattedRating, whichever statement writes it.
+SCORE_COLUMNS = {"score": "REAL", "outOf": "REAL"}
+
+SCORE_FROM_FORMATTED = """
+    score = CASE WHEN instr(formattedRating, '/') > 0
+        THEN CAST(substr(formattedRating, 1, instr(formattedRating, '/') - 1) AS REAL) END,
+    outOf = CASE WHEN instr(formattedRating, '/') > 0
+        THEN CAST(substr(formattedRating, instr(formattedRating, '/') + 1) AS REAL) END
+"""
+
+SCORE_SCHEMA = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS albumRatingsScoreOnInsert AFTER INSERT ON albumRatings
+    BEGIN
+        UPDATE albumRatings SET {SCORE_FROM_FORMATTED} WHERE ratingID = NEW.ratingID;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS albumRatingsScoreOnUpdate AFTER UPDATE OF formattedRating ON albumRatings
+    BEGIN
+        UPDATE albumRatings SET {SCORE_FROM_FORMATTED} WHERE ratingID = NEW.ratingID;
+    END
+    """,
+    # Normalised rating index for /albumrating list top. Queries have to use the same score / outOf expression.
+    "CREATE INDEX IF NOT EXISTS idx_albumRatings_normalisedScore ON albumRatings (createdBy, score / outOf)",
+    "CREATE INDEX IF NOT EXISTS idx_albumRatings_spotifyAlbumID ON albumRatings (spotifyAlbumID, score)",
+]
+
+
+def ensureScoreColumns(cursor) -> None:
+    cursor.execute("PRAGMA table_info(albumRatings)")
+
+    existing = {column[1] for column in cursor.fetchall()}
+    missing = [column for column in SCORE_COLUMNS if column not in existing]
+
+    for column in missing:
+        cursor.execute(
+            f"ALTER TABLE albumRatings ADD COLUMN {column} {SCORE_COLUMNS[column]}"
+        )
+
+    if missing:
+        cursor.execute(f"UPDATE albumRatings SET {SCORE_FROM_FORMATTED}")
+
+    for statement in SCORE_SCHEMA:
+        cursor.execute(statement)
+
+
+def ensureSchema() -> None:
+    with db.pooledCursor(DATABASE, commit=True) as cursor:
+        for statement in SCHEMA:
+            cursor.execute(statement)
+
+        ensureScoreColumns(cursor)
+
+
+def artistRows(artists: "list[music.Artist]") -> list[tuple]:
+    return [(artist.spotifyID, artist.name, artist.link) for artist in artists]
+
+
+def writeNormalisedRating(cursor, album: "music.Album") -> None:
+    """Writes the album, its tracks and every per-track rating of one Album into the normalised tables."""
+    artists = list(album.artists)
+
+    for track in album.tracks:
+        artists.extend(track.artists)
+
+    cursor.executemany(
+        """
+        INSERT INTO artists (spotifyArtistID, name, link) VALUES (?, ?, ?)
+        ON CONFLICT (spotifyArtistID) DO UPDATE SET name = excluded.name, link = excluded.link
+        """,
+        artistRows(artists),
+    )
+
+    cursor.execute(
+        """
+        INSERT INTO albums (spotifyAlbumID, name, link, releaseDate, coverImage) VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (spotifyAlbumID) DO UPDATE SET
+            name = excluded.name, link = excluded.link, releaseDate = excluded.releaseDate, coverImage = excluded.coverImage
+        """,
+        (
+            album.spotifyID,
+            album.name,
+            album.link,
+            (
+                dates.formatSimpleDate(album.releaseDate, databaseDate=True)
+                if album.releaseDate
+                else None
+            ),
+            album.coverImage,
+        ),
+    )
+
+    cursor.execute(
+        "DELETE FROM album_artists WHERE spotifyAlbumID = ?", (album.spotifyID,)
+    )
+    cursor.executemany(
+        "INSERT INTO album_artists (spotifyAlbumID, position, spotifyArtistID) VALUES (?, ?, ?)",
+        [
+            (album.spotifyID, position, artist.spotifyID)
+            for position, artist in enumerate(album.artists)
+        ],
+    )
+
+    cursor.executemany(
+        """
+        INSERT INTO tracks (spotifyTrackID, spotifyAlbumID, name, explicit, link, trackNumber, discNumber, durationMS)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (spotifyTrackID) DO UPDATE SET
+            name = excluded.name, explicit = excluded.explicit, link = excluded.link,
+            trackNumber = excluded.trackNumber, discNumber = excluded.discNumber, durationMS = excluded.durationMS
+        """,
+        [
+            (
+                track.spotifyID,
+                album.spotifyID,
+                track.name,
+                int(bool(track.explicit)),
+                track.link,
+                track.trackNumber,
+                track.discNumber,
+                track.durationMS,
+            )
+            for track in album.tracks
+        ],
+    )
+
+    trackIDs = [(track.spotifyID,) for track in album.tracks]
+
+    cursor.executemany("DELETE FROM track_artists WHERE spotifyTrackID = ?", trackIDs)
+    cursor.executemany(
+        "INSERT INTO track_artists (spotifyTrackID, position, spotifyArtistID) VALUES (?, ?, ?)",
+        [
+            (track.spotifyID, position, artist.spotifyID)
+            for track in album.tracks
+            for position, artist in enumerate(track.artists)
+        ],
+    )
+
+    colour = getattr(album, "coverImageColour", None)
+
+    cursor.execute(
+        """
+        INSERT INTO rating_details (ratingID, ratingOutOf, customCoverImage, coverImageColour, comments)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (ratingID) DO UPDATE SET
+            ratingOutOf = excluded.ratingOutOf, customCoverImage = excluded.customCoverImage,
+            coverImageColour = excluded.coverImageColour, comments = excluded.comments
+        """,
+        (
+            album.ratingID,
+            album.ratingOutOf,
+            getattr(album, "customCoverImage", None),
+            colour.value if isinstance(colour, discord.Colour) else colour,
+            getattr(album, "comments", None),
+        ),
+    )
+
+    cursor.execute("DELETE FROM track_ratings WHERE ratingID = ?", (album.ratingID,))
+    cursor.executemany(
+        """
+        INSERT INTO track_ratings (ratingID, position, spotifyTrackID, rating, favouriteIndex, comments)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (
+                album.ratingID,
+                position,
+                track.spotifyID,
+                track.rating,
+                getattr(track, "favouriteIndex", None),
+                getattr(track, "comments", None),
+            )
+            for position, track in enumerate(album.tracks)
+        ],
+    )
+
+
+def writeAlbumRating(album: "music.Album", headerSQL: str, headerParams: tuple) -> None:
+    with db.pooledCursor(DATABASE, commit=True) as cursor:
+        cursor.execute(headerSQL, headerParams)
+
+        writeNormalisedRating(cursor, album)
+
+
+async def saveAlbumRating(
+    album: "music.Album", headerSQL: str, headerParams: tuple
+) -> None:
+    """
+    Runs the albumRatings header statement and rewrites the rating's normalised rows
+    in the same transaction on the database writer thread.
+    """
+    loop = asyncio.get_running_loop()
+
+    await loop.run_in_executor(
+        db.writerExecutor(), writeAlbumRating, album, headerSQL, headerParams
+    )
+
+
+def readAlbumRatings(ratingIDs: list[str]) -> dict[str, list]:
+    """Fetches every row needed to rebuild the given ratings in a handful of queries. Runs on the reader pool."""
+    connection = db.getReaderConnection(DATABASE)
+
+    placeholders = ",".join("?" for _ in ratingIDs)
+    params = tuple(ratingIDs)
+
+    rows = {}
+
+    rows["headers"] = connection.execute(
+        f"""
+        SELECT r.ratingID, r.createdBy, r.createdAt, r.editedAt, r.spotifyAlbumID,
+            d.ratingOutOf, d.customCoverImage, d.coverImageColour, d.comments
+        FROM albumRatings r JOIN rating_details d ON d.ratingID = r.ratingID
+        WHERE r.ratingID IN ({placeholders})
+        """,
+        params,
+    ).fetchall()
+
+    albumIDs = tuple({header[4] for header in rows["headers"]})
+    albumPlaceholders = ",".join("?" for _ in albumIDs)
+
+    rows["albums"] = connection.execute(
+        f"SELECT spotifyAlbumID, name, link, releaseDate, coverImage FROM albums WHERE spotifyAlbumID IN ({albumPlaceholders})",
+        albumIDs,
+    ).fetchall()
+
+    rows["albumArtists"] = connection.execute(
+        f"""
+        SELECT aa.spotifyAlbumID, ar.spotifyArtistID, ar.name, ar.link
+        FROM album_artists aa JOIN artists ar ON ar.spotifyArtistID = aa.spotifyArtistID
+        WHERE aa.spotifyAlbumID IN ({albumPlaceholders})
+        ORDER BY aa.spotifyAlbumID, aa.position
+        """,
+        albumIDs,
+    ).fetchall()
+
+    rows["tracks"] = connection.execute(
+        f"""
+        SELECT tr.ratingID, t.spotifyTrackID, t.name, t.explicit, t.link, t.trackNumber, t.discNumber, t.durationMS,
+            tr.rating, tr.favouriteIndex, tr.comments
+        FROM track_ratings tr JOIN tracks t ON t.spotifyTrackID = tr.spotifyTrackID
+        WHERE tr.ratingID IN ({placeholders})
+        ORDER BY tr.ratingID, tr.position
+        """,
+        params,
+    ).fetchall()
+
+    rows["trackArtists"] = connection.execute(
+        f"""
+        SELECT ta.spotifyTrackID, ar.spotifyArtistID, ar.name, ar.link
+        FROM track_artists ta JOIN artists ar ON ar.spotifyArtistID = ta.spotifyArtistID
+        WHERE ta.spotifyTrackID IN (SELECT spotifyTrackID FROM track_ratings WHERE ratingID IN ({placeholders}))
+        ORDER BY ta.spotifyTrackID, ta.position
+        """,
+        params,
+    ).fetchall()
+
+    return rows
+
+
+def buildAlbumRatings(bot: discord.Bot, rows: dict[str, list]) -> dict[str, "music.Album"]:
+    albums = {row[0]: row for row in rows["albums"]}
+
+    albumArtists: dict[str, list[music.Artist]] = {}
+    trackArtists: dict[str, list[music.Artist]] = {}
+    tracksByRating: dict[str, list[tuple]] = {}
+
+    for albumID, artistID, name, link in rows["albumArtists"]:
+        albumArtists.setdefault(albumID, []).append(music.Artist(artistID, name, link))
+
+    for trackID, artistID, name, link in rows["trackArtists"]:
+        trackArtists.setdefault(trackID, []).append(music.Artist(artistID, name, link))
+
+    for trackRow in rows["tracks"]:
+        tracksByRating.setdefault(trackRow[0], []).append(trackRow)
+
+    built = {}
+
+    for header in rows["headers"]:
+        (
+            ratingID,
+            createdBy,
+            createdAt,
+            editedAt,
+            albumID,
+            ratingOutOf,
+            customCoverImage,
+            coverImageColour,
+            comments,
+        ) = header
+
+        _, name, link, releaseDate, coverImage = albums[albumID]
+
+        album = music.Album(
+            albumID,
+            name,
+            albumArtists.get(albumID, []),
+            link,
+            dates.simpleDateObj(releaseDate) if releaseDate else None,
+            bot.get_user(createdBy),
+            dates.simpleDateObj(createdAt),
+            dates.simpleDateObj(editedAt) if editedAt else None,
+            ratingOutOf=ratingOutOf,
+            coverImage=coverImage,
+            customCoverImage=customCoverImage,
+            coverImageColour=(
+                discord.Colour(coverImageColour)
+                if coverImageColour is not None
+                else None
+            ),
+            comments=comments,
+        )
+        album.ratingID = ratingID
+
+        for trackRow in tracksByRating.get(ratingID, []):
+            (
+                _,
+                trackID,
+                trackName,
+                explicit,
+                trackLink,
+                trackNumber,
+                discNumber,
+                durationMS,
+                rating,
+                favouriteIndex,
+                trackComments,
+            ) = trackRow
+
+            album.addTrack(
+                music.Track(
+                    trackID,
+                    trackName,
+                    trackArtists.get(trackID, []),
+                    bool(explicit),
+                    trackLink,
+                    trackNumber,
+                    discNumber,
+                    durationMS,
+                    rating,
+                    favouriteIndex,
+                    trackComments,
+                )
+            )
+
+        built[ratingID] = album
+
+    return built
+
+
+def migratePickledRatings(ratingIDs: list[str] | None = None) -> int:
+    """
+    Decodes albumRatings.serializedRating for every rating that isn't in the normalised tables yet
+    (or just the given ones) and writes it out. Runs on the database writer thread.
+    Returns the number of ratings migrated.
+    """
+    sql = "SELECT ratingID, serializedRating FROM albumRatings WHERE ratingID NOT IN (SELECT ratingID FROM rating_details)"
+    params = ()
+
+    if ratingIDs:
+        sql += f" AND ratingID IN ({",".join("?" for _ in ratingIDs)})"
+        params = tuple(ratingIDs)
+
+    with db.pooledCursor(DATABASE) as cursor:
+        cursor.execute(sql, params)
+
+        pickledRatings = cursor.fetchall()
+
+    migrated = 0
+
+    for ratingID, serializedRating in pickledRatings:
+        if not serializedRating:
+            continue
+
+        try:
+            album: music.Album = music.loadSerializedRating(serializedRating)
+        except Exception as e:
+            print(f"Could not decode album rating {ratingID}: {e}")
+            continue
+
+        # The header row is the source of truth for the ID.
+        album.ratingID = ratingID
+
+        with db.pooledCursor(DATABASE, commit=True) as cursor:
+            writeNormalisedRating(cursor, album)
+
+        migrated += 1
+
+    return migrated
+
+
+# Set once every pickled rating has been migrated in this process. New ratings are always written
+# to the normalised tables, so queries across all ratings only need to wait for this once.
+pickledRatingsMigrated = False
+
+
+async def ensureRatingsMigrated() -> None:
+    """Migrates any ratings still stored only as pickles, before a query that reads every rating."""
+    global pickledRatingsMigrated
+
+    if pickledRatingsMigrated:
+        return
+
+    loop = asyncio.get_running_loop()
+
+    await loop.run_in_executor(db.writerExecutor(), migratePickledRatings)
+
+    pickledRatingsMigrated = True
+
+
+async def loadAlbumRatings(bot: discord.Bot, ratingIDs: list[str]) -> "list[music.Album]":
+    """
+    Rebuilds Album objects for the given rating IDs from the normalised tables, in the order given.
+    Ratings that haven't been migrated off their pickle yet are migrated on the way through.
+    """
+    if not ratingIDs:
+        return []
+
+    loop = asyncio.get_running_loop()
+
+    rows = await loop.run_in_executor(
+        db.readerExecutor(), readAlbumRatings, list(ratingIDs)
+    )
+    built = buildAlbumRatings(bot, rows)
+
+    missing = [ratingID for ratingID in ratingIDs if ratingID not in built]
+
+    if missing:
+        await loop.run_in_executor(
+            db.writerExecutor(), migratePickledRatings, missing
+        )
+
+        rows = await loop.run_in_executor(db.readerExecutor(), readAlbumRatings, missing)
+        built.update(buildAlbumRatings(bot, rows))
+
+    return [built[ratingID] for ratingID in ratingIDs if ratingID in built]
+
+
+async def loadAlbumRating(bot: discord.Bot, ratingID: str) -> "music.Album":
+    albums = await loadAlbumRatings(bot, [ratingID])
+
+    if not albums:
+        raise Exception(f"The rating {ratingID} could not be loaded from the database.")
+
+    return albums[0]
+
+
+async def fetchTopTracks(
+    memberID: int, limit: int = 25, ascending: bool = False
+) -> list[tuple]:
+    """
+    Returns a member's highest (or lowest) rated songs across all of their album ratings as
+    (trackName, albumName, artistNames, rating, ratingOutOf, ratingID) rows. Excluded and unrated songs are skipped.
+    """
+    await ensureRatingsMigrated()
+
+    loop = asyncio.get_running_loop()
+
+    sql = f"""
+        SELECT t.name, a.name, r.ratingArtist, tr.rating, d.ratingOutOf, r.ratingID
+        FROM albumRatings r
+        JOIN rating_details d ON d.ratingID = r.ratingID
+        JOIN track_ratings tr ON tr.ratingID = r.ratingID
+        JOIN tracks t ON t.spotifyTrackID = tr.spotifyTrackID
+        JOIN albums a ON a.spotifyAlbumID = t.spotifyAlbumID
+        WHERE r.createdBy = ? AND tr.rating >= 0
+        ORDER BY tr.rating / d.ratingOutOf {"ASC" if ascending else "DESC"}, r.createdAt DESC
+        LIMIT ?
+    """
+
+    return await loop.run_in_executor(
+        db.readerExecutor(), db.readQuery, DATABASE, sql, (memberID, limit)
+    )
+
+
+async def fetchAlbumAverages(spotifyAlbumID: str) -> tuple[float | None, dict[str, float]]:
+    """
+    Averages every finished rating of an album in SQL. Returns the mean album score and a
+    mapping of track ID to that song's mean rating, ignoring excluded songs.
+    """
+    await ensureRatingsMigrated()
+
+    loop = asyncio.get_running_loop()
+
+    albumAverage = loop.run_in_executor(
+        db.readerExecutor(),
+        db.readQuery,
+        DATABASE,
+        "SELECT AVG(score) FROM albumRatings WHERE spotifyAlbumID = ? AND score IS NOT NULL",
+        (spotifyAlbumID,),
+    )
+    trackAverages = loop.run_in_executor(
+        db.readerExecutor(),
+        db.readQuery,
+        DATABASE,
+        """
+        SELECT tr.spotifyTrackID, AVG(tr.rating)
+        FROM albumRatings r JOIN track_ratings tr ON tr.ratingID = r.ratingID
+        WHERE r.spotifyAlbumID = ? AND tr.rating >= 0
+        GROUP BY tr.spotifyTrackID
+        """,
+        (spotifyAlbumID,),
+    )
+
+    albumAverage, trackAverages = await asyncio.gather(albumAverage, trackAverages)
+
+    return albumAverage[0][0], dict(trackAverages)
@@ -4,4 +4,44 @@ def multiRegexMatch(patterns: list[str], string: str, flags, allMustMatch: bool=
     if allMustMatch:
         return all(re.match(regex, string, flags) for regex in patterns)
     
-    return any(re.match(regex, string, flags) for regex in patterns)
\ No newline at end of file
+    return any(re.match(regex, string, flags) for regex in patterns)
+
+
+class MultiPattern:
+    """
+    Finds which of many patterns occur in a string, scanning it once instead of once per pattern.
+
+    Every pattern is wrapped in a named lookahead and joined into one alternation, so each position
+    in the string is tested against all of them in a single pass. Alternation only reports the first
+    pattern that matches at a position, so wherever one does, the others are tried at that same position
+    too. The result is identical to searching for each pattern separately. Patterns can't use numbered
+    backreferences, since their groups are renumbered in the combined pattern.
+
+    It isn't automatically faster. CPython's re can skip ahead on a single pattern's literal prefix,
+    which the combined alternation loses, so benchmark it against plain compiled searches first.
+    """
+
+    def __init__(self, patterns: list[str], flags=0):
+        self.patterns = [re.compile(pattern, flags) for pattern in patterns]
+        self.combined = re.compile(
+            "|".join(
+                f"(?=(?P<p{index}>{pattern}))" for index, pattern in enumerate(patterns)
+            ),
+            flags,
+        )
+
+    def matches(self, string: str) -> list[int]:
+        """Indexes of the patterns found anywhere in string, in the order the patterns were given."""
+        found = set()
+
+        for match in self.combined.finditer(string):
+            found.add(int(match.lastgroup[1:]))
+
+            for index, pattern in enumerate(self.patterns):
+                if index not in found and pattern.match(string, match.start()):
+                    found.add(index)
+
+            if len(found) == len(self.patterns):
+                break
+
+        return sorted(found)
@@ -1,4 +1,3 @@
-import aiohttp
 import os
 
 import discord
@@ -8,7 +7,7 @@ from dataclasses import dataclass, asdict
 
 from enum import Enum
 
-from src.utils import dates, text
+from src.utils import dates, text, httpClient
 from src.classes import *
 
 STEADY_API_TOKEN = os.getenv("STEADY_API_TOKEN")
@@ -43,67 +42,66 @@ async def fetchInstagramPosts(username: str) -> list["InstagramPost"]:
 
     params = {"username": username}
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(
-            f"{STEADY_API_BASE_INSTA}/posts", headers=headers, params=params
-        ) as results:
-            results.raise_for_status()
-
-            resultBody = await results.json()
-
-            resultBodyData = resultBody.get("body")
-
-            if resultBodyData == None:
-                raise Exception(
-                    "There was an error finding the result data in the API response!"
-                )
-
-            if resultBodyData == []:
-                raise Exception("That user is private and/or does not have any posts!")
-
-            resultBodyData.sort(key=lambda post: post.get("taken_at", 0), reverse=True)
-
-            parsedResults = []
-
-            for rawResult in resultBodyData:
-                userData = rawResult.get("user", {})
-
-                user = InstagramUser(
-                    id=int(userData.get("id", 0)),
-                    username=userData.get("username", ""),
-                    isVerified=userData.get("is_verified", False),
-                    avatar=userData.get("profile_pic", ""),
-                )
-
-                views = (
-                    rawResult.get("ig_play_count") or rawResult.get("play_count") or 0
-                )
-
-                post = InstagramPost(
-                    id=int(rawResult.get("id", 0)),
-                    user=user,
-                    slug=rawResult.get("shortcode", ""),
-                    productType=ProductType(rawResult.get("product_type", "unknown")),
-                    timestamp=dates.datetime.datetime.fromtimestamp(
-                        timestamp=rawResult.get("taken_at", 0)
-                    ),
-                    caption=rawResult.get("caption", ""),
-                    likes=rawResult.get("like_count", 0),
-                    comments=rawResult.get("comment_count", 0),
-                    views=views,
-                    reposts=rawResult.get("reshare_count", 0),
-                    postLink=rawResult.get("permalink", ""),
-                    mediaLink=rawResult.get("media_url", ""),
-                    thumbnailLink=rawResult.get("thumbnail_url", ""),
-                    width=rawResult.get("width", 0),
-                    height=rawResult.get("height", 0),
-                    hasAudio=rawResult.get("has_audio", False),
-                    isAd=rawResult.get("is_paid_partnership", False),
-                )
-
-                parsedResults.append(post)
-
-            return parsedResults
+    async with httpClient.request(
+        "GET", f"{STEADY_API_BASE_INSTA}/posts", headers=headers, params=params
+    ) as results:
+        results.raise_for_status()
+
+        resultBody = await results.json()
+
+        resultBodyData = resultBody.get("body")
+
+        if resultBodyData == None:
+            raise Exception(
+                "There was an error finding the result data in the API response!"
+            )
+
+        if resultBodyData == []:
+            raise Exception("That user is private and/or does not have any posts!")
+
+        resultBodyData.sort(key=lambda post: post.get("taken_at", 0), reverse=True)
+
+        parsedResults = []
+
+        for rawResult in resultBodyData:
+            userData = rawResult.get("user", {})
+
+            user = InstagramUser(
+                id=int(userData.get("id", 0)),
+                username=userData.get("username", ""),
+                isVerified=userData.get("is_verified", False),
+                avatar=userData.get("profile_pic", ""),
+            )
+
+            views = (
+                rawResult.get("ig_play_count") or rawResult.get("play_count") or 0
+            )
+
+            post = InstagramPost(
+                id=int(rawResult.get("id", 0)),
+                user=user,
+                slug=rawResult.get("shortcode", ""),
+                productType=ProductType(rawResult.get("product_type", "unknown")),
+                timestamp=dates.datetime.datetime.fromtimestamp(
+                    timestamp=rawResult.get("taken_at", 0)
+                ),
+                caption=rawResult.get("caption", ""),
+                likes=rawResult.get("like_count", 0),
+                comments=rawResult.get("comment_count", 0),
+                views=views,
+                reposts=rawResult.get("reshare_count", 0),
+                postLink=rawResult.get("permalink", ""),
+                mediaLink=rawResult.get("media_url", ""),
+                thumbnailLink=rawResult.get("thumbnail_url", ""),
+                width=rawResult.get("width", 0),
+                height=rawResult.get("height", 0),
+                hasAudio=rawResult.get("has_audio", False),
+                isAd=rawResult.get("is_paid_partnership", False),
+            )
+
+            parsedResults.append(post)
+
+        return parsedResults
 
 
 class ProductType(Enum):
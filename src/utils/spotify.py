@@ -0,0 +1,210 @@
+import asyncio
+import base64
+import os
+import time
+
+import aiohttp
+
+from src.utils import cache, httpClient
+
+SPOTIFY_CLIENT_ID = os.getenv("SPOTIFY_CLIENT_ID")
+SPOTIFY_CLIENT_SECRET = os.getenv("SPOTIFY_CLIENT_SECRET")
+
+SPOTIFY_API_BASE = "https://api.spotify.com/v1"
+SPOTIFY_TOKEN_URL = "https://accounts.spotify.com/api/token"
+
+# Refresh the token this many seconds before Spotify says it expires, so a request never goes out with a stale one.
+TOKEN_REFRESH_MARGIN = 60
+
+# Spotify's Retry-After can be longer than the shared client will wait between retries, so 429s are
+# left out of its retries and handled here alone. Waits up to this long are slept off; anything longer
+# is surfaced as an error instead of holding the command.
+MAX_RATE_LIMIT_WAIT = 30
+MAX_RATE_LIMIT_RETRIES = 3
+
+# Spotify returns at most this many tracks per page, and the album endpoint only includes the first page.
+TRACK_PAGE_SIZE = 50
+# How many of the remaining track pages are requested at once.
+TRACK_PAGE_CONCURRENCY = 5
+# Tracks past this are never fetched, however long the album is.
+MAX_ALBUM_TRACKS = 500
+
+# Album details barely change, so they're kept for a day. Search results drift as Spotify's catalogue does.
+# Both are also stored in db.db so repeat lookups skip the network across restarts too.
+CACHE_DATABASE = "db.db"
+
+albumCache = cache.ResponseCache(
+    "spotifyAlbums", maxEntries=256, ttl=24 * 60 * 60, database=CACHE_DATABASE
+)
+searchCache = cache.ResponseCache(
+    "spotifySearch", maxEntries=512, ttl=60 * 60, database=CACHE_DATABASE
+)
+
+accessToken: str | None = None
+accessTokenExpiresAt: float = 0
+tokenLock: asyncio.Lock | None = None
+
+
+class SpotifyError(Exception):
+    pass
+
+
+class SpotifyConnectionError(SpotifyError):
+    pass
+
+
+class SpotifyRateLimited(SpotifyError):
+    def __init__(self, retryAfter: float):
+        self.retryAfter = retryAfter
+
+        super().__init__(
+            f"Spotify is rate limiting the bot right now. Try again in {retryAfter:.0f} seconds."
+        )
+
+
+async def getAccessToken(*, forceRefresh: bool = False) -> str:
+    """
+    Returns a client-credentials access token, fetching a new one only when the cached one is
+    close to expiring. Concurrent callers share a single refresh.
+    """
+    global accessToken, accessTokenExpiresAt, tokenLock
+
+    if tokenLock is None:
+        tokenLock = asyncio.Lock()
+
+    async with tokenLock:
+        if (
+            not forceRefresh
+            and accessToken
+            and time.monotonic() < accessTokenExpiresAt - TOKEN_REFRESH_MARGIN
+        ):
+            return accessToken
+
+        if not SPOTIFY_CLIENT_ID or not SPOTIFY_CLIENT_SECRET:
+            raise SpotifyError("Spotify client credentials are not configured.")
+
+        credentials = base64.b64encode(
+            f"{SPOTIFY_CLIENT_ID}:{SPOTIFY_CLIENT_SECRET}".encode()
+        ).decode()
+
+        async with httpClient.request(
+            "POST",
+            SPOTIFY_TOKEN_URL,
+            headers={"Authorization": f"Basic {credentials}"},
+            data={"grant_type": "client_credentials"},
+            retry=True,
+        ) as response:
+            if response.status != 200:
+                raise SpotifyError(
+                    f"Spotify authentication failed ({response.status}): {await response.text()}"
+                )
+
+            tokenData = await response.json()
+
+        accessToken = tokenData["access_token"]
+        accessTokenExpiresAt = time.monotonic() + tokenData.get("expires_in", 3600)
+
+        return accessToken
+
+
+async def apiGet(path: str, params: dict | None = None) -> dict:
+    """
+    GETs a Spotify Web API endpoint (e.g. "albums/{id}") and returns the decoded JSON.
+    An expired token is refreshed once, and 429s wait out Retry-After.
+    """
+    refreshedToken = False
+    forceRefresh = False
+    rateLimitRetries = 0
+
+    while True:
+        token = await getAccessToken(forceRefresh=forceRefresh)
+        forceRefresh = False
+        retryAfter = None
+
+        try:
+            async with httpClient.request(
+                "GET",
+                f"{SPOTIFY_API_BASE}/{path}",
+                headers={"Authorization": f"Bearer {token}"},
+                params=params,
+                retryStatuses=httpClient.RETRY_STATUSES - {429},
+            ) as response:
+                if response.status == 200:
+                    return await response.json()
+
+                if response.status == 401 and not refreshedToken:
+                    refreshedToken = forceRefresh = True
+                elif response.status == 429:
+                    retryAfter = float(response.headers.get("Retry-After", 1))
+                else:
+                    raise SpotifyError(
+                        f"Spotify request to {path} failed ({response.status}): {await response.text()}"
+                    )
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+            raise SpotifyConnectionError(f"Could not reach Spotify: {e}") from e
+
+        if retryAfter is not None:
+            if (
+                retryAfter > MAX_RATE_LIMIT_WAIT
+                or rateLimitRetries >= MAX_RATE_LIMIT_RETRIES
+            ):
+                raise SpotifyRateLimited(retryAfter)
+
+            rateLimitRetries += 1
+
+            await asyncio.sleep(retryAfter)
+
+
+def normaliseQuery(query: str) -> str:
+    return " ".join(query.casefold().split())
+
+
+async def search(query: str, limit: int = 5, type: str = "album") -> dict:
+    return await searchCache.getOrFetch(
+        f"{type}:{limit}:{normaliseQuery(query)}",
+        lambda: apiGet("search", {"q": query, "limit": limit, "type": type}),
+    )
+
+
+async def fetchFullAlbum(albumID: str) -> dict:
+    """
+    Fetches an album along with every page of its tracks, up to MAX_ALBUM_TRACKS. Pages past the
+    first are requested in concurrent batches, and data["tracks"]["items"] ends up holding the tracklist.
+    """
+    data = await apiGet(f"albums/{albumID}")
+
+    tracks = data["tracks"]
+    items = list(tracks["items"])
+
+    offsets = list(
+        range(
+            len(items), min(tracks.get("total", 0), MAX_ALBUM_TRACKS), TRACK_PAGE_SIZE
+        )
+    )
+
+    for batch in range(0, len(offsets), TRACK_PAGE_CONCURRENCY):
+        pages = await asyncio.gather(
+            *(
+                apiGet(
+                    f"albums/{albumID}/tracks",
+                    {"offset": offset, "limit": TRACK_PAGE_SIZE},
+                )
+                for offset in offsets[batch : batch + TRACK_PAGE_CONCURRENCY]
+            )
+        )
+
+        for page in pages:
+            items.extend(page["items"])
+
+    items = items[:MAX_ALBUM_TRACKS]
+
+    data["tracks"] = {**tracks, "items": items, "next": None, "limit": len(items)}
+
+    return data
+
+
+async def album(albumID: str) -> dict:
+    # Keyed with the full tracklist so entries cached before pagination aren't reused.
+    return await albumCache.getOrFetch(
+        f"{albumID}:allTracks", lambda: fetchFullAlbum(albumID)
+    )
@@ -0,0 +1,225 @@
+import asyncio
+import contextlib
+import os
+import statistics
+import subprocess
+import time
+
+import psutil
+
+from src.utils import db
+
+# Records how long each part of a restart takes, from the process starting to the first READY, and keeps
+# every boot's timings in db.db so slow cogs and regressions between deploys can be spotted.
+DATABASE = "db.db"
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS startupRuns (
+        runID INTEGER PRIMARY KEY AUTOINCREMENT,
+        startedAt REAL NOT NULL,
+        readySeconds REAL NOT NULL,
+        version TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS startupTimings (
+        runID INTEGER NOT NULL REFERENCES startupRuns (runID) ON DELETE CASCADE,
+        kind TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        name TEXT NOT NULL,
+        seconds REAL NOT NULL,
+        PRIMARY KEY (runID, kind, position)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_startupTimings_name ON startupTimings (kind, name, runID)",
+]
+
+PHASE = "phase"
+EXTENSION = "extension"
+
+# Wall clock time the interpreter was launched, so module imports before anything here runs are counted too.
+processStartedAt = psutil.Process().create_time()
+
+phases: list[tuple[str, float]] = []
+extensions: list[tuple[str, float]] = []
+recorded = False
+schemaReady = False
+
+
+def secondsSinceStart() -> float:
+    return time.time() - processStartedAt
+
+
+def recordPhase(name: str, seconds: float) -> None:
+    phases.append((name, seconds))
+
+
+def recordExtension(name: str, seconds: float) -> None:
+    extensions.append((name, seconds))
+
+
+@contextlib.contextmanager
+def phase(name: str):
+    """Times the wrapped block as a startup phase."""
+    started = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        recordPhase(name, time.perf_counter() - started)
+
+
+def deployVersion() -> str | None:
+    """The deployed commit, from DEPLOY_VERSION if the container sets it, otherwise git."""
+    version = os.getenv("DEPLOY_VERSION")
+
+    if version:
+        return version
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def ensureSchema() -> None:
+    """Creates the tables on first use. Writes, so it runs on the database writer thread."""
+    global schemaReady
+
+    if schemaReady:
+        return
+
+    with db.pooledCursor(DATABASE, commit=True) as cursor:
+        for statement in SCHEMA:
+            cursor.execute(statement)
+
+    schemaReady = True
+
+
+def writeRun(startedAt: float, readySeconds: float) -> int:
+    ensureSchema()
+
+    version = deployVersion()
+
+    with db.pooledCursor(DATABASE, commit=True) as cursor:
+        cursor.execute(
+            "INSERT INTO startupRuns (startedAt, readySeconds, version) VALUES (?, ?, ?)",
+            (startedAt, readySeconds, version),
+        )
+
+        runID = cursor.lastrowid
+
+        cursor.executemany(
+            "INSERT INTO startupTimings (runID, kind, position, name, seconds) VALUES (?, ?, ?, ?, ?)",
+            [
+                (runID, kind, position, name, seconds)
+                for kind, timings in ((PHASE, phases), (EXTENSION, extensions))
+                for position, (name, seconds) in enumerate(timings)
+            ],
+        )
+
+    return runID
+
+
+async def recordReady() -> None:
+    """
+    Called from on_ready. Saves this boot's timings the first time the bot becomes ready.
+    Later READY events from reconnects are ignored.
+    """
+    global recorded
+
+    if recorded:
+        return
+
+    recorded = True
+
+    readySeconds = secondsSinceStart()
+
+    print(
+        f"Ready {readySeconds:.2f}s after process start. Slowest extension: "
+        + (
+            "{} ({:.2f}s).".format(*max(extensions, key=lambda timing: timing[1]))
+            if extensions
+            else "none."
+        )
+    )
+
+    loop = asyncio.get_running_loop()
+
+    try:
+        await loop.run_in_executor(
+            db.writerExecutor(), writeRun, processStartedAt, readySeconds
+        )
+    except Exception as e:
+        print(f"Could not save startup timings: {e}")
+
+
+def readRuns(limit: int) -> list[tuple]:
+    """The most recent boots as (runID, startedAt, readySeconds, version) rows, newest first."""
+    return db.readQuery(
+        DATABASE,
+        "SELECT runID, startedAt, readySeconds, version FROM startupRuns ORDER BY runID DESC LIMIT ?",
+        (limit,),
+    )
+
+
+def readTimings(runID: int) -> list[tuple]:
+    """A boot's timings as (kind, name, seconds) rows, in the order they happened."""
+    return db.readQuery(
+        DATABASE,
+        "SELECT kind, name, seconds FROM startupTimings WHERE runID = ? ORDER BY kind, position",
+        (runID,),
+    )
+
+
+def readMedians(runIDs: list[int]) -> dict[tuple[str, str], float]:
+    """The median time of every phase and extension across the given boots, keyed by (kind, name)."""
+    if not runIDs:
+        return {}
+
+    placeholders = ", ".join("?" * len(runIDs))
+
+    rows = db.readQuery(
+        DATABASE,
+        f"SELECT kind, name, seconds FROM startupTimings WHERE runID IN ({placeholders})",
+        tuple(runIDs),
+    )
+
+    samples: dict[tuple[str, str], list[float]] = {}
+
+    for kind, name, seconds in rows:
+        samples.setdefault((kind, name), []).append(seconds)
+
+    return {key: statistics.median(values) for key, values in samples.items()}
+
+
+async def fetchStartupReport(history: int) -> tuple[list[tuple], list[tuple], dict]:
+    """
+    Returns the last `history` boots, the newest boot's timings, and the median timings
+    of the boots before it, for comparing against.
+    """
+    loop = asyncio.get_running_loop()
+
+    # Normally already done when this boot's timings were saved, but /debug startup can run first.
+    await loop.run_in_executor(db.writerExecutor(), ensureSchema)
+
+    runs = await loop.run_in_executor(db.readerExecutor(), readRuns, history)
+
+    if not runs:
+        return [], [], {}
+
+    timings, medians = await asyncio.gather(
+        loop.run_in_executor(db.readerExecutor(), readTimings, runs[0][0]),
+        loop.run_in_executor(
+            db.readerExecutor(), readMedians, [run[0] for run in runs[1:]]
+        ),
+    )
+
+    return runs, timings, medians
@@ -1,8 +1,44 @@
 import datetime
 
 from src.classes import *
+from src.utils import dates
 
-from src.utils.logging import commandLogs, logClasses
+from src.utils.logging import commandLogs, logClasses, logBuffer
+
+COMMAND_LOG_INDEXES = {
+    "idx_commands_timestamp": "timestamp",
+    "idx_commands_qualifiedCommandName": "qualifiedCommandName",
+    "idx_commands_invocationUserID": "invocationUserID",
+}
+
+# CommandLogEntry attribute -> commands table column, for the attributes that can be tallied in SQL.
+COMMAND_LOG_COLUMNS = {
+    "id": "entryID",
+    "qualifiedCommandName": "qualifiedCommandName",
+    "invocationGuildID": "invocationGuildID",
+    "invocationGuildName": "invocationGuildName",
+    "invocationChannelID": "invocationChannelID",
+    "invocationChannelName": "invocationChannelName",
+    "invocationUserID": "invocationUserID",
+}
+
+# CommandLogEntry attribute -> commandRollups column.
+COMMAND_ROLLUP_COLUMNS = {
+    "qualifiedCommandName": "qualifiedCommandName",
+    "invocationGuildID": "guildID",
+    "invocationChannelID": "channelID",
+    "invocationUserID": "userID",
+}
+
+# MessageLogEntry attribute -> messageRollups column.
+MESSAGE_ROLLUP_COLUMNS = {
+    "guildID": "guildID",
+    "channelID": "channelID",
+    "userID": "userID",
+    "messageTypes": "messageTypes",
+}
+
+commandLogIndexesCreated = False
 
 
 def tallyByEntryAttribute(
@@ -20,7 +56,21 @@ def tallyByEntryAttribute(
     return sorted_counts
 
 
-def fetchCommandLogs(
+async def ensureCommandLogIndexes(database: LocalDatabase) -> None:
+    global commandLogIndexesCreated
+
+    if commandLogIndexesCreated:
+        return
+
+    for indexName, column in COMMAND_LOG_INDEXES.items():
+        await database.aset(
+            f"CREATE INDEX IF NOT EXISTS {indexName} ON commands ({column})"
+        )
+
+    commandLogIndexesCreated = True
+
+
+def buildCommandLogFilters(
     *,
     filterLogIDS: list[str] = None,
     filterLogStartDate: datetime.datetime = None,
@@ -30,63 +80,217 @@ def fetchCommandLogs(
     filterChannels: list[int] = None,
     filterCommands: list[str] = None,
     includeDMS: bool = True,
-    onlyDMS: bool = False
-) -> list[logClasses.CommandLogEntry]:
+    onlyDMS: bool = False,
+) -> tuple[str, tuple]:
+    """
+    Turns the command log filter kwargs into a WHERE clause and its parameters.
+    Returns an empty clause when no filters are given.
+    """
+    clauses = []
+    params = []
+
+    def addInClause(column: str, values: list) -> None:
+        placeholders = ",".join("?" for _ in values)
+
+        clauses.append(f"{column} IN ({placeholders})")
+        params.extend(values)
+
+    if filterLogIDS:
+        addInClause("entryID", filterLogIDS)
+
+    if filterLogStartDate:
+        clauses.append("timestamp > ?")
+        params.append(dates.formatSimpleDate(filterLogStartDate, databaseDate=True))
+
+    if filterLogEndDate:
+        clauses.append("timestamp < ?")
+        params.append(dates.formatSimpleDate(filterLogEndDate, databaseDate=True))
+
+    if filterUsers:
+        addInClause("invocationUserID", filterUsers)
+
+    if filterGuilds:
+        addInClause("invocationGuildID", filterGuilds)
+
+    if filterChannels:
+        addInClause("invocationChannelID", filterChannels)
+
+    if filterCommands:
+        addInClause("qualifiedCommandName", filterCommands)
+
+    if onlyDMS:
+        clauses.append("invocationGuildName = 'DM'")
+    elif not includeDMS:
+        clauses.append("invocationGuildName != 'DM'")
+
+    if not clauses:
+        return "", ()
+
+    return " WHERE " + " AND ".join(clauses), tuple(params)
+
+
+async def fetchCommandLogs(limit: int = 0, **filters) -> list[logClasses.CommandLogEntry]:
+    """Fetches command log entries, newest first. Accepts the filters of buildCommandLogFilters()."""
     database = LocalDatabase(database="logs")
 
-    sql = "SELECT * FROM commands ORDER BY timestamp DESC"
+    await ensureCommandLogIndexes(database)
+    await logBuffer.getLogBuffer("logs").flush()
+
+    where, params = buildCommandLogFilters(**filters)
 
-    rawLogEntries = database.get(sql)
+    sql = f"SELECT * FROM commands{where} ORDER BY timestamp DESC"
+
+    rawLogEntries = await database.aget(sql, params, limit=limit)
 
     logEntryObjs = [
         commandLogs.dbResultToLogEntry(rawEntry) for rawEntry in rawLogEntries
     ]
 
-    if not any(
-        [
-            filterLogIDS,
-            filterLogStartDate,
-            filterLogEndDate,
-            filterUsers,
-            filterGuilds,
-            filterChannels,
-            filterCommands,
-            not includeDMS,
-            onlyDMS,
-        ]
-    ):
-        return logEntryObjs
+    return logEntryObjs
+
+
+async def tallyCommandLogs(
+    key: str, reverseSort: bool = False, limit: int = 0, **filters
+) -> list[tuple[str, int]]:
+    """
+    SQL version of tallyByEntryAttribute(). Counts command log entries grouped by a
+    CommandLogEntry attribute without loading the rows. Accepts the filters of buildCommandLogFilters().
+    """
+    column = COMMAND_LOG_COLUMNS.get(key)
 
-    filteredLogEntries = []
+    if not column:
+        raise ValueError(f"Command logs can't be tallied by '{key}'.")
 
-    for entry in logEntryObjs:
-        checks = []
+    database = LocalDatabase(database="logs")
 
-        if entry.invocationGuildName == "DM" and (not includeDMS or not onlyDMS):
-            continue
+    await ensureCommandLogIndexes(database)
+    await logBuffer.getLogBuffer("logs").flush()
 
-        if filterLogIDS:
-            checks.append(entry.id in filterLogIDS)
+    where, params = buildCommandLogFilters(**filters)
 
-        if filterLogStartDate:
-            checks.append(entry.timestamp > filterLogStartDate)
+    sql = f"SELECT {column}, COUNT(*) AS uses FROM commands{where} GROUP BY {column} ORDER BY uses {"DESC" if reverseSort else "ASC"}"
 
-        if filterLogEndDate:
-            checks.append(entry.timestamp < filterLogEndDate)
+    if limit:
+        sql += " LIMIT ?"
+        params += (limit,)
 
-        if filterUsers:
-            checks.append(entry.invocationUserID in filterUsers)
+    results = await database.aget(sql, params)
 
-        if filterGuilds:
-            checks.append(entry.invocationGuildID in filterGuilds)
+    return [(str(name), uses) for name, uses in results]
 
-        if filterChannels:
-            checks.append(entry.invocationChannelID in filterChannels)
 
-        if filterCommands:
-            checks.append(entry.qualifiedCommandName in filterCommands)
+def buildRollupFilters(
+    *,
+    filterStartDate: datetime.date = None,
+    filterEndDate: datetime.date = None,
+    filterUsers: list[int] = None,
+    filterGuilds: list[int] = None,
+    filterChannels: list[int] = None,
+    filterCommands: list[str] = None,
+    includeDMS: bool = True,
+    onlyDMS: bool = False,
+) -> tuple[str, tuple]:
+    """
+    Rollup version of buildCommandLogFilters(). Rollups are per day, so the date filters are
+    inclusive and only the date part of them is used.
+    """
+    clauses = []
+    params = []
+
+    def addInClause(column: str, values: list) -> None:
+        placeholders = ",".join("?" for _ in values)
+
+        clauses.append(f"{column} IN ({placeholders})")
+        params.extend(values)
+
+    if filterStartDate:
+        clauses.append("day >= ?")
+        params.append(dates.formatSimpleDate(filterStartDate, formatString="%Y-%m-%d"))
+
+    if filterEndDate:
+        clauses.append("day <= ?")
+        params.append(dates.formatSimpleDate(filterEndDate, formatString="%Y-%m-%d"))
+
+    if filterUsers:
+        addInClause("userID", filterUsers)
+
+    if filterGuilds:
+        addInClause("guildID", filterGuilds)
+
+    if filterChannels:
+        addInClause("channelID", filterChannels)
+
+    if filterCommands:
+        addInClause("qualifiedCommandName", filterCommands)
+
+    if onlyDMS:
+        clauses.append("guildID = 0")
+    elif not includeDMS:
+        clauses.append("guildID != 0")
+
+    if not clauses:
+        return "", ()
+
+    return " WHERE " + " AND ".join(clauses), tuple(params)
+
+
+async def tallyRollup(
+    table: str,
+    column: str,
+    total: str,
+    reverseSort: bool = False,
+    limit: int = 0,
+    **filters,
+) -> list[tuple[str, int]]:
+    database = LocalDatabase(database="logs")
+
+    await logBuffer.getLogBuffer("logs").flush()
+
+    where, params = buildRollupFilters(**filters)
+
+    sql = f"SELECT {column}, SUM({total}) AS total FROM {table}{where} GROUP BY {column} ORDER BY total {"DESC" if reverseSort else "ASC"}"
+
+    if limit:
+        sql += " LIMIT ?"
+        params += (limit,)
+
+    results = await database.aget(sql, params)
+
+    return [(str(name), total) for name, total in results]
+
+
+async def tallyCommandRollups(
+    key: str, reverseSort: bool = False, limit: int = 0, **filters
+) -> list[tuple[str, int]]:
+    """Counts command uses grouped by a CommandLogEntry attribute, read from the daily command rollups."""
+    column = COMMAND_ROLLUP_COLUMNS.get(key)
+
+    if not column:
+        raise ValueError(f"Command rollups can't be tallied by '{key}'.")
+
+    return await tallyRollup(
+        "commandRollups", column, "uses", reverseSort, limit, **filters
+    )
+
+
+async def tallyMessageRollups(
+    key: str,
+    reverseSort: bool = False,
+    limit: int = 0,
+    countWords: bool = False,
+    **filters,
+) -> list[tuple[str, int]]:
+    """Counts messages (or words, with countWords) grouped by a MessageLogEntry attribute, read from the daily message rollups."""
+    column = MESSAGE_ROLLUP_COLUMNS.get(key)
 
-        if all(checks):
-            filteredLogEntries.append(entry)
+    if not column:
+        raise ValueError(f"Message rollups can't be tallied by '{key}'.")
 
-    return filteredLogEntries
+    return await tallyRollup(
+        "messageRollups",
+        column,
+        "words" if countWords else "messages",
+        reverseSort,
+        limit,
+        **filters,
+    )
@@ -1,11 +1,12 @@
 import discord
-import aiohttp
 import asyncio
 import datetime
+import time
 from concurrent.futures import ThreadPoolExecutor
 
 from src.utils import dates
 from src.utils import text
+from src.utils import httpClient
 from src import constants
 
 from src.classes import *
@@ -16,6 +17,9 @@ DEFAULT_CURRENCY = "RUB"
 
 ITEM_DETAIL_REPLY_TIMEOUT_MINS = 14 * 60
 
+# Hideout requirements only change with game patches, so stations are fetched at most this often.
+HIDEOUT_REFRESH_SECONDS = 60 * 60
+
 
 class ItemSelect(discord.ui.Select):
     """
@@ -106,6 +110,8 @@ class TarkovEmbedReply(EmbedReply):
 
 
 class ItemPrice:
+    __slots__ = ("currency", "price", "priceRUB")
+
     def __init__(
         self,
         *,
@@ -130,6 +136,8 @@ class ItemPrice:
 
 
 class Vendor:
+    __slots__ = ("name", "slug")
+
     def __init__(self, *, name: str, slug: str):
         self.name = name
         self.slug = slug
@@ -139,6 +147,8 @@ class Vendor:
 
 
 class ItemOffer:
+    __slots__ = ("vendor", "price")
+
     def __init__(self, *, vendor: Vendor, price: ItemPrice):
         self.vendor = vendor
         self.price = price
@@ -148,6 +158,8 @@ class ItemOffer:
 
 
 class HideoutStation:
+    __slots__ = ("id", "name", "slug", "image", "crafts", "levels")
+
     def __init__(
         self,
         *,
@@ -170,6 +182,15 @@ class HideoutStation:
 
 
 class HideoutStationLevel:
+    __slots__ = (
+        "id",
+        "station",
+        "description",
+        "level",
+        "constructionTime",
+        "itemRequirements",
+    )
+
     def __init__(
         self,
         *,
@@ -211,7 +232,34 @@ class HideoutStationLevel:
         return f"• Level {self.level} *({dates.formatSeconds(self.constructionTime) if self.constructionTime else "Instant"})*"
 
 
+class HideoutIndex:
+    """Hideout stations, plus a reverse index from item ID to every station level that requires the item."""
+
+    def __init__(self, stations: list[HideoutStation]):
+        self.stations = stations
+        self.builtAt = time.monotonic()
+
+        self.levelsRequiring: dict[str, list[HideoutStationLevel]] = {}
+
+        for station in stations:
+            for level in station.levels:
+                for requirement in level.itemRequirements:
+                    levels = self.levelsRequiring.setdefault(requirement.item.id, [])
+
+                    # An item can be listed more than once in the same level.
+                    if not levels or levels[-1] is not level:
+                        levels.append(level)
+
+    def upgradesUsing(self, itemID: str) -> list[HideoutStationLevel]:
+        return self.levelsRequiring.get(itemID, [])
+
+    def isStale(self) -> bool:
+        return time.monotonic() - self.builtAt >= HIDEOUT_REFRESH_SECONDS
+
+
 class Craft:
+    __slots__ = ("id", "station", "level", "duration", "requiredItems", "rewardItems")
+
     def __init__(
         self,
         *,
@@ -276,6 +324,8 @@ class Craft:
 
 
 class Barter:
+    __slots__ = ("id", "trader", "level", "requiredItems", "rewardItems", "buyLimit")
+
     def __init__(
         self,
         *,
@@ -341,6 +391,8 @@ class Barter:
 
 
 class Trader:
+    __slots__ = ("name", "description", "image", "barters")
+
     def __init__(
         self, *, name: str, description: str, image: str, barters: list[Barter] = None
     ):
@@ -354,6 +406,8 @@ class Trader:
 
 
 class ItemCategory:
+    __slots__ = ("id", "name", "slug")
+
     def __init__(self, *, id: str, name: str, slug: str):
         self.id = id
         self.name = name
@@ -361,6 +415,18 @@ class ItemCategory:
 
 
 class SmallTask:
+    __slots__ = (
+        "id",
+        "name",
+        "slug",
+        "trader",
+        "map",
+        "experience",
+        "wikiLink",
+        "image",
+        "minPlayerLevel",
+    )
+
     def __init__(
         self,
         *,
@@ -391,6 +457,39 @@ class SmallTask:
 
 
 class Item:
+    __slots__ = (
+        "id",
+        "name",
+        "shortName",
+        "slug",
+        "description",
+        "weight",
+        "height",
+        "width",
+        "categories",
+        "basePrice",
+        "avg24hPrice",
+        "low24hPrice",
+        "high24hPrice",
+        "change48hPrice",
+        "change48hPercent",
+        "buys",
+        "sells",
+        "lastUpdate",
+        "itemImage",
+        "gridImage",
+        "inspectImage",
+        "wikiLink",
+        "apiLink",
+        "tasksUsed",
+        "tasksRecieved",
+        "bartersFor",
+        "bartersUsing",
+        "craftsFor",
+        "craftsUsing",
+        "hideoutUpgradesUsing",
+    )
+
     def __init__(
         self,
         *,
@@ -841,6 +940,22 @@ class Item:
 
 
 class SmallItem:
+    __slots__ = (
+        "id",
+        "name",
+        "shortName",
+        "slug",
+        "description",
+        "width",
+        "height",
+        "weight",
+        "itemImage",
+        "gridImage",
+        "inspectImage",
+        "wikiLink",
+        "apiLink",
+    )
+
     def __init__(
         self,
         id: str,
@@ -876,6 +991,8 @@ class SmallItem:
 
 
 class ContainedItem:
+    __slots__ = ("item", "count", "quantity")
+
     def __init__(self, item: SmallItem | Item, count: float, quantity: float):
         self.item = item
         self.count = count
@@ -885,19 +1002,41 @@ class ContainedItem:
         return f"{self.item.shortName} (*x{self.quantity:,}*)"
 
 
-async def apiFetch(query: str) -> dict:
+class EntityPool:
+    """
+    One shared object per trader, vendor, station, category and small item, keyed by ID (or name where
+    the API has none). Barters, crafts and offers all point at the same instances instead of copies.
+    """
+
+    __slots__ = ("traders", "vendors", "stations", "categories", "smallItems")
+
+    def __init__(self):
+        self.traders: dict[str, Trader] = {}
+        self.vendors: dict[str, Vendor] = {}
+        self.stations: dict[str, HideoutStation] = {}
+        self.categories: dict[str, ItemCategory] = {}
+        self.smallItems: dict[str, SmallItem] = {}
+
+
+CURRENCIES_BY_SHORT_NAME = {c["shortName"]: c for c in constants.CURRENCIES}
+
+
+async def apiFetch(query: str, timeout: float | None = None) -> dict:
     """
-    Performs an asynchronous POST request using aiohttp.
+    Performs an asynchronous POST request on the shared HTTP session.
+    Pass a timeout in seconds for queries too large for the session's default.
     """
     headers = {"Content-Type": "application/json"}
     url = "https://api.tarkov.dev/graphql"
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(
-            url, headers=headers, json={"query": query}
-        ) as response:
-            response.raise_for_status()
-            return await response.json()
+    kwargs = {} if timeout is None else {"timeout": timeout}
+
+    # GraphQL queries only read data, so they're safe to retry.
+    async with httpClient.request(
+        "POST", url, headers=headers, json={"query": query}, retry=True, **kwargs
+    ) as response:
+        response.raise_for_status()
+        return await response.json()
 
 
 def parseSimplePrice(amount):
@@ -907,42 +1046,68 @@ def parseSimplePrice(amount):
     return ItemPrice(price=amount, priceRUB=amount)
 
 
-def parseOffer(offerData):
+def parseOffer(offerData, pool: EntityPool):
+    vendorData = offerData["vendor"]
+    vendor = pool.vendors.get(vendorData["normalizedName"])
+
+    if vendor is None:
+        vendor = pool.vendors[vendorData["normalizedName"]] = Vendor(
+            name=vendorData["name"],
+            slug=vendorData["normalizedName"],
+        )
+
     return ItemOffer(
-        vendor=Vendor(
-            name=offerData["vendor"]["name"],
-            slug=offerData["vendor"]["normalizedName"],
-        ),
+        vendor=vendor,
         price=ItemPrice(
-            currency=next(
-                filter(
-                    lambda c: c["shortName"] == offerData["currency"],
-                    constants.CURRENCIES,
-                )
-            ),
+            currency=CURRENCIES_BY_SHORT_NAME[offerData["currency"]],
             price=offerData["price"],
             priceRUB=offerData["priceRUB"],
         ),
     )
 
 
-def parseCategory(category):
-    return ItemCategory(
-        id=category["id"],
-        name=str(category.get("name", "")).title(),
-        slug=category.get("normalizedName", ""),
-    )
+def parseCategory(category, pool: EntityPool):
+    parsed = pool.categories.get(category["id"])
 
+    if parsed is None:
+        parsed = pool.categories[category["id"]] = ItemCategory(
+            id=category["id"],
+            name=str(category.get("name", "")).title(),
+            slug=category.get("normalizedName", ""),
+        )
 
-def parseTrader(traderData):
-    return Trader(
-        name=traderData["name"],
-        description=traderData.get("description", ""),
-        image=traderData.get("image4xLink", ""),
-    )
+    return parsed
+
+
+def parseTrader(traderData, pool: EntityPool):
+    # Traders have no ID in the API, but their names are unique.
+    trader = pool.traders.get(traderData["name"])
+
+    if trader is None:
+        trader = pool.traders[traderData["name"]] = Trader(
+            name=traderData["name"],
+            description=traderData.get("description", ""),
+            image=traderData.get("image4xLink", ""),
+        )
 
+    return trader
 
-def parseHideoutStationLevel(levelData, station: HideoutStation):
+
+def parseStation(stationData, pool: EntityPool) -> HideoutStation:
+    station = pool.stations.get(stationData["id"])
+
+    if station is None:
+        station = pool.stations[stationData["id"]] = HideoutStation(
+            id=stationData["id"],
+            name=stationData.get("name"),
+            slug=stationData.get("normalizedName"),
+            image=stationData.get("imageLink", ""),
+        )
+
+    return station
+
+
+def parseHideoutStationLevel(levelData, station: HideoutStation, pool: EntityPool):
     return HideoutStationLevel(
         id=levelData["id"],
         station=station,
@@ -950,15 +1115,36 @@ def parseHideoutStationLevel(levelData, station: HideoutStation):
         level=levelData.get("level", 1),
         constructionTime=levelData.get("constructionTime", ""),
         itemRequirements=[
-            parseNestedItem(i) for i in levelData.get("itemRequirements", [])
+            parseNestedItem(i, pool) for i in levelData.get("itemRequirements", [])
         ],
     )
 
 
-def parseNestedItem(wrapper):
-    i = wrapper["item"]
+def parseSmallItem(i, pool: EntityPool) -> SmallItem:
+    item = pool.smallItems.get(i["id"])
+
+    if item is not None:
+        return item
+
+    if "name" not in i:
+        # Referenced only by ID and missing from the item list, e.g. an item that has been removed.
+        return SmallItem(
+            id=i["id"],
+            name="Unknown Item",
+            shortName="Unknown",
+            slug="unknown",
+            description="",
+            width="",
+            height="",
+            weight="",
+            itemImage="",
+            gridImage="",
+            inspectImage="",
+            wikiLink="",
+            apiLink="",
+        )
 
-    item = SmallItem(
+    item = pool.smallItems[i["id"]] = SmallItem(
         id=i["id"],
         name=i["name"],
         shortName=i["shortName"],
@@ -974,13 +1160,136 @@ def parseNestedItem(wrapper):
         apiLink=i.get("link", ""),
     )
 
+    return item
+
+
+def parseNestedItem(wrapper, pool: EntityPool):
     return ContainedItem(
-        item=item,
+        item=parseSmallItem(wrapper["item"], pool),
         count=wrapper.get("count", 0),
         quantity=wrapper.get("quantity", 0),
     )
 
 
+def parseTask(t, pool: EntityPool) -> SmallTask:
+    return SmallTask(
+        id=t["id"],
+        name=t["name"],
+        slug=t["normalizedName"],
+        trader=parseTrader(t["trader"], pool),
+        map=t["map"]["name"] if t.get("map") else "Any",
+        experience=t["experience"],
+        wikiLink=t.get("wikiLink", ""),
+        image=t.get("taskImageLink", ""),
+        minPlayerLevel=t.get("minPlayerLevel", 0),
+    )
+
+
+def parseBarter(b, pool: EntityPool) -> Barter:
+    return Barter(
+        id=b["id"],
+        trader=parseTrader(b["trader"], pool),
+        level=b["level"],
+        requiredItems=[parseNestedItem(x, pool) for x in b["requiredItems"]],
+        rewardItems=[parseNestedItem(x, pool) for x in b["rewardItems"]],
+        buyLimit=b["buyLimit"],
+    )
+
+
+def parseCraft(c, pool: EntityPool) -> Craft:
+    return Craft(
+        id=c["id"],
+        station=parseStation(c["station"], pool),
+        level=c["level"],
+        duration=c["duration"],
+        requiredItems=[parseNestedItem(x, pool) for x in c["requiredItems"]],
+        rewardItems=[parseNestedItem(x, pool) for x in c["rewardItems"]],
+    )
+
+
+def applyPrices(item: "Item", itemData, pool: EntityPool) -> None:
+    """Sets an item's prices, offers and update time from its API data. Also used to refresh prices in place."""
+    item.basePrice = parseSimplePrice(itemData.get("basePrice"))
+    item.avg24hPrice = parseSimplePrice(itemData.get("avg24hPrice"))
+    item.low24hPrice = parseSimplePrice(itemData.get("low24hPrice"))
+    item.high24hPrice = parseSimplePrice(itemData.get("high24hPrice"))
+    item.change48hPrice = parseSimplePrice(itemData.get("changeLast48h"))
+    item.change48hPercent = itemData.get("changeLast48hPercent") or 0.0
+
+    # Sorted before being assigned, so an item being shown mid-refresh never has half sorted offers.
+    item.buys = sorted(
+        (parseOffer(o, pool) for o in itemData.get("buyFor", [])),
+        key=lambda o: o.price.priceRUB,
+        reverse=True,
+    )
+
+    item.sells = sorted(
+        (parseOffer(o, pool) for o in itemData.get("sellFor", [])),
+        key=lambda o: o.price.priceRUB,
+        reverse=True,
+    )
+
+    lastUpdateStr = itemData.get("updated")
+    item.lastUpdate = (
+        dates.simpleDateObj(lastUpdateStr)
+        if lastUpdateStr
+        else dates.simpleDateObj(timeNow=True)
+    )
+
+
+def parseItem(
+    itemData,
+    pool: EntityPool,
+    *,
+    tasksUsed: list[SmallTask],
+    tasksReceived: list[SmallTask],
+    bartersFor: list[Barter],
+    bartersUsing: list[Barter],
+    craftsFor: list[Craft],
+    craftsUsing: list[Craft],
+    hideoutUpgradesUsing: list[HideoutStationLevel] = None,
+) -> "Item":
+    tasksUsed.sort(key=lambda t: t.minPlayerLevel)
+    tasksReceived.sort(key=lambda t: t.minPlayerLevel)
+
+    item = Item(
+        id=itemData["id"],
+        name=itemData["name"],
+        shortName=itemData.get("shortName", itemData["name"]),
+        slug=itemData["normalizedName"],
+        description=itemData.get("description", ""),
+        weight=itemData.get("weight", ""),
+        height=itemData.get("height", ""),
+        width=itemData.get("width", ""),
+        categories=[parseCategory(c, pool) for c in itemData.get("categories", [])],
+        basePrice=None,
+        avg24hPrice=None,
+        low24hPrice=None,
+        high24hPrice=None,
+        change48hPrice=None,
+        change48hPercent=0.0,
+        buys=[],
+        sells=[],
+        lastUpdate=None,
+        gridImage=itemData.get("gridImageLink", ""),
+        itemImage=itemData.get("image512pxLink", ""),
+        inspectImage=itemData.get("inspectImageLink", ""),
+        wikiLink=itemData.get("wikiLink", ""),
+        apiLink=itemData.get("link", ""),
+        tasksUsed=tasksUsed,
+        tasksRecieved=tasksReceived,
+        bartersFor=bartersFor,
+        bartersUsing=bartersUsing,
+        craftsFor=craftsFor,
+        craftsUsing=craftsUsing,
+        hideoutUpgradesUsing=hideoutUpgradesUsing,
+    )
+
+    applyPrices(item, itemData, pool)
+
+    return item
+
+
 async def fetchHideoutStations() -> list[HideoutStation]:
     hideoutQuery = """
     {
@@ -1018,29 +1327,54 @@ async def fetchHideoutStations() -> list[HideoutStation]:
     }
     """
     rawHideoutResponseData = await apiFetch(query=hideoutQuery)
-    parsedHideoutStations: list[HideoutStation] = []
 
     if (
         "data" in rawHideoutResponseData
         and "hideoutStations" in rawHideoutResponseData["data"]
     ):
-        for stationData in rawHideoutResponseData["data"]["hideoutStations"]:
-            station = HideoutStation(
-                id=stationData.get("id"),
-                name=stationData.get("name"),
-                slug=stationData.get("normalizedName"),
-                image=stationData.get("imageLink", ""),
-            )
+        return parseHideoutStations(
+            rawHideoutResponseData["data"]["hideoutStations"], EntityPool()
+        )
+
+    return []
+
+
+def parseHideoutStations(stationsData, pool: EntityPool) -> list[HideoutStation]:
+    parsedHideoutStations: list[HideoutStation] = []
+
+    for stationData in stationsData:
+        station = parseStation(stationData, pool)
 
-            station.levels = [
-                parseHideoutStationLevel(l, station=station)
-                for l in stationData.get("levels", [])
-            ]
-            parsedHideoutStations.append(station)
+        station.levels = [
+            parseHideoutStationLevel(l, station=station, pool=pool)
+            for l in stationData.get("levels", [])
+        ]
+        parsedHideoutStations.append(station)
 
     return parsedHideoutStations
 
 
+# Shared by every item search until it goes stale. The lock stops concurrent searches all refetching it.
+hideoutIndex: HideoutIndex | None = None
+hideoutIndexLock = asyncio.Lock()
+
+
+async def fetchHideoutIndex() -> HideoutIndex:
+    global hideoutIndex
+
+    async with hideoutIndexLock:
+        if hideoutIndex is None or hideoutIndex.isStale():
+            stations = await fetchHideoutStations()
+
+            # A failed fetch keeps serving the last good index rather than caching an empty one.
+            if not stations:
+                return hideoutIndex or HideoutIndex([])
+
+            hideoutIndex = HideoutIndex(stations)
+
+        return hideoutIndex
+
+
 async def fetchItems(
     itemQuery: str, byId: bool, limit: int = ITEM_SEARCH_QUERY_RETURN_LIMIT
 ) -> list[Item]:
@@ -1110,189 +1444,37 @@ async def fetchItems(
     }}
     """
 
-    rawItemResponseData, parsedHideoutStations = await asyncio.gather(
-        apiFetch(graphql_query), fetchHideoutStations()
+    rawItemResponseData, hideout = await asyncio.gather(
+        apiFetch(graphql_query), fetchHideoutIndex()
     )
 
-    requiredHideoutItemIDS = {
-        req.item.id
-        for station in parsedHideoutStations
-        for level in station.levels
-        for req in level.itemRequirements
-    }
-
     parsedItems = []
+    pool = EntityPool()
 
     if "data" in rawItemResponseData and "items" in rawItemResponseData["data"]:
         for itemData in rawItemResponseData["data"]["items"]:
-
-            categories = [parseCategory(c) for c in itemData.get("categories", [])]
-
-            basePrice = parseSimplePrice(itemData.get("basePrice"))
-            avg24hPrice = parseSimplePrice(itemData.get("avg24hPrice"))
-            low24hPrice = parseSimplePrice(itemData.get("low24hPrice"))
-            high24hPrice = parseSimplePrice(itemData.get("high24hPrice"))
-            changePrice48h = parseSimplePrice(itemData.get("changeLast48h"))
-
-            buys = [parseOffer(o) for o in itemData.get("buyFor", [])]
-
-            buys.sort(key=lambda o: o.price.priceRUB, reverse=True)
-
-            sells = [parseOffer(o) for o in itemData.get("sellFor", [])]
-
-            sells.sort(key=lambda o: o.price.priceRUB, reverse=True)
-
-            tasksUsed: list[SmallTask] = []
-            for t in itemData.get("usedInTasks", []):
-                mapName = t["map"]["name"] if t.get("map") else "Any"
-                tasksUsed.append(
-                    SmallTask(
-                        id=t["id"],
-                        name=t["name"],
-                        slug=t["normalizedName"],
-                        trader=parseTrader(t["trader"]),
-                        map=mapName,
-                        experience=t["experience"],
-                        wikiLink=t.get("wikiLink", ""),
-                        image=t.get("taskImageLink", ""),
-                        minPlayerLevel=t.get("minPlayerLevel", 0),
-                    )
-                )
-
-            tasksUsed.sort(key=lambda t: t.minPlayerLevel)
-
-            tasksReceived: list[SmallTask] = []
-            for t in itemData.get("receivedFromTasks", []):
-                mapName = t["map"]["name"] if t.get("map") else "Any"
-                tasksReceived.append(
-                    SmallTask(
-                        id=t["id"],
-                        name=t["name"],
-                        slug=t["normalizedName"],
-                        trader=parseTrader(t["trader"]),
-                        map=mapName,
-                        experience=t["experience"],
-                        wikiLink=t.get("wikiLink", ""),
-                        image=t.get("taskImageLink", ""),
-                        minPlayerLevel=t.get("minPlayerLevel", 0),
-                    )
-                )
-
-            tasksReceived.sort(key=lambda t: t.minPlayerLevel)
-
-            bartersFor = []
-            for b in itemData.get("bartersFor", []):
-                bartersFor.append(
-                    Barter(
-                        id=b["id"],
-                        trader=parseTrader(b["trader"]),
-                        level=b["level"],
-                        requiredItems=[parseNestedItem(x) for x in b["requiredItems"]],
-                        rewardItems=[parseNestedItem(x) for x in b["rewardItems"]],
-                        buyLimit=b["buyLimit"],
-                    )
-                )
-
-            bartersUsing = []
-            for b in itemData.get("bartersUsing", []):
-                bartersUsing.append(
-                    Barter(
-                        id=b["id"],
-                        trader=parseTrader(b["trader"]),
-                        level=b["level"],
-                        requiredItems=[parseNestedItem(x) for x in b["requiredItems"]],
-                        rewardItems=[parseNestedItem(x) for x in b["rewardItems"]],
-                        buyLimit=b["buyLimit"],
-                    )
-                )
-
-            craftsFor = []
-            for c in itemData.get("craftsFor", []):
-                stationData = c["station"]
-                station = HideoutStation(
-                    id=stationData["id"],
-                    name=stationData["name"],
-                    slug=stationData["normalizedName"],
-                    image=stationData["imageLink"],
-                )
-                craftsFor.append(
-                    Craft(
-                        id=c["id"],
-                        station=station,
-                        level=c["level"],
-                        duration=c["duration"],
-                        requiredItems=[parseNestedItem(x) for x in c["requiredItems"]],
-                        rewardItems=[parseNestedItem(x) for x in c["rewardItems"]],
-                    )
-                )
-
-            craftsUsing = []
-            for c in itemData.get("craftsUsing", []):
-                stationData = c["station"]
-                station = HideoutStation(
-                    id=stationData["id"],
-                    name=stationData["name"],
-                    slug=stationData["normalizedName"],
-                    image=stationData["imageLink"],
-                )
-                craftsUsing.append(
-                    Craft(
-                        id=c["id"],
-                        station=station,
-                        level=c["level"],
-                        duration=c["duration"],
-                        requiredItems=[parseNestedItem(x) for x in c["requiredItems"]],
-                        rewardItems=[parseNestedItem(x) for x in c["rewardItems"]],
-                    )
-                )
-
-            lastUpdateStr = itemData.get("updated")
-            lastUpdate = (
-                dates.simpleDateObj(lastUpdateStr)
-                if lastUpdateStr
-                else dates.simpleDateObj(timeNow=True)
+            itemObj = parseItem(
+                itemData,
+                pool,
+                tasksUsed=[
+                    parseTask(t, pool) for t in itemData.get("usedInTasks", [])
+                ],
+                tasksReceived=[
+                    parseTask(t, pool) for t in itemData.get("receivedFromTasks", [])
+                ],
+                bartersFor=[
+                    parseBarter(b, pool) for b in itemData.get("bartersFor", [])
+                ],
+                bartersUsing=[
+                    parseBarter(b, pool) for b in itemData.get("bartersUsing", [])
+                ],
+                craftsFor=[parseCraft(c, pool) for c in itemData.get("craftsFor", [])],
+                craftsUsing=[
+                    parseCraft(c, pool) for c in itemData.get("craftsUsing", [])
+                ],
+                hideoutUpgradesUsing=hideout.upgradesUsing(itemData["id"]),
             )
 
-            itemObj = Item(
-                id=itemData["id"],
-                name=itemData["name"],
-                shortName=itemData.get("shortName", itemData["name"]),
-                slug=itemData["normalizedName"],
-                description=itemData.get("description", ""),
-                weight=itemData.get("weight", ""),
-                height=itemData.get("height", ""),
-                width=itemData.get("width", ""),
-                categories=categories,
-                basePrice=basePrice,
-                avg24hPrice=avg24hPrice,
-                low24hPrice=low24hPrice,
-                high24hPrice=high24hPrice,
-                change48hPrice=changePrice48h,
-                change48hPercent=itemData.get("changeLast48hPercent") or 0.0,
-                buys=buys,
-                sells=sells,
-                lastUpdate=lastUpdate,
-                gridImage=itemData.get("gridImageLink", ""),
-                itemImage=itemData.get("image512pxLink", ""),
-                inspectImage=itemData.get("inspectImageLink", ""),
-                wikiLink=itemData.get("wikiLink", ""),
-                apiLink=itemData.get("link", ""),
-                tasksUsed=tasksUsed,
-                tasksRecieved=tasksReceived,
-                bartersFor=bartersFor,
-                bartersUsing=bartersUsing,
-                craftsFor=craftsFor,
-                craftsUsing=craftsUsing,
-                hideoutUpgradesUsing=None,
-            )
-
-            itemObj.hideoutUpgradesUsing = [
-                level
-                for station in parsedHideoutStations
-                for level in station.levels
-                if any(req.item.id == itemObj.id for req in level.itemRequirements)
-            ]
-
             parsedItems.append(itemObj)
 
     return parsedItems
@@ -0,0 +1,417 @@
+import asyncio
+import bisect
+import json
+import os
+import re
+import time
+
+from rapidfuzz import fuzz
+from rapidfuzz import utils as fuzzUtils
+
+from src.utils import db
+from src.utils import tarkov
+from src.utils import text
+
+# A local copy of every item on tarkov.dev, so item searches don't wait on a large GraphQL query.
+# Everything is bulk downloaded on a long interval and prices are refreshed on a short one. Each full
+# download is saved as a JSON snapshot, which is loaded on startup and can stand in for the API entirely.
+FULL_REFRESH_HOURS = 6
+PRICE_REFRESH_MINUTES = 10
+# Until a catalogue has loaded at all, a failed full refresh is retried this often instead.
+FAILED_REFRESH_RETRY_MINUTES = 2
+# The bulk queries return several MB, far more than the shared HTTP session's default timeout allows for.
+BULK_FETCH_TIMEOUT = 300
+
+SNAPSHOT_PATH = os.getenv(
+    "TARKOV_CATALOGUE_SNAPSHOT", os.path.join(db.DATA_PATH, "tarkovCatalogue.json")
+)
+# Serve only the snapshot and never call the API. For tests and running without network access.
+OFFLINE = os.getenv("TARKOV_CATALOGUE_OFFLINE", "").lower() in ("1", "true", "yes")
+
+ITEM_REF = "{ item { id } count quantity }"
+
+PRICE_FIELDS = """
+    id
+    basePrice
+    avg24hPrice
+    low24hPrice
+    high24hPrice
+    changeLast48h
+    changeLast48hPercent
+    buyFor { vendor { name normalizedName } price priceRUB currency }
+    sellFor { vendor { name normalizedName } price priceRUB currency }
+    updated
+"""
+
+# Tasks, barters and crafts are only referenced by ID here and joined from their own queries below,
+# instead of being repeated under every item that uses them.
+ITEMS_QUERY = f"""
+{{
+    items(lang: en) {{
+        {PRICE_FIELDS}
+        name
+        shortName
+        normalizedName
+        description
+        height
+        width
+        weight
+        categories {{ id name normalizedName }}
+        image512pxLink
+        gridImageLink
+        inspectImageLink
+        wikiLink
+        link
+        usedInTasks {{ id }}
+        receivedFromTasks {{ id }}
+        bartersFor {{ id }}
+        bartersUsing {{ id }}
+        craftsFor {{ id }}
+        craftsUsing {{ id }}
+    }}
+}}
+"""
+
+PRICES_QUERY = f"""
+{{
+    items(lang: en) {{
+        {PRICE_FIELDS}
+    }}
+}}
+"""
+
+TASKS_QUERY = """
+{
+    tasks(lang: en) {
+        id name normalizedName
+        trader { name description image4xLink }
+        map { name }
+        experience wikiLink taskImageLink minPlayerLevel
+    }
+}
+"""
+
+BARTERS_QUERY = f"""
+{{
+    barters(lang: en) {{
+        id trader {{ name description image4xLink }} level
+        requiredItems {ITEM_REF}
+        rewardItems {ITEM_REF}
+        buyLimit
+    }}
+}}
+"""
+
+CRAFTS_QUERY = f"""
+{{
+    crafts(lang: en) {{
+        id station {{ id name normalizedName imageLink }} level duration
+        requiredItems {ITEM_REF}
+        rewardItems {ITEM_REF}
+    }}
+}}
+"""
+
+HIDEOUT_QUERY = f"""
+{{
+    hideoutStations(lang: en) {{
+        id
+        name
+        normalizedName
+        imageLink
+        levels {{
+            id
+            description
+            level
+            constructionTime
+            itemRequirements {ITEM_REF}
+        }}
+    }}
+}}
+"""
+
+SNAPSHOT_QUERIES = {
+    "items": ITEMS_QUERY,
+    "tasks": TASKS_QUERY,
+    "barters": BARTERS_QUERY,
+    "crafts": CRAFTS_QUERY,
+    "hideoutStations": HIDEOUT_QUERY,
+}
+
+# Lowest fuzzy score (0-100) for a typo'd query to still match a name.
+FUZZY_SCORE_CUTOFF = 70
+AUTOCOMPLETE_LIMIT = 25
+
+
+class SearchIndex:
+    """
+    Ranked name search over every item's name, short name and slug, built once per catalogue.
+    Queries match as substrings first ("ledx", "gpu", "graphics"), then fuzzily to catch typos.
+    """
+
+    def __init__(self, items: list[tarkov.Item]):
+        self.choices: list[str] = []
+        self.choiceItemIDs: list[str] = []
+
+        for item in items:
+            names = {
+                fuzzUtils.default_process(name)
+                for name in (item.name, item.shortName, item.slug)
+            }
+
+            for name in names:
+                if name:
+                    self.choices.append(name)
+                    self.choiceItemIDs.append(item.id)
+
+        # Every choice on its own line of one string, so substring matches are found by a single
+        # regex scan in C instead of a Python loop over every name. offsets maps a match back to its choice.
+        self.blob = "\n".join(self.choices)
+        self.offsets: list[int] = []
+
+        offset = 0
+
+        for choice in self.choices:
+            self.offsets.append(offset)
+
+            offset += len(choice) + 1
+
+    def substringMatches(self, terms: list[str]) -> dict[int, float]:
+        """Choices containing every term, scored by how much of the choice the query covers."""
+        matches = {}
+        coverage = sum(len(term) for term in terms)
+
+        # Only the longest term is scanned for, the rest are checked on its (far fewer) hits.
+        for match in re.finditer(re.escape(max(terms, key=len)), self.blob):
+            index = bisect.bisect_right(self.offsets, match.start()) - 1
+
+            if index in matches:
+                continue
+
+            choice = self.choices[index]
+
+            if all(term in choice for term in terms):
+                matches[index] = 100 * min(coverage / len(choice), 1)
+
+        return matches
+
+    def search(self, query: str, limit: int) -> list[str]:
+        """Item IDs best matching the query, best first."""
+        query = fuzzUtils.default_process(query)
+        terms = query.split()
+
+        if not terms:
+            return []
+
+        # itemID: (rank, score). Exact names rank above substring matches, which rank above fuzzy ones.
+        best: dict[str, tuple[int, float]] = {}
+
+        def consider(index: int, rank: int, score: float):
+            itemID = self.choiceItemIDs[index]
+            candidate = (rank, score)
+
+            if itemID not in best or candidate > best[itemID]:
+                best[itemID] = candidate
+
+        for index, score in self.substringMatches(terms).items():
+            consider(index, 2 if self.choices[index] == query else 1, score)
+
+        for _, score, index in text.fuzzySearch(
+            query,
+            self.choices,
+            limit=limit,
+            scoreCutoff=FUZZY_SCORE_CUTOFF,
+            scorer=fuzz.QRatio,
+        ):
+            consider(index, 0, score)
+
+        ranked = sorted(best, key=best.get, reverse=True)
+
+        return ranked[:limit]
+
+
+class Catalogue:
+    """Every item, fully linked to its tasks, barters, crafts and hideout levels, built from a snapshot."""
+
+    def __init__(self, snapshot: dict):
+        self.fetchedAt: float = snapshot["fetchedAt"]
+        self.pricesFetchedAt: float = snapshot.get("pricesFetchedAt", self.fetchedAt)
+
+        # Interned traders, vendors, stations, categories and small items. Every item is added up front so
+        # barters, crafts and hideout levels, which only reference items by ID, share the same objects.
+        self.pool = tarkov.EntityPool()
+
+        for itemData in snapshot["items"]:
+            tarkov.parseSmallItem(itemData, self.pool)
+
+        self.tasks = {
+            t["id"]: tarkov.parseTask(t, self.pool) for t in snapshot["tasks"]
+        }
+        self.barters = {
+            b["id"]: tarkov.parseBarter(b, self.pool) for b in snapshot["barters"]
+        }
+        self.crafts = {
+            c["id"]: tarkov.parseCraft(c, self.pool) for c in snapshot["crafts"]
+        }
+        self.hideout = tarkov.HideoutIndex(
+            tarkov.parseHideoutStations(snapshot["hideoutStations"], self.pool)
+        )
+
+        self.items: dict[str, tarkov.Item] = {}
+
+        for itemData in snapshot["items"]:
+            item = tarkov.parseItem(
+                itemData,
+                self.pool,
+                tasksUsed=self.lookup(self.tasks, itemData.get("usedInTasks")),
+                tasksReceived=self.lookup(
+                    self.tasks, itemData.get("receivedFromTasks")
+                ),
+                bartersFor=self.lookup(self.barters, itemData.get("bartersFor")),
+                bartersUsing=self.lookup(self.barters, itemData.get("bartersUsing")),
+                craftsFor=self.lookup(self.crafts, itemData.get("craftsFor")),
+                craftsUsing=self.lookup(self.crafts, itemData.get("craftsUsing")),
+                hideoutUpgradesUsing=self.hideout.upgradesUsing(itemData["id"]),
+            )
+
+            self.items[item.id] = item
+
+        self.searchIndex = SearchIndex(list(self.items.values()))
+
+    @staticmethod
+    def lookup(entities: dict, refs: list[dict] | None) -> list:
+        return [entities[ref["id"]] for ref in refs or [] if ref["id"] in entities]
+
+    def applyPrices(self, pricesData: list[dict], fetchedAt: float) -> None:
+        for itemData in pricesData:
+            item = self.items.get(itemData["id"])
+
+            if item is not None:
+                tarkov.applyPrices(item, itemData, self.pool)
+
+        self.pricesFetchedAt = fetchedAt
+
+    def search(
+        self,
+        itemQuery: str,
+        byId: bool = False,
+        limit: int = tarkov.ITEM_SEARCH_QUERY_RETURN_LIMIT,
+    ) -> list[tarkov.Item]:
+        """Items best matching the query, or the item with that exact ID if byId."""
+        if byId:
+            item = self.items.get(itemQuery.strip())
+
+            return [item] if item else []
+
+        return [
+            self.items[itemID] for itemID in self.searchIndex.search(itemQuery, limit)
+        ]
+
+
+catalogue: Catalogue | None = None
+
+
+async def fetchSnapshot() -> dict:
+    """Bulk downloads everything the catalogue is built from."""
+    responses = await asyncio.gather(
+        *(
+            tarkov.apiFetch(query, timeout=BULK_FETCH_TIMEOUT)
+            for query in SNAPSHOT_QUERIES.values()
+        )
+    )
+
+    snapshot = {"fetchedAt": time.time()}
+
+    for key, response in zip(SNAPSHOT_QUERIES, responses):
+        if "data" not in response or response["data"].get(key) is None:
+            raise Exception(f"tarkov.dev returned no {key}: {response.get("errors")}")
+
+        snapshot[key] = response["data"][key]
+
+    return snapshot
+
+
+def readSnapshot() -> dict | None:
+    if not os.path.exists(SNAPSHOT_PATH):
+        return None
+
+    with open(SNAPSHOT_PATH, "r", encoding="utf-8") as snapshotFile:
+        return json.load(snapshotFile)
+
+
+def writeSnapshot(snapshot: dict) -> None:
+    # Written beside the old snapshot and swapped in, so a crash mid-write never leaves a broken file.
+    temporaryPath = f"{SNAPSHOT_PATH}.tmp"
+
+    with open(temporaryPath, "w", encoding="utf-8") as snapshotFile:
+        json.dump(snapshot, snapshotFile, separators=(",", ":"))
+
+    os.replace(temporaryPath, SNAPSHOT_PATH)
+
+
+async def loadSnapshot() -> bool:
+    """Builds the catalogue from the snapshot on disk, if there is one. Returns whether it was loaded."""
+    global catalogue
+
+    loop = asyncio.get_running_loop()
+
+    snapshot = await loop.run_in_executor(None, readSnapshot)
+
+    if snapshot is None:
+        return False
+
+    catalogue = await loop.run_in_executor(None, Catalogue, snapshot)
+
+    return True
+
+
+async def refreshCatalogue() -> None:
+    """Downloads a fresh snapshot, rebuilds the catalogue from it and saves it to disk."""
+    global catalogue
+
+    loop = asyncio.get_running_loop()
+
+    snapshot = await fetchSnapshot()
+
+    # Building thousands of linked objects is CPU bound, so it's kept off the event loop.
+    catalogue = await loop.run_in_executor(None, Catalogue, snapshot)
+
+    await loop.run_in_executor(None, writeSnapshot, snapshot)
+
+
+async def refreshPrices() -> None:
+    """Updates prices on the existing catalogue. Much lighter than a full refresh."""
+    if catalogue is None:
+        return
+
+    fetchedAt = time.time()
+
+    response = await tarkov.apiFetch(PRICES_QUERY, timeout=BULK_FETCH_TIMEOUT)
+
+    if "data" not in response or response["data"].get("items") is None:
+        raise Exception(f"tarkov.dev returned no prices: {response.get("errors")}")
+
+    loop = asyncio.get_running_loop()
+
+    await loop.run_in_executor(
+        None, catalogue.applyPrices, response["data"]["items"], fetchedAt
+    )
+
+
+def search(
+    itemQuery: str, byId: bool = False, limit: int = tarkov.ITEM_SEARCH_QUERY_RETURN_LIMIT
+) -> list[tarkov.Item] | None:
+    """Searches the local catalogue. Returns None while it hasn't been loaded yet."""
+    if catalogue is None:
+        return None
+
+    return catalogue.search(itemQuery, byId, limit)
+
+
+def autocomplete(itemQuery: str, limit: int = AUTOCOMPLETE_LIMIT) -> list[str]:
+    """Item names for an autocomplete dropdown. Empty while the catalogue hasn't been loaded yet."""
+    if catalogue is None or not itemQuery.strip():
+        return []
+
+    # Discord caps choice names at 100 characters.
+    return [item.name[:100] for item in catalogue.search(itemQuery, limit=limit)]
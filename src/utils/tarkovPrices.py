@@ -0,0 +1,242 @@
+import asyncio
+import datetime
+import time
+
+from io import BytesIO
+
+from src.utils import db
+from src.utils import tarkov
+
+# Flea market price history, sampled from the catalogue every time its prices are refreshed.
+# Samples are kept hourly for HOURLY_RETENTION_DAYS, then rolled up into one row per item per day.
+DATABASE = "tarkovPrices.db"
+
+HOURLY_RETENTION_DAYS = 7
+HISTORY_MAX_DAYS = 365
+
+# Item IDs are 24 character strings, so every sample refers to a small integer key instead.
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS priceItems (
+        itemKey INTEGER PRIMARY KEY,
+        itemID TEXT NOT NULL UNIQUE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS hourlyPrices (
+        itemKey INTEGER NOT NULL,
+        hour INTEGER NOT NULL,
+        avg24h INTEGER,
+        low24h INTEGER,
+        high24h INTEGER,
+        PRIMARY KEY (itemKey, hour)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dailyPrices (
+        itemKey INTEGER NOT NULL,
+        day INTEGER NOT NULL,
+        avg24h INTEGER,
+        low24h INTEGER,
+        high24h INTEGER,
+        PRIMARY KEY (itemKey, day)
+    ) WITHOUT ROWID
+    """,
+]
+
+schemaReady = False
+
+# itemID: itemKey, for keys that have been committed. Only touched from the db writer thread.
+itemKeys: dict[str, int] = {}
+
+lastDownsampledDay: int | None = None
+
+
+def ensureSchema() -> None:
+    global schemaReady
+
+    if schemaReady:
+        return
+
+    with db.pooledCursor(DATABASE, commit=True) as cursor:
+        for statement in SCHEMA:
+            cursor.execute(statement)
+
+        # Items off the flea market used to be sampled with an average of 0, which only charts a flat line.
+        cursor.execute("DELETE FROM hourlyPrices WHERE avg24h = 0")
+        cursor.execute("DELETE FROM dailyPrices WHERE avg24h = 0")
+
+    schemaReady = True
+
+
+def priceValue(price: tarkov.ItemPrice | None) -> int | None:
+    return price.price if price else None
+
+
+def collectSamples(items: list[tarkov.Item]) -> list[tuple]:
+    """(itemID, avg24h, low24h, high24h) for every item that's on the flea market."""
+    return [
+        (
+            item.id,
+            priceValue(item.avg24hPrice),
+            priceValue(item.low24hPrice),
+            priceValue(item.high24hPrice),
+        )
+        for item in items
+        # Items that aren't on the flea market still have an ItemPrice, just with a price of 0.
+        if item.avg24hPrice and item.avg24hPrice.price
+    ]
+
+
+def keysFor(cursor, itemIDs: list[str]) -> dict[str, int]:
+    """
+    Keys for every item, adding new items to priceItems. The result is only copied into itemKeys
+    once the caller's transaction commits, since a rollback would free the new keys for reuse.
+    """
+    if not itemKeys:
+        cursor.execute("SELECT itemID, itemKey FROM priceItems")
+
+        itemKeys.update(cursor.fetchall())
+
+    missing = [(itemID,) for itemID in itemIDs if itemID not in itemKeys]
+
+    if not missing:
+        return itemKeys
+
+    cursor.executemany("INSERT OR IGNORE INTO priceItems (itemID) VALUES (?)", missing)
+    cursor.execute("SELECT itemID, itemKey FROM priceItems")
+
+    return dict(cursor.fetchall())
+
+
+def writeSamples(samples: list[tuple], sampledAt: float) -> int:
+    """
+    Appends one hourly sample per item. The catalogue's prices refresh more often than hourly,
+    so only the first refresh in each hour is kept. Returns how many samples were written.
+    """
+    ensureSchema()
+
+    hour = int(sampledAt // 3600)
+
+    with db.pooledCursor(DATABASE, commit=True) as cursor:
+        keys = keysFor(cursor, [sample[0] for sample in samples])
+
+        cursor.executemany(
+            "INSERT OR IGNORE INTO hourlyPrices (itemKey, hour, avg24h, low24h, high24h) VALUES (?, ?, ?, ?, ?)",
+            [(keys[itemID], hour, *prices) for itemID, *prices in samples],
+        )
+
+        written = cursor.rowcount
+
+    # Committed, so any new keys are safe to reuse.
+    if keys is not itemKeys:
+        itemKeys.update(keys)
+
+    return written
+
+
+def downsample(now: float) -> int:
+    """Rolls hourly samples older than HOURLY_RETENTION_DAYS into daily rows. Only whole days are rolled up."""
+    ensureSchema()
+
+    cutoffHour = (int(now // 86400) - HOURLY_RETENTION_DAYS) * 24
+
+    with db.pooledCursor(DATABASE, commit=True) as cursor:
+        cursor.execute(
+            """
+            INSERT OR REPLACE INTO dailyPrices (itemKey, day, avg24h, low24h, high24h)
+            SELECT itemKey, hour / 24, CAST(ROUND(AVG(avg24h)) AS INTEGER), MIN(low24h), MAX(high24h)
+            FROM hourlyPrices
+            WHERE hour < ?
+            GROUP BY itemKey, hour / 24
+            """,
+            (cutoffHour,),
+        )
+        cursor.execute("DELETE FROM hourlyPrices WHERE hour < ?", (cutoffHour,))
+
+        return cursor.rowcount
+
+
+async def recordPrices(items: list[tarkov.Item], sampledAt: float) -> int:
+    """Records the current prices of every item, and downsamples old history once a day."""
+    global lastDownsampledDay
+
+    loop = asyncio.get_running_loop()
+
+    written = await loop.run_in_executor(
+        db.writerExecutor(), writeSamples, collectSamples(items), sampledAt
+    )
+
+    today = int(sampledAt // 86400)
+
+    if lastDownsampledDay != today:
+        await loop.run_in_executor(db.writerExecutor(), downsample, sampledAt)
+
+        lastDownsampledDay = today
+
+    return written
+
+
+def readHistory(itemID: str, days: int) -> list[tuple]:
+    """An item's (timestamp, avg24h, low24h, high24h) samples from the last `days` days, oldest first."""
+    since = time.time() - days * 86400
+
+    return db.readQuery(
+        DATABASE,
+        """
+        SELECT day * 86400, avg24h, low24h, high24h FROM dailyPrices
+        WHERE itemKey = (SELECT itemKey FROM priceItems WHERE itemID = ?) AND day >= ?
+        UNION ALL
+        SELECT hour * 3600, avg24h, low24h, high24h FROM hourlyPrices
+        WHERE itemKey = (SELECT itemKey FROM priceItems WHERE itemID = ?) AND hour >= ?
+        ORDER BY 1
+        """,
+        (itemID, int(since // 86400), itemID, int(since // 3600)),
+    )
+
+
+async def fetchHistory(itemID: str, days: int) -> list[tuple]:
+    loop = asyncio.get_running_loop()
+
+    # Reader connections are read-only, so the tables are created on the writer first if nothing has been recorded yet.
+    await loop.run_in_executor(db.writerExecutor(), ensureSchema)
+
+    return await loop.run_in_executor(db.readerExecutor(), readHistory, itemID, days)
+
+
+def renderChart(itemName: str, history: list[tuple]) -> BytesIO:
+    """Plots the 24h average with the 24h low-high range shaded behind it. Returns a PNG."""
+    # Imported on first use, matplotlib is slow to import. Figure is used directly rather than
+    # pyplot, which keeps global state and isn't safe to use from the executor's threads.
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import FuncFormatter
+
+    nan = float("nan")
+
+    times = [
+        datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+        for timestamp, *_ in history
+    ]
+    averages = [nan if avg is None else avg for _, avg, _, _ in history]
+    lows = [nan if low is None else low for _, _, low, _ in history]
+    highs = [nan if high is None else high for _, _, _, high in history]
+
+    figure = Figure(figsize=(10, 5), dpi=100)
+    axes = figure.subplots()
+
+    axes.fill_between(times, lows, highs, alpha=0.25, label="24h Low - High")
+    axes.plot(times, averages, linewidth=2, label="24h Average")
+
+    axes.set_title(f"{itemName} - Flea Market Price")
+    axes.yaxis.set_major_formatter(FuncFormatter(lambda value, _: f"₽ {value:,.0f}"))
+    axes.grid(alpha=0.3)
+    axes.legend(loc="upper left")
+
+    figure.autofmt_xdate()
+
+    buffer = BytesIO()
+
+    figure.savefig(buffer, format="png", bbox_inches="tight")
+    buffer.seek(0)
+
+    return buffer
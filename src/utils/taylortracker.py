@@ -0,0 +1,248 @@
+import asyncio
+import datetime
+import os
+import random
+import time
+
+import telethon
+
+from src.classes import *
+from src.utils import broadcast
+
+TELEGRAM_API_ID = os.getenv("TELEGRAM_API_ID")
+TELEGRAM_API_HASH = os.getenv("TELEGRAM_API_HASH")
+TELEGRAM_PHONE = os.getenv("TELEGRAM_PHONE")
+TELEGRAM_PASSWORD = os.getenv("TELEGRAM_PASSWORD")
+
+# "telegram" for the real feed, "stub" for an in-process source that is fed by hand (tests and local runs).
+TRACKER_SOURCE = os.getenv("TAYLORTRACKER_SOURCE", "telegram")
+
+CHAT_IDS = [2487799389, 1960735023]
+
+DB_TABLE_NAME = "taylortracker"
+
+# Reconnect policy for the supervisor. Backoff doubles per failed attempt up to the max, and resets
+# once a connection has stayed up for STABLE_CONNECTION_SECONDS.
+RECONNECT_BACKOFF_BASE = 5
+RECONNECT_BACKOFF_MAX = 300
+STABLE_CONNECTION_SECONDS = 600
+
+# Channels enrolled in tracker updates. Loaded from the database once and then kept in step by
+# subscribe() and unsubscribe(), so handling a post never touches the disk. None until loaded.
+subscribers: set[int] | None = None
+
+
+class TrackerUpdate:
+    """A post from the tracker feed, independent of where it came from."""
+
+    def __init__(
+        self,
+        text: str | None,
+        date: datetime.datetime | None,
+        mediaPath: str | None = None,
+    ):
+        self.text = text
+        self.date = date
+        self.mediaPath = mediaPath
+
+    async def readMedia(self) -> broadcast.Media | None:
+        """Reads the post's media into memory, or returns None if it has none."""
+        if not self.mediaPath:
+            return None
+
+        with open(self.mediaPath, "rb") as media:
+            return broadcast.Media(media.read(), os.path.basename(self.mediaPath))
+
+
+class TelegramUpdate(TrackerUpdate):
+    def __init__(self, message: telethon.types.Message):
+        super().__init__(message.message, message.date)
+
+        self.message = message
+
+    async def readMedia(self) -> broadcast.Media | None:
+        if self.message.file is None:
+            return None
+
+        data = await self.message.download_media(file=bytes)
+
+        if not data:
+            return None
+
+        return broadcast.Media(
+            data, self.message.file.name or f"media{self.message.file.ext or ""}"
+        )
+
+
+class TelegramSource:
+    """Listens to the tracker channels over Telegram. run() returns when the client disconnects."""
+
+    name = "Telegram"
+
+    def __init__(self):
+        self.client: telethon.TelegramClient | None = None
+
+    async def run(self, onUpdate) -> None:
+        # Built here rather than in the cog so the client binds to the bot's running event loop.
+        self.client = telethon.TelegramClient(
+            "taylortracker", TELEGRAM_API_ID, TELEGRAM_API_HASH
+        )
+
+        async def newMessage(event):
+            message: telethon.types.Message = event.message
+
+            sender: telethon.types.Channel = await message.get_sender()
+
+            if sender.id not in CHAT_IDS:
+                return
+
+            await onUpdate(TelegramUpdate(message))
+
+        try:
+            started = time.perf_counter()
+
+            await self.client.start(TELEGRAM_PHONE, TELEGRAM_PASSWORD)
+
+            print(
+                f"TaylorTracker connected to Telegram in {time.perf_counter() - started:.2f}s."
+            )
+
+            self.client.add_event_handler(newMessage, telethon.events.NewMessage)
+
+            await self.client.run_until_disconnected()
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        if self.client is not None:
+            await self.client.disconnect()
+
+        self.client = None
+
+
+class StubSource:
+    """An in-process stand-in for Telegram. Updates passed to push() are delivered as if they'd been posted."""
+
+    name = "Stub"
+
+    def __init__(self):
+        self.queue: asyncio.Queue | None = None
+
+    def push(self, update: TrackerUpdate) -> None:
+        if self.queue is None:
+            self.queue = asyncio.Queue()
+
+        self.queue.put_nowait(update)
+
+    async def run(self, onUpdate) -> None:
+        if self.queue is None:
+            self.queue = asyncio.Queue()
+
+        while True:
+            update = await self.queue.get()
+
+            # A bad update shouldn't restart the source, the same as telethon does for its event handlers.
+            try:
+                await onUpdate(update)
+            except Exception as e:
+                print(f"TaylorTracker failed to handle a stub update: {e}")
+
+    async def close(self) -> None:
+        pass
+
+
+async def loadSubscribers() -> set[int]:
+    global subscribers
+
+    rows = await LocalDatabase().aget(f"SELECT receivingChannel FROM {DB_TABLE_NAME}")
+
+    subscribers = {row[0] for row in rows}
+
+    return subscribers
+
+
+async def getSubscribers() -> set[int]:
+    if subscribers is None:
+        return await loadSubscribers()
+
+    return subscribers
+
+
+def invalidateSubscribers() -> None:
+    """Drops the in-memory list so the next lookup reloads it. For writes that bypass subscribe()/unsubscribe()."""
+    global subscribers
+
+    subscribers = None
+
+
+async def subscribe(channelID: int) -> bool:
+    """Enrolls a channel. Returns False if it was already enrolled."""
+    if channelID in await getSubscribers():
+        return False
+
+    await LocalDatabase().aset(
+        f"INSERT INTO {DB_TABLE_NAME} (receivingChannel) VALUES (?)", (channelID,)
+    )
+
+    (await getSubscribers()).add(channelID)
+
+    return True
+
+
+async def unsubscribe(channelID: int) -> bool:
+    """Un-enrolls a channel. Returns False if it wasn't enrolled."""
+    if channelID not in await getSubscribers():
+        return False
+
+    await LocalDatabase().aset(
+        f"DELETE FROM {DB_TABLE_NAME} WHERE receivingChannel = ?", (channelID,)
+    )
+
+    (await getSubscribers()).discard(channelID)
+
+    return True
+
+
+def createSource() -> TelegramSource | StubSource:
+    if TRACKER_SOURCE.lower() == "stub":
+        return StubSource()
+
+    return TelegramSource()
+
+
+def reconnectDelay(attempt: int) -> float:
+    return min(
+        RECONNECT_BACKOFF_BASE * (2**attempt), RECONNECT_BACKOFF_MAX
+    ) * random.uniform(0.8, 1.2)
+
+
+async def supervise(source: TelegramSource | StubSource, onUpdate) -> None:
+    """
+    Keeps source running for the life of the bot. Whenever it fails or disconnects, it is
+    restarted after an exponential backoff. Runs until the task is cancelled.
+    """
+    attempt = 0
+
+    while True:
+        started = time.monotonic()
+
+        try:
+            await source.run(onUpdate)
+
+            print(f"TaylorTracker {source.name} source disconnected.")
+        except asyncio.CancelledError:
+            await source.close()
+
+            raise
+        except Exception as e:
+            print(f"TaylorTracker {source.name} source failed: {e}")
+
+        if time.monotonic() - started >= STABLE_CONNECTION_SECONDS:
+            attempt = 0
+
+        delay = reconnectDelay(attempt)
+        attempt += 1
+
+        print(f"TaylorTracker reconnecting in {delay:.0f}s.")
+
+        await asyncio.sleep(delay)
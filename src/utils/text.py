@@ -1,5 +1,5 @@
 from uuid import uuid4
-from rapidfuzz import process
+from rapidfuzz import fuzz, process
 
 from src import constants
 
@@ -91,10 +91,20 @@ def ordinal(n: int) -> str:
 
 
 def fuzzySearch(
-    query: str, choices, limit: int | None = 1, scoreCutoff: float | None = None
+    query: str,
+    choices,
+    limit: int | None = 1,
+    scoreCutoff: float | None = None,
+    scorer=fuzz.WRatio,
+    processor=None,
 ) -> list[tuple]:
     results = process.extract(
-        query=query, choices=choices, limit=limit, score_cutoff=scoreCutoff
+        query=query,
+        choices=choices,
+        limit=limit,
+        score_cutoff=scoreCutoff,
+        scorer=scorer,
+        processor=processor,
     )
 
     return results
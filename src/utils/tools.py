@@ -1,5 +1,6 @@
 import os
-import aiohttp
+
+from src.utils import httpClient
 
 URL_SHORTENER_NAME = "Shlink"
 URL_SHORTENER_BASE_API_URL = "https://breia.net"
@@ -54,13 +55,14 @@ async def shortenURL(
     if path_prefix:
         body["pathPrefix"] = path_prefix
 
-    async with aiohttp.ClientSession() as session:
-        async with session.post(reqURL, headers=headers, json=body) as response:
-            result = await response.json()
-            if response.status in [200, 201]:
-                return result
-            else:
-                raise Exception(f"API Error: {result.get('detail', 'Unknown error')}")
+    async with httpClient.request(
+        "POST", reqURL, headers=headers, json=body
+    ) as response:
+        result = await response.json()
+        if response.status in [200, 201]:
+            return result
+        else:
+            raise Exception(f"API Error: {result.get('detail', 'Unknown error')}")
 
 
 async def deleteShortURL(short_code, domain=None):
@@ -74,11 +76,12 @@ async def deleteShortURL(short_code, domain=None):
 
     headers = {"X-Api-Key": URL_SHORTENER_API_KEY, "Accept": "application/json"}
 
-    async with aiohttp.ClientSession() as session:
-        async with session.delete(url, headers=headers, params=params) as response:
-            if response.status == 204:
-                return True
+    async with httpClient.request(
+        "DELETE", url, headers=headers, params=params
+    ) as response:
+        if response.status == 204:
+            return True
 
-            # If it's not success, grab the error body for the Exception
-            error_data = await response.json()
-            raise Exception(error_data.get("detail", "Unknown error occurred"))
+        # If it's not success, grab the error body for the Exception
+        error_data = await response.json()
+        raise Exception(error_data.get("detail", "Unknown error occurred"))
@@ -0,0 +1,76 @@
+import asyncio
+import json
+import os
+import unittest
+
+from src.utils import tarkovCatalogue
+
+# A trimmed tarkov.dev snapshot, so the catalogue can be built and searched without network access.
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "tarkovCatalogue.json")
+
+LEDX_ID = "5c0530ee86f774697952d952"
+SALEWA_ID = "544fb45d4bdc2dee738b4568"
+
+
+def loadFixture() -> dict:
+    with open(FIXTURE_PATH, "r", encoding="utf-8") as fixtureFile:
+        return json.load(fixtureFile)
+
+
+class CatalogueTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.catalogue = tarkovCatalogue.Catalogue(loadFixture())
+
+    def test_search_by_name(self):
+        self.assertEqual(self.catalogue.search("ledx")[0].id, LEDX_ID)
+        self.assertEqual(self.catalogue.search("graphics")[0].name, "Graphics card")
+
+    def test_search_tolerates_typos(self):
+        self.assertEqual(self.catalogue.search("grafics card")[0].name, "Graphics card")
+
+    def test_search_by_id(self):
+        self.assertEqual(self.catalogue.search(f" {SALEWA_ID} ", byId=True)[0].name, "Salewa first aid kit")
+        self.assertEqual(self.catalogue.search("not-an-id", byId=True), [])
+
+    def test_items_are_linked(self):
+        ledx = self.catalogue.items[LEDX_ID]
+        salewa = self.catalogue.items[SALEWA_ID]
+
+        self.assertEqual([barter.trader.name for barter in ledx.bartersUsing], ["Therapist"])
+        self.assertEqual([task.name for task in salewa.tasksUsed], ["Ambulances Again"])
+        self.assertIs(salewa.bartersFor[0], ledx.bartersUsing[0])
+
+    def test_hideout_upgrades_using(self):
+        # LEDX is listed twice in the same level, which should still count as one upgrade.
+        levels = self.catalogue.hideout.upgradesUsing(LEDX_ID)
+
+        self.assertEqual([(level.station.name, level.level) for level in levels], [("Medstation", 3)])
+        self.assertEqual([level.level for level in self.catalogue.hideout.upgradesUsing(SALEWA_ID)], [1, 3])
+        self.assertEqual(self.catalogue.hideout.upgradesUsing("not-an-id"), [])
+
+
+class ModuleTests(unittest.TestCase):
+    def setUp(self):
+        self.previous = tarkovCatalogue.catalogue, tarkovCatalogue.SNAPSHOT_PATH
+
+        tarkovCatalogue.catalogue = None
+        tarkovCatalogue.SNAPSHOT_PATH = FIXTURE_PATH
+
+    def tearDown(self):
+        tarkovCatalogue.catalogue, tarkovCatalogue.SNAPSHOT_PATH = self.previous
+
+    def test_unloaded(self):
+        self.assertIsNone(tarkovCatalogue.search("ledx"))
+        self.assertEqual(tarkovCatalogue.autocomplete("ledx"), [])
+
+    def test_load_snapshot_and_autocomplete(self):
+        self.assertTrue(asyncio.run(tarkovCatalogue.loadSnapshot()))
+
+        self.assertEqual(tarkovCatalogue.autocomplete("salewa"), ["Salewa first aid kit"])
+        self.assertEqual(tarkovCatalogue.autocomplete("   "), [])
+        self.assertEqual(tarkovCatalogue.search("bitcoin", limit=1)[0].shortName, "0.2BTC")
+
+
+if __name__ == "__main__":
+    unittest.main()